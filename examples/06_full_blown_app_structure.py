@@ -35,7 +35,7 @@ async def main(**kwargs: Unpack[apg.CommonParams]):
 
 async def confirm_before_quitting(*, priority, **kwargs: Unpack[apg.CommonParams]):
     quit = partial(kwargs["sdlevent"].wait, C.QUIT, priority=priority, consume=True)
-    escape_key = partial(kwargs["sdlevent"].wait, C.KEYDOWN, priority=priority, filter=lambda e: e.key == C.K_ESCAPE, consume=True)
+    escape_key = partial(kwargs["sdlevent"].wait, C.KEYDOWN, priority=priority, attrs={'key': C.K_ESCAPE}, consume=True)
     while True:
         await apg.wait_any(quit(), escape_key())
         if await ask_yes_no_question("Quit the app?", priority=priority, **kwargs):
@@ -30,8 +30,14 @@ async def progress_spinner(dest: Rect, priority, *, color="white", line_width=20
     next_stop = itertools.accumulate(itertools.cycle((R1 + R2, R1, R1, R1, )), initial=min_arc_angle).__next__
     d = speed * 400
 
-    anim_attrs = kwargs["clock"].anim_attrs
+    clock = kwargs["clock"]
+    anim_attrs = clock.anim_attrs
     arc = Arc(kwargs["draw_target"], Color(color), dest, next_start(), next_stop(), line_width)
-    with kwargs["executor"].register(arc.draw, priority):
-        while True:
-            await anim_attrs(arc, start_angle=next_start(), stop_angle=next_stop(), duration=d)
+    with kwargs["executor"].register(arc.draw, priority, rect=dest) as req:
+        # The arc changes every frame. This only matters in the dirty-rect mode.
+        mark_dirty = clock.schedule_interval(lambda dt: req.mark_dirty(), 0)
+        try:
+            while True:
+                await anim_attrs(arc, start_angle=next_start(), stop_angle=next_stop(), duration=d)
+        finally:
+            mark_dirty.cancel()
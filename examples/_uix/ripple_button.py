@@ -53,7 +53,18 @@ def calc_minimum_enclosing_circle_radius(center_of_circle, rect: Rect, max=max,
 TOUCH_DOWN_EVENTS = (C.MOUSEBUTTONDOWN, C.FINGERDOWN, )
 
 
-def block_touch_down_events(sdlevent, priority, *, filter=lambda e: True) -> ContextManager:
+def pos_of(e, surface) -> tuple:
+    '''
+    Returns the position of a mouse event or a finger event in the coordinates of the ``surface``, which is assumed to
+    cover the whole window.
+    '''
+    if (pos := getattr(e, 'pos', None)) is not None:
+        return pos
+    w, h = surface.get_size()
+    return (e.x * w, e.y * h)
+
+
+def block_touch_down_events(sdlevent, priority, *, region=None) -> ContextManager:
     '''
     Returns a context manager that blocks ``MOUSEBUTTONDOWN`` and  ``FINGERDOWN`` events.
 
@@ -65,8 +76,10 @@ def block_touch_down_events(sdlevent, priority, *, filter=lambda e: True) -> Con
     .. warning::
 
         The context manager starts having the effect when it is created, not when its ``__enter__()`` method is called.
+
+    If a ``region`` is given, only the events inside it are blocked.
     '''
-    return sdlevent.subscribe(TOUCH_DOWN_EVENTS, filter, priority)
+    return sdlevent.subscribe(TOUCH_DOWN_EVENTS, lambda e: True, priority, region=region)
 
 
 class RippleEffect:
@@ -111,36 +124,43 @@ async def ripple_button(
             # The events that caused the button to be clicked. These are either a pair of FINGERDOWN
             # and FINGERUP events or a pair of MOUSEBUTTONDOWN and MOUSEBUTTONUP events.
             e_down, e_up = args
+
+    The button follows the ``dest`` when it moves.
     '''
     bgcolor = Color(bgcolor)
     ripple_color = Color(ripple_color) + Color(bgcolor)
-    collidepoint = dest.collidepoint
     effect = RippleEffect()
 
-    touch_down = partial(
-        sdlevent.wait, C.MOUSEBUTTONDOWN, C.FINGERDOWN, priority=priority + 1, consume=True,
-        filter=lambda e: (not getattr(e, 'touch', False)) and collidepoint(e.pos))
-    mouse_button_up = partial(
-        sdlevent.wait, C.MOUSEBUTTONUP, priority=priority + 1, consume=True,
-        filter=lambda e: e.button == e_down.button)
-    finger_up = partial(
-        sdlevent.wait, C.FINGERUP, priority=priority + 1, consume=True,
-        filter=lambda e: e.finger_id == e_down.finger_id)
-
-    with (
-        executor.register(partial(_draw, tmp_clip, image, image.get_rect(), bgcolor, draw_target, dest, effect), priority),
-        block_touch_down_events(sdlevent, priority, filter=lambda e: collidepoint(e.pos)),
-    ):
-        while True:
-            e_down = await touch_down()
-            effect.enable(draw_target, e_down.pos, 0, ripple_color)
-            touch_up = mouse_button_up if e_down.type == C.MOUSEBUTTONDOWN else finger_up
-            async with asyncgui.run_as_main(touch_up()) as touch_up_tracker:
-                await clock.anim_attrs(effect, radius=calc_minimum_enclosing_circle_radius(e_down.pos, dest), duration=600, transition=out_quad)
-            e_up = touch_up_tracker.result
-            if collidepoint(e_up.pos):
-                on_click(e_down, e_up)
-            effect.disable()
+    mouse_button_up = partial(sdlevent.wait, C.MOUSEBUTTONUP, priority=priority + 1, consume=True)
+    finger_up = partial(sdlevent.wait, C.FINGERUP, priority=priority + 1, consume=True)
+
+    async with sdlevent.stream(
+            *TOUCH_DOWN_EVENTS, priority=priority + 1, consume=True, region=dest,
+            filter=lambda e: not getattr(e, 'touch', False)) as touch_down:
+        with (
+            executor.register(partial(_draw, tmp_clip, image, image.get_rect(), bgcolor, draw_target, dest, effect), priority),
+            block_touch_down_events(sdlevent, priority, region=dest) as blocker,
+            executor.register(partial(_follow_rect, dest, (touch_down.subscriber, blocker, )), priority),
+        ):
+            async for e_down in touch_down:
+                pos = pos_of(e_down, draw_target)
+                effect.enable(draw_target, pos, 0, ripple_color)
+                if e_down.type == C.MOUSEBUTTONDOWN:
+                    touch_up = mouse_button_up(attrs={'button': e_down.button})
+                else:
+                    touch_up = finger_up(attrs={'finger_id': e_down.finger_id})
+                async with asyncgui.run_as_main(touch_up) as touch_up_tracker:
+                    await clock.anim_attrs(effect, radius=calc_minimum_enclosing_circle_radius(pos, dest), duration=600, transition=out_quad)
+                e_up = touch_up_tracker.result
+                if dest.collidepoint(pos_of(e_up, draw_target)):
+                    on_click(e_down, e_up)
+                effect.disable()
+
+
+def _follow_rect(rect, subs):
+    # Assigning the same area again costs nothing.
+    for sub in subs:
+        sub.region = rect
 
 
 def _draw(tmp_clip, image, image_rect, bgcolor, draw_target, dest, effect):
@@ -49,7 +49,7 @@ async def draw_ring_under_mouse_cursor(
         sdlevent.subscribe((C.MOUSEMOTION, ), partial(on_mouse_motion, dest), priority),
 
     ):
-        await sdlevent.wait(C.MOUSEBUTTONUP, filter=lambda e: e.button == e_down.button, priority=priority)
+        await sdlevent.wait(C.MOUSEBUTTONUP, attrs={'button': e_down.button}, priority=priority)
 
 
 def on_finger_motion(finger_id, dest, e: Event):
@@ -64,4 +64,4 @@ async def draw_ring_under_finger(
         executor.register(partial(draw_target.blit, ring_img, dest), priority),
         sdlevent.subscribe((C.FINGERMOTION, ), partial(on_finger_motion, e_down.finger_id, dest), priority),
     ):
-        await sdlevent.wait(C.FINGERUP, filter=lambda e: e.finger_id == e_down.finger_id, priority=priority)
+        await sdlevent.wait(C.FINGERUP, attrs={'finger_id': e_down.finger_id}, priority=priority)
@@ -13,9 +13,12 @@ async def main(**kwargs: Unpack[apg.CommonParams]):
     pygame.display.set_caption("Progress Spinner")
     kwargs["draw_target"] = screen = pygame.display.set_mode((600, 600))
 
-    r = kwargs["executor"].register
-    r(partial(screen.fill, THECOLORS["black"]), priority=0)
-    r(pygame.display.flip, priority=0xFFFFFF00)
+    # Only the area around the spinner gets repainted and uploaded every frame.
+    executor = kwargs["executor"]
+    executor.enable_dirty_rects(screen)
+    r = executor.register
+    r(partial(screen.fill, THECOLORS["black"]), priority=0, rect=screen.get_rect())
+    r(executor.update_display, priority=0xFFFFFF00)
 
     await progress_spinner(screen.get_rect().scale_by(0.8), priority=0x100, **kwargs)
 
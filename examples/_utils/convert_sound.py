@@ -1,13 +1,8 @@
-__all__ = ("convert_sound", )
+__all__ = ("convert_sound", "convert_sound_async", )
 
 
-def convert_sound(source: bytes, *, in_format="wav", out_format="wav", out_codec="pcm_s16le") -> bytes:
-    '''
-    Converts an audio source to another format using ffmpeg.
-    '''
-    import subprocess
-
-    ffmpeg_cmd = (
+def _ffmpeg_cmd(in_format, out_format, out_codec):
+    return (
         "ffmpeg",
         "-f", in_format,
         "-i", "pipe:0",  # stdin
@@ -15,5 +10,30 @@ def convert_sound(source: bytes, *, in_format="wav", out_format="wav", out_codec
         "-codec:a", out_codec,
         "pipe:1",  # stdout
     )
+
+
+def convert_sound(source: bytes, *, in_format="wav", out_format="wav", out_codec="pcm_s16le") -> bytes:
+    '''
+    Converts an audio source to another format using ffmpeg.
+    '''
+    import subprocess
+
+    ffmpeg_cmd = _ffmpeg_cmd(in_format, out_format, out_codec)
     p = subprocess.Popen(ffmpeg_cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE, bufsize=0)
     return p.communicate(source)[0]
+
+
+async def convert_sound_async(net, source: bytes, *, in_format="wav", out_format="wav", out_codec="pcm_s16le") -> bytes:
+    '''
+    :func:`convert_sound` that doesn't stall the frame loop. Any number of conversions can run concurrently.
+
+    .. code-block::
+
+        tasks = await asyncpygame.wait_all(*(convert_sound_async(net, s) for s in sources))
+        converted = [t.result for t in tasks]
+    '''
+    import asyncpygame as apg
+
+    ffmpeg_cmd = _ffmpeg_cmd(in_format, out_format, out_codec)
+    completed = await apg.subprocess.run(net, ffmpeg_cmd, input=source)
+    return completed.stdout
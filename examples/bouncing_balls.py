@@ -22,11 +22,10 @@ def generate_ball_image(*, color, size) -> Surface:
     return img
 
 
-async def bouncing_ball(*, initial_pos, size: tuple, space: Rect, color, velocity: Vector2, **kwargs: Unpack[apg.CommonParams]):
+async def bouncing_ball(*, initial_pos, size: tuple, space: Rect, color, velocity: Vector2, blit_batch: apg.BlitBatch, **kwargs: Unpack[apg.CommonParams]):
     ball_img = generate_ball_image(color=color, size=size)
     dest = ball_img.get_rect(center=initial_pos)
-    draw_func = partial(kwargs["draw_target"].blit, ball_img, dest)
-    with kwargs["executor"].register(draw_func, kwargs["priority"]):
+    with blit_batch.add(ball_img, dest):
         async for dt in kwargs["clock"].anim_with_dt():
             dest.move_ip(velocity * (dt / 1000.0))
             if not dest.colliderect(space):
@@ -48,9 +47,10 @@ async def main(**kwargs: Unpack[apg.CommonParams]):
     r(partial(screen.fill, THECOLORS["black"]), priority=0)
     r(pygame.display.flip, priority=0xFFFFFF00)
 
+    # All the balls are drawn with a single Surface.fblits() call, the newer ones on top.
     async with apg.open_nursery() as nursery:
         clock = kwargs["clock"]
-        priority = 0x100
+        blit_batch = apg.BlitBatch(kwargs["executor"], screen, priority=0x100)
         screen_rect = screen.get_rect()
         while True:
             await clock.sleep(randint(1000, 2000))
@@ -60,10 +60,9 @@ async def main(**kwargs: Unpack[apg.CommonParams]):
                 space=screen_rect,
                 color=Color(randint(0, 255), randint(0, 255), randint(0, 255)),
                 velocity=Vector2(randint(-150, 150), randint(-150, 150)),
-                priority=priority,
+                blit_batch=blit_batch,
                 **kwargs
             ))
-            priority += 1
 
 
 if __name__ == "__main__":
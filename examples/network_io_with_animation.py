@@ -38,9 +38,7 @@ async def main(**kwargs: Unpack[apg.CommonParams]):
         )
 
         tasks = await apg.wait_any(
-            kwargs["clock"].run_in_thread(
-                lambda: requests.get("https://httpbin.org/delay/4"),
-                polling_interval=200, daemon=True),
+            apg.run_in_thread(kwargs["sdlevent"], lambda: requests.get("https://httpbin.org/delay/4"), daemon=True),
             e_click.wait(),
             progress_spinner(
                 Rect(0, 0, 400, 400).move_to(center=screen.get_rect().center),
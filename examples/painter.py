@@ -37,12 +37,9 @@ async def draw_rect(e_down: Event, *, draw_target, color, executor, sdlevent, pr
     ox, oy = e_down.pos
     rect = pygame.Rect(ox, oy, 0, 0)
     executor.register(partial(pygame.draw.rect, draw_target, color, rect, line_width), priority=priority)
-    async with (
-        apg.move_on_when(sdlevent.wait(C.MOUSEBUTTONUP, filter=lambda e: e.button == e_down.button, priority=priority)),
-        sdlevent.wait_freq(C.MOUSEMOTION, priority=priority) as mouse_motion,
-    ):
-        while True:
-            e = await mouse_motion()
+    mouse_button_up = sdlevent.wait(C.MOUSEBUTTONUP, attrs={'button': e_down.button}, priority=priority)
+    async with sdlevent.stream(C.MOUSEMOTION, priority=priority, until=mouse_button_up) as mouse_motion:
+        async for e in mouse_motion:
             x, y = e.pos
             min_x, max_x = (x, ox) if x < ox else (ox, x)
             min_y, max_y = (y, oy) if y < oy else (oy, y)
@@ -54,12 +51,9 @@ async def draw_ellipse(e_down: Event, *, draw_target, color, executor, sdlevent,
     rect = pygame.Rect(ox, oy, 0, 0)
     executor.register(partial(pygame.draw.ellipse, draw_target, color, rect, line_width), priority)
     bbox_req = executor.register(partial(pygame.draw.rect, draw_target, THECOLORS["black"], rect, 1), priority)
-    async with (
-        apg.move_on_when(sdlevent.wait(C.MOUSEBUTTONUP, filter=lambda e: e.button == e_down.button, priority=priority)),
-        sdlevent.wait_freq(C.MOUSEMOTION, priority=priority) as mouse_motion,
-    ):
-        while True:
-            e = await mouse_motion()
+    mouse_button_up = sdlevent.wait(C.MOUSEBUTTONUP, attrs={'button': e_down.button}, priority=priority)
+    async with sdlevent.stream(C.MOUSEMOTION, priority=priority, until=mouse_button_up) as mouse_motion:
+        async for e in mouse_motion:
             x, y = e.pos
             min_x, max_x = (x, ox) if x < ox else (ox, x)
             min_y, max_y = (y, oy) if y < oy else (oy, y)
@@ -82,4 +76,4 @@ async def main(**kwargs: Unpack[apg.CommonParams]):
 
 
 if __name__ == "__main__":
-    apg.run(main)
+    apg.run(main, coalesce_motion=True)
@@ -77,7 +77,15 @@ def crop_image(data: bytes) -> bytes:
         return f.getvalue()
 
 
-def init_database(db_path: PathLike):
+async def init_database(db_path: PathLike, *, pool: apg.WorkerPool):
+    tasks = await apg.wait_all(
+        apg.run_in_executor(download_images, pool=pool),
+        apg.run_in_executor(download_sounds, pool=pool),
+    )
+    await apg.run_in_executor(store_assets, db_path, *(t.result for t in tasks), pool=pool)
+
+
+def store_assets(db_path: PathLike, images: dict[str, bytes], sounds: dict[str, bytes]):
     with sqlite3.connect(db_path) as conn, closing(conn.cursor()) as cur:
         cur.executescript("""
             CREATE TABLE Images(
@@ -91,12 +99,10 @@ def init_database(db_path: PathLike):
                 PRIMARY KEY (name)
             );
         """)
-        images = download_images()
         cur.executemany(
             "INSERT INTO Images(name, image) VALUES(?, ?)",
             ((name, crop_image(image)) for name, image in images.items()),
         )
-        sounds = download_sounds()
         cur.executemany(
             "INSERT INTO Sounds(name, sound) VALUES(?, ?)",
             ((name, convert_sound(sound)) for name, sound in sounds.items()),
@@ -135,8 +141,7 @@ async def main(**kwargs: Unpack[apg.CommonParams]):
     pygame.mixer.init()
     pygame.init()
     pygame.mouse.set_visible(False)
-    pygame.event.set_blocked(None)
-    pygame.event.set_allowed((C.QUIT, C.MOUSEBUTTONDOWN, C.MOUSEBUTTONUP, C.MOUSEMOTION, C.KEYDOWN, ))
+    kwargs["sdlevent"].enable_sdl_filtering()
     pygame.display.set_caption("Whack a Human")
     kwargs["draw_target"] = screen = pygame.display.set_mode((1280, 720))
 
@@ -173,7 +178,7 @@ async def main(**kwargs: Unpack[apg.CommonParams]):
 async def confirm_and_quit(*, priority, font, **kwargs: Unpack[apg.CommonParams]):
     wait = kwargs["sdlevent"].wait
     quit = partial(wait, C.QUIT, priority=priority, consume=True)
-    escape_key = partial(wait, C.KEYDOWN, priority=priority, filter=lambda e: e.key == C.K_ESCAPE, consume=True)
+    escape_key = partial(wait, C.KEYDOWN, priority=priority, attrs={'key': C.K_ESCAPE}, consume=True)
     while True:
         await apg.wait_any(quit(), escape_key())
         if await ask_yes_no_question(
@@ -207,7 +212,8 @@ async def title_scene(*, switcher, userdata: UserData, **kwargs: Unpack[apg.Comm
                                              dialog_size=target_rect.scale_by(0.8, 0.4).size, **kwargs):
                     async with message_with_spinner("Downloading...", priority=0xFFFFFB00, font=font,
                                                     dialog_size=target_rect.scale_by(0.4, 0.6).size, **kwargs):
-                        await kwargs["clock"].run_in_thread(lambda: init_database(userdata.db_path), polling_interval=1000)
+                        with apg.WorkerPool(kwargs["sdlevent"], max_workers=2) as pool:
+                            await init_database(userdata.db_path, pool=pool)
                 else:
                     continue
             images = userdata.images
@@ -0,0 +1,168 @@
+'''
+Performance comparision between the old 'SDLEvent.dispatch()', which went through every subscriber, and the current
+one, which only goes through the subscribers of the type of the dispatched event.
+'''
+
+import types
+from collections.abc import Callable, Container
+from dataclasses import dataclass
+from heapq import merge as heapq_merge
+from functools import partial
+
+from asyncgui import _current_task, _sleep_forever
+
+import asyncpygame
+from asyncpygame._sdlevent import _accept_any, _callback
+
+
+@dataclass(slots=True)
+class FlatSubscriber:
+    '''The implementation of 'Subscriber' before the per-event-type index was introduced.'''
+
+    _priority: int
+
+    callback: Callable
+
+    topics: Container = None
+
+    _cancelled: bool = False
+
+    def cancel(self):
+        self._cancelled = True
+
+    def __eq__(self, other):
+        return self._priority == other._priority
+
+    def __ne__(self, other):
+        return self._priority != other._priority
+
+    def __lt__(self, other):
+        return self._priority > other._priority
+
+    def __le__(self, other):
+        return self._priority >= other._priority
+
+    def __gt__(self, other):
+        return self._priority < other._priority
+
+    def __ge__(self, other):
+        return self._priority <= other._priority
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *__):
+        self._cancelled = True
+
+
+class FlatSDLEvent:
+    '''The implementation of 'SDLEvent' before the per-event-type index was introduced.'''
+
+    def __init__(self):
+        self._subs = []
+        self._subs_2 = []
+        self._subs_to_be_added = []
+        self._subs_to_be_added_2 = []
+
+    def dispatch(self, event):
+        subs = self._subs
+        subs_tba = self._subs_to_be_added
+        if subs_tba:
+            subs_tba.sort()
+            sub_iter = heapq_merge(subs, subs_tba)
+            subs_tba2 = self._subs_to_be_added_2
+            subs_tba2.clear()
+            self._subs_to_be_added = subs_tba2
+            self._subs_to_be_added_2 = subs_tba
+            del subs_tba2
+        else:
+            sub_iter = iter(subs)
+        del subs_tba
+
+        subs2 = self._subs_2
+        subs2_append = subs2.append
+        event_type = event.type
+        try:
+            for sub in sub_iter:
+                if sub._cancelled:
+                    continue
+                subs2_append(sub)
+                if event_type in sub.topics and sub.callback(event):
+                    subs2.extend(sub_iter)
+                    return
+        finally:
+            subs.clear()
+            self._subs = subs2
+            self._subs_2 = subs
+
+    def subscribe(self, topics, callback, priority):
+        sub = FlatSubscriber(priority, callback, topics)
+        self._subs_to_be_added.append(sub)
+        return sub
+
+    @types.coroutine
+    def wait(self, *event_types, filter=_accept_any, priority, consume=False):
+        task = (yield _current_task)[0][0]
+        sub = self.subscribe(event_types, partial(_callback, filter, consume, task._step), priority)
+        try:
+            return (yield _sleep_forever)[0][0]
+        finally:
+            sub.cancel()
+
+
+async def repeat_wait(sdlevent):
+    while True:
+        e = await sdlevent.wait(1, priority=0)
+
+
+def measure_one(*, n_events, n_tasks, n_idle_subscribers, sdlevent_cls):
+    '''
+    ``n_tasks`` tasks repeatedly wait for events of type 1 while ``n_idle_subscribers`` subscribers wait for events of
+    type 2, which never occur.
+    '''
+    from time import perf_counter
+    from pygame.event import Event
+    sdlevent = sdlevent_cls()
+    dispatch = sdlevent.dispatch
+    for i in range(n_idle_subscribers):
+        sdlevent.subscribe((2, ), print, priority=i)
+    tasks = [asyncpygame.start(repeat_wait(sdlevent)) for __ in range(n_tasks)]
+
+    start_time = perf_counter()
+    for i in range(n_events):
+        dispatch(Event(1))
+    end_time = perf_counter()
+
+    for t in tasks:
+        t.cancel()
+    return end_time - start_time
+
+
+def measure_and_plot_all():
+    import matplotlib.pyplot as plt
+
+    xvalues = (0, 10, 20, 50, 100, 200, 500, 1000)
+    n_times = 10
+    for n_tasks in (1, 10, ):
+        fig, ax = plt.subplots()
+        ax.set_title(f'Number of Tasks waiting for the dispatched type : {n_tasks}')
+        ax.set_xlabel('Number of Subscribers waiting for another type')
+        ax.set_ylabel('Time')
+        for sdlevent_cls, color, label in (
+            (FlatSDLEvent, 'green', 'flat'),
+            (asyncpygame.SDLEvent, 'blue', 'per-type'),
+        ):
+            yvalues = [
+                sum(
+                    measure_one(n_events=100, n_tasks=n_tasks, n_idle_subscribers=n, sdlevent_cls=sdlevent_cls)
+                    for __ in range(n_times)
+                )
+                for n in xvalues
+            ]
+            ax.plot(xvalues, yvalues, color=color, label=label)
+        ax.legend()
+        fig.savefig(__file__ + f'_n_tasks_{n_tasks}.png', )
+
+
+if __name__ == '__main__':
+    measure_and_plot_all()
@@ -0,0 +1,50 @@
+'''
+Performance comparision between 'PriorityExecutor', which rebuilds its list of requests every frame, and
+'ScalablePriorityExecutor', which keeps a single sorted list and compacts it only when there are enough cancelled
+requests in it.
+
+Every frame, ``churn`` of the requests get cancelled and the same number of new ones get registered, with random
+priorities.
+'''
+
+from random import Random
+from time import perf_counter
+
+from asyncpygame import PriorityExecutor, ScalablePriorityExecutor
+
+
+def do_nothing():
+    pass
+
+
+def measure_one(*, n_reqs, churn, n_frames, executor_cls) -> float:
+    '''Returns the average time per frame in microseconds.'''
+    rng = Random(0)
+    executor = executor_cls()
+    register = executor.register
+    reqs = [register(do_nothing, rng.random()) for __ in range(n_reqs)]
+    executor()
+    n_replaced = round(n_reqs * churn)
+
+    elapsed = 0.
+    for __ in range(n_frames):
+        start_time = perf_counter()
+        for i in rng.sample(range(n_reqs), n_replaced):
+            reqs[i].cancel()
+            reqs[i] = register(do_nothing, rng.random())
+        executor()
+        elapsed += perf_counter() - start_time
+    return elapsed / n_frames * 1_000_000
+
+
+def measure_all():
+    print(f"{'requests':>9} {'churn':>6} {'PriorityExecutor':>17} {'Scalable...':>12} {'ratio':>6}   (us/frame)")
+    for n_reqs, n_frames in ((10, 20000), (1000, 2000), (50000, 40), ):
+        for churn in (0., 0.001, 0.01, 0.1, ):
+            t1 = measure_one(n_reqs=n_reqs, churn=churn, n_frames=n_frames, executor_cls=PriorityExecutor)
+            t2 = measure_one(n_reqs=n_reqs, churn=churn, n_frames=n_frames, executor_cls=ScalablePriorityExecutor)
+            print(f"{n_reqs:>9} {churn:>6} {t1:>17.1f} {t2:>12.1f} {t1 / t2:>6.2f}")
+
+
+if __name__ == '__main__':
+    measure_all()
@@ -1,5 +1,5 @@
 '''
-Performance comparision between 'SDLEvent.wait()' and 'SDLEvent.wait_freq()'.
+Performance comparision between 'SDLEvent.wait()', 'SDLEvent.wait_freq()' and 'SDLEvent.stream()'.
 '''
 
 import asyncpygame
@@ -11,15 +11,20 @@ async def nothing(sdlvent):
 
 async def repeat_wait(sdlevent):
     while True:
-        e = await sdlevent.wait(1)
+        e = await sdlevent.wait(1, priority=0)
 
 
 async def repeat_wait_freq(sdlevent):
-    async with sdlevent.wait_freq(1) as event:
+    async with sdlevent.wait_freq(1, priority=0) as event:
         while True:
             e = await event()
 
 
+async def repeat_stream(sdlevent):
+    async for e in sdlevent.stream(1, priority=0):
+        pass
+
+
 async def _measure_one(*, n_events, n_tasks, target):
     from time import perf_counter
     from pygame.event import Event
@@ -51,17 +56,18 @@ def measure_and_plot_all():
         ax.set_xlabel('Number of Tasks')
         ax.set_ylabel('Time')
         n_times = 100
-
-        yvalues = [
-            sum(measure_one(n_events=n_events, n_tasks=n_tasks, target=repeat_wait) for __ in range(n_times))
-            for n_tasks in range(1, 11)
-        ]
-        ax.plot(list(range(1, 11)), yvalues, color='green', label='wait')
-        yvalues = [
-            sum(measure_one(n_events=n_events, n_tasks=n_tasks, target=repeat_wait_freq) for __ in range(n_times))
-            for n_tasks in range(1, 11)
-        ]
-        ax.plot(list(range(1, 11)), yvalues, color='blue', label='wait_freq')
+        xvalues = list(range(1, 11))
+        for target, color, label in (
+            (repeat_wait, 'green', 'wait'),
+            (repeat_wait_freq, 'blue', 'wait_freq'),
+            (repeat_stream, 'red', 'stream'),
+        ):
+            yvalues = [
+                sum(measure_one(n_events=n_events, n_tasks=n_tasks, target=target) for __ in range(n_times))
+                for n_tasks in xvalues
+            ]
+            ax.plot(xvalues, yvalues, color=color, label=label)
+        ax.legend()
 
         fig.savefig(__file__ + f'_n_events_{n_events}.png', )
 
@@ -1,11 +1,26 @@
 __all__ = (
-    'run', 'quit', 'run_and_record', 'Clock', 'SDLEvent', 'PriorityExecutor',
-    'CommonParams', 'capture_current_frame', 'block_input_events',
+    'run', 'quit', 'run_and_record', 'replay', 'run_headless', 'read_event_log',
+    'Clock', 'SDLEvent', 'PriorityExecutor', 'ScalablePriorityExecutor',
+    'CommonParams', 'capture_current_frame', 'block_input_events', 'coalesce_motion_events',
+    'CallStats', 'Instrumentation', 'instrument', 'EventBudget',
+    'ThreadSafeFuture', 'run_in_thread', 'FUTURE_DONE', 'WorkerPool', 'run_in_executor',
+    'SharedBuffer', 'run_in_process', 'Net', 'AsyncioBridge', 'FrameWriter',
+    'BlitBatch', 'BlitHandle',
 )
 
 from asyncgui import *
 from asyncgui_ext.clock import Clock
-from ._runner import run, quit, run_and_record
+from ._runner import run, quit, run_and_record, replay, run_headless
 from ._sdlevent import SDLEvent
-from ._priority_executor import PriorityExecutor
-from ._utils import CommonParams, capture_current_frame, block_input_events
+from ._priority_executor import PriorityExecutor, ScalablePriorityExecutor
+from ._utils import CommonParams, capture_current_frame, block_input_events, coalesce_motion_events
+from ._instrumentation import CallStats, Instrumentation, instrument
+from ._event_log import read_event_log
+from ._event_budget import EventBudget
+from ._threading import ThreadSafeFuture, run_in_thread, FUTURE_DONE, WorkerPool, run_in_executor
+from ._process import SharedBuffer, run_in_process
+from ._net import Net
+from ._asyncio_bridge import AsyncioBridge
+from ._frame_writer import FrameWriter
+from ._blit_batch import BlitBatch, BlitHandle
+from . import subprocess
@@ -0,0 +1,170 @@
+__all__ = ('AsyncioBridge', )
+
+import asyncio
+import concurrent.futures
+from collections.abc import Awaitable
+from functools import partial
+from threading import Thread
+
+from pygame.event import Event, custom_type
+from asyncgui import start
+
+from ._sdlevent import SDLEvent
+from ._threading import ThreadSafeFuture
+
+_CALL_IN_MAIN_THREAD = custom_type()
+
+
+def _call(e: Event):
+    e.func()
+    return True
+
+
+def _set_result(fut: asyncio.Future, value):
+    if not fut.done():
+        fut.set_result(value)
+
+
+def _set_exception(fut: asyncio.Future, exc):
+    if not fut.done():
+        fut.set_exception(exc)
+
+
+def _transfer_outcome(future: ThreadSafeFuture, cf: concurrent.futures.Future):
+    if cf.cancelled():
+        future.set_exception(asyncio.CancelledError())
+    elif (exc := cf.exception()) is not None:
+        future.set_exception(exc)
+    else:
+        future.set_result(cf.result())
+
+
+async def _run_for_asyncio(call_in_loop, aw, fut: asyncio.Future):
+    try:
+        result = await aw
+    except Exception as e:
+        call_in_loop(_set_exception, fut, e)
+    except BaseException:
+        call_in_loop(fut.cancel)
+        raise
+    else:
+        call_in_loop(_set_result, fut, result)
+
+
+def _cancel_task_if_cancelled(call_in_main_thread, task, fut: asyncio.Future):
+    if fut.cancelled():
+        call_in_main_thread(task.cancel)
+
+
+class AsyncioBridge:
+    '''
+    Runs an :mod:`asyncio` event loop next to the frame loop, and lets the two sides await each other.
+    :func:`asyncpygame.run` creates one when the ``asyncio_mode`` parameter is specified, and passes it to the main
+    function as ``asyncio_bridge``.
+
+    .. code-block::
+
+        async def main(*, asyncio_bridge, **kwargs):
+            # asyncgui side awaiting asyncio
+            response = await asyncio_bridge.from_asyncio(http_client.get(url))
+
+            # asyncio side awaiting asyncgui
+            async def asyncio_func():
+                await asyncio_bridge.to_asyncio(sdlevent.wait(MOUSEBUTTONDOWN, priority=0))
+
+        asyncpygame.run(main, asyncio_mode='step')
+
+    The results are delivered through :meth:`asyncpygame.SDLEvent.post_threadsafe`, so an asyncgui task awaiting
+    asyncio resumes in the next frame after the asyncio side completes. Cancelling either side cancels the other,
+    except that a cancellation on the asyncio side is raised as :exc:`asyncio.CancelledError` in the asyncgui task
+    awaiting it, instead of cancelling the task.
+
+    :param mode: ``'step'`` runs one iteration of the asyncio loop every frame, in the main thread.
+                 ``'thread'`` runs the asyncio loop in a background thread, which is better when the asyncio side
+                 does a lot of work.
+    '''
+    __slots__ = ('_sdlevent', '_loop', '_thread', '_sub', )
+
+    def __init__(self, sdlevent: SDLEvent, *, mode='step'):
+        if mode not in ('step', 'thread', ):
+            raise ValueError(f"'mode' must be either 'step' or 'thread'. (was {mode!r})")
+        self._sdlevent = sdlevent
+        self._loop = loop = asyncio.new_event_loop()
+        self._sub = sdlevent.subscribe((_CALL_IN_MAIN_THREAD, ), _call, priority=0)
+        if mode == 'thread':
+            self._thread = Thread(target=loop.run_forever, daemon=True, name="asyncpygame.AsyncioBridge")
+            self._thread.start()
+        else:
+            self._thread = None
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        return self._loop
+
+    def step(self):
+        '''
+        Runs one iteration of the asyncio loop. :func:`asyncpygame.run` calls this every frame in the ``'step'`` mode,
+        and the app should not.
+        '''
+        if self._thread is None:
+            loop = self._loop
+            loop.stop()
+            loop.run_forever()
+
+    def _call_in_main_thread(self, func, *args):
+        self._sdlevent.post_threadsafe(Event(_CALL_IN_MAIN_THREAD, func=partial(func, *args)))
+
+    def _call_in_loop(self, func, *args):
+        self._loop.call_soon_threadsafe(func, *args)
+
+    async def from_asyncio(self, aw: Awaitable) -> Awaitable:
+        '''
+        Runs an asyncio awaitable in the asyncio loop, and waits for its completion.
+        If the caller gets cancelled, the asyncio task gets cancelled. If the asyncio task gets cancelled,
+        :exc:`asyncio.CancelledError` is raised here, which the caller can catch.
+        '''
+        future = ThreadSafeFuture(self._sdlevent)
+        cf = asyncio.run_coroutine_threadsafe(_wrap_awaitable(aw), self._loop)
+        cf.add_done_callback(partial(_transfer_outcome, future))
+        try:
+            return await future
+        finally:
+            future.cancel()
+            cf.cancel()
+
+    def to_asyncio(self, aw: Awaitable) -> asyncio.Future:
+        '''
+        Starts an asyncgui awaitable in the main thread, and returns an asyncio future that completes with it.
+        Must be called from the asyncio loop.
+        If the future gets cancelled, the asyncgui task gets cancelled, and vice versa.
+        '''
+        fut = self._loop.create_future()
+        self._call_in_main_thread(self._start_for_asyncio, aw, fut)
+        return fut
+
+    def _start_for_asyncio(self, aw, fut: asyncio.Future):
+        task = start(_run_for_asyncio(self._call_in_loop, aw, fut))
+        self._call_in_loop(fut.add_done_callback, partial(_cancel_task_if_cancelled, self._call_in_main_thread, task))
+
+    def close(self):
+        '''Cancels the remaining asyncio tasks, and closes the loop.'''
+        self._sub.cancel()
+        loop = self._loop
+        if (thread := self._thread) is None:
+            loop.run_until_complete(_cancel_all_tasks())
+        else:
+            asyncio.run_coroutine_threadsafe(_cancel_all_tasks(), loop).result()
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+        loop.close()
+
+
+async def _wrap_awaitable(aw):
+    return await aw
+
+
+async def _cancel_all_tasks():
+    tasks = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+    for t in tasks:
+        t.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
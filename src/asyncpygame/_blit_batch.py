@@ -0,0 +1,130 @@
+__all__ = ('BlitBatch', 'BlitHandle', )
+
+from functools import partial
+
+from pygame.surface import Surface
+
+from ._priority_executor import PriorityExecutor
+
+_HOLE = (Surface((0, 0)), (0, 0), )  # takes the place of a removed pair until the list gets compacted
+
+
+class BlitHandle:
+    '''
+    A (source, dest) pair in a :class:`BlitBatch`. The ``dest`` is read every frame, so moving a
+    :class:`pygame.Rect` or a :class:`pygame.Vector2` in place moves the drawing.
+    '''
+    __slots__ = ('_batch', '_index', )
+
+    def __init__(self, batch, index):
+        self._batch = batch
+        self._index = index
+
+    def _get_index(self) -> int:
+        if (idx := self._index) is None:
+            raise RuntimeError("The handle has been cancelled.")
+        return idx
+
+    @property
+    def source(self) -> Surface:
+        '''Raises :exc:`RuntimeError` if the handle has been cancelled. So does :attr:`dest`.'''
+        return self._batch._pairs[self._get_index()][0]
+
+    @source.setter
+    def source(self, source):
+        pairs = self._batch._pairs
+        idx = self._get_index()
+        pairs[idx] = (source, pairs[idx][1], )
+
+    @property
+    def dest(self):
+        return self._batch._pairs[self._get_index()][1]
+
+    @dest.setter
+    def dest(self, dest):
+        pairs = self._batch._pairs
+        idx = self._get_index()
+        pairs[idx] = (pairs[idx][0], dest, )
+
+    def cancel(self):
+        '''Removes the pair from the batch. Amortized O(1).'''
+        if self._index is not None:
+            self._batch._remove(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *__):
+        self.cancel()
+
+
+class BlitBatch:
+    '''
+    Draws any number of images with a single :meth:`pygame.Surface.fblits` call per frame, instead of registering
+    one function per image to the executor.
+
+    .. code-block::
+
+        with BlitBatch(executor, draw_target, priority=0x100) as batch:
+            with batch.add(ball_img, ball_rect):
+                ...
+                ball_rect.move_ip(...)
+
+    The images within a batch are drawn in the order they were added, and all of them with the same
+    ``special_flags``. The removed ones are left in place as empty images until they exceed
+    :attr:`compaction_threshold` of the list, at which point the list gets compacted, so removing one keeps the order
+    of the rest without shifting them every time.
+    '''
+    __slots__ = ('_pairs', '_handles', '_req', '_n_holes', )
+
+    compaction_threshold = 0.25
+    '''The ratio of the removed pairs to all the pairs that triggers a compaction.'''
+
+    def __init__(self, executor: PriorityExecutor, draw_target: Surface, priority, *, special_flags=0, label=None):
+        '''
+        :param label: See :class:`asyncpygame.Instrumentation`.
+        '''
+        self._pairs: list[tuple[Surface, object]] = []
+        self._handles: list[BlitHandle | None] = []  # self._handles[i] is the handle of self._pairs[i]
+        self._n_holes = 0
+        self._req = executor.register(
+            partial(draw_target.fblits, self._pairs, special_flags), priority, label=label)
+
+    def add(self, source: Surface, dest) -> BlitHandle:
+        '''O(1).'''
+        handle = BlitHandle(self, len(self._pairs))
+        self._pairs.append((source, dest, ))
+        self._handles.append(handle)
+        return handle
+
+    def _remove(self, handle: BlitHandle):
+        idx = handle._index
+        handle._index = None
+        pairs = self._pairs
+        pairs[idx] = _HOLE
+        self._handles[idx] = None
+        self._n_holes += 1
+        if self._n_holes > len(pairs) * self.compaction_threshold:
+            self._compact()
+
+    def _compact(self):
+        # The list is modified in place, as the executor holds it.
+        handles = [h for h in self._handles if h is not None]
+        for idx, h in enumerate(handles):
+            h._index = idx
+        self._pairs[:] = [pair for pair in self._pairs if pair is not _HOLE]
+        self._handles = handles
+        self._n_holes = 0
+
+    def __len__(self):
+        return len(self._pairs) - self._n_holes
+
+    def close(self):
+        '''Unregisters the batch from the executor. The handles are left as they are.'''
+        self._req.cancel()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *__):
+        self.close()
@@ -0,0 +1,78 @@
+__all__ = ('EventBudget', )
+
+from collections import deque
+from collections.abc import Callable, Iterable
+from time import perf_counter
+
+from pygame.event import Event
+
+from ._sdlevent import SDLEvent
+
+
+class EventBudget:
+    '''
+    Limits the number of events dispatched in a frame, and/or the time spent dispatching them, so that a burst of
+    events doesn't cause a hitch. The events beyond the budget are dispatched first in the next frame, in the order
+    they occurred.
+
+    .. code-block::
+
+        budget = EventBudget(max_events=100, max_time=5)
+        asyncpygame.run(main, event_budget=budget)
+
+    At least one event is dispatched every frame regardless of the budget, as long as there is one.
+    '''
+    __slots__ = ('max_events', 'max_time', 'n_exceeded', '_queue', '_clock', )
+
+    def __init__(self, *, max_events: int=None, max_time: float=None, clock: Callable[[], float]=perf_counter):
+        '''
+        :param max_events: The maximum number of events dispatched in a frame.
+        :param max_time: The time in milliseconds after which no more events are dispatched in the frame.
+        :param clock: The function that returns the current time in seconds, which ``max_time`` is measured with.
+        '''
+        self._clock = clock
+        self.max_events = max_events
+        self.max_time = max_time
+        self.n_exceeded = 0
+        '''The number of frames in which the budget was exceeded.'''
+        self._queue: deque[Event] = deque()
+
+    @property
+    def n_pending(self) -> int:
+        '''The number of events waiting to be dispatched in the next frame.'''
+        return len(self._queue)
+
+    def dispatch(self, sdlevent: SDLEvent, events: Iterable[Event]):
+        '''
+        Dispatches as many events as the budget allows. :func:`asyncpygame.run` calls this every frame, and the app
+        should not.
+        '''
+        queue = self._queue
+        max_events = self.max_events
+        if not queue and self.max_time is None:
+            events = list(events)
+            if max_events is None or len(events) <= max_events:
+                sdlevent.dispatch_many(events)
+                return
+        queue.extend(events)
+        if not queue:
+            sdlevent.dispatch_many(())
+            return
+        n = len(queue) if max_events is None else min(len(queue), max_events)
+        if self.max_time is None:
+            popleft = queue.popleft
+            sdlevent.dispatch_many([popleft() for __ in range(n)])
+        else:
+            self._dispatch_until_deadline(sdlevent, n)
+        if queue:
+            self.n_exceeded += 1
+
+    def _dispatch_until_deadline(self, sdlevent: SDLEvent, n):
+        now = self._clock
+        deadline = now() + self.max_time / 1000.
+        popleft = self._queue.popleft
+        dispatch = sdlevent.dispatch
+        for __ in range(n):
+            dispatch(popleft())
+            if now() >= deadline:
+                return
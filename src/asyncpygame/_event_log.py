@@ -0,0 +1,105 @@
+__all__ = ('read_event_log', )
+
+from collections.abc import Iterator, Iterable
+from functools import partial
+from os import PathLike
+import gzip
+import pickle
+
+from pygame.event import Event
+
+
+_MAGIC = b'asyncpygame-event-log-1\n'
+_PLAIN_TYPES = (int, float, str, bytes, bool, type(None), )
+
+
+def _is_plain(value, isinstance=isinstance, _PLAIN_TYPES=_PLAIN_TYPES) -> bool:
+    if isinstance(value, _PLAIN_TYPES):
+        return True
+    if isinstance(value, (tuple, list, )):
+        return all(_is_plain(v) for v in value)
+    return False
+
+
+def _serialize_events(events: Iterable[Event], _is_plain=_is_plain) -> list[tuple[int, dict]]:
+    '''
+    Converts events into something picklable. The attributes that are not made up of plain values, such as
+    ``window``, are dropped.
+    '''
+    return [(e.type, {k: v for k, v in e.dict.items() if _is_plain(v)}) for e in events]
+
+
+class _PlainUnpickler(pickle.Unpickler):
+    '''
+    An unpickler that refuses to load anything other than plain values, so that replaying an event log someone else
+    has recorded cannot run arbitrary code. The pickles of plain values don't refer to any global, and without one,
+    nothing can be called while unpickling.
+    '''
+
+    def find_class(self, module, name):
+        raise pickle.UnpicklingError(f"An event log cannot contain '{module}.{name}'.")
+
+
+class _EventLogWriter:
+    '''
+    Writes the events and the delta times of frames into a file, in the following order:
+
+    ::
+
+        events of 1st frame, dt of 1st frame, events of 2nd frame, dt of 2nd frame, ...
+
+    Each of them is a separate pickle, and the whole file is gzip-compressed. Storing the events and the delta time
+    separately allows the log to end in the middle of a frame, which is what happens when the app quits in response
+    to an event.
+    '''
+    __slots__ = ('_file', '_dump', )
+
+    def __init__(self, outfile: str | PathLike):
+        self._file = f = gzip.open(outfile, 'wb')
+        f.write(_MAGIC)
+        self._dump = partial(pickle.dump, file=f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def get_events(self, pygame_event_get):
+        events = pygame_event_get()
+        self._dump(_serialize_events(events))
+        return events
+
+    def tick(self, pygame_clock_tick, *args):
+        dt = pygame_clock_tick(*args)
+        self._dump(dt)
+        return dt
+
+    def close(self):
+        self._file.close()
+
+
+def read_event_log(infile: str | PathLike) -> Iterator[tuple[list[Event], float | None]]:
+    '''
+    Reads a file written by :func:`asyncpygame.run` with the ``record_events_to`` parameter.
+    Yields the events and the delta time of each frame. The delta time of the last frame is None if the app quit
+    before the frame ended.
+
+    Only plain values, such as numbers, strings and the containers of them, are loaded from the file. If it contains
+    anything else, :exc:`pickle.UnpicklingError` is raised, so reading a file from someone else is safe.
+
+    .. code-block::
+
+        for events, dt in read_event_log("./events.log"):
+            ...
+    '''
+    with gzip.open(infile, 'rb') as f:
+        if f.read(len(_MAGIC)) != _MAGIC:
+            raise ValueError(f"{infile!r} is not an event log.")
+        load = _PlainUnpickler(f).load
+        while True:
+            try:
+                events = load()
+            except EOFError:
+                return
+            events = [Event(type, attrs) for type, attrs in events]
+            try:
+                dt = load()
+            except EOFError:
+                yield events, None
+                return
+            yield events, dt
@@ -0,0 +1,141 @@
+__all__ = ('FrameWriter', )
+
+from collections.abc import Sequence
+from queue import SimpleQueue, Empty
+from threading import Thread
+
+
+class FrameWriter:
+    '''
+    Writes frames to a file object, such as the stdin of ffmpeg, in a background thread, so that the frame loop
+    doesn't wait for the writes. :func:`asyncpygame.run_and_record` creates one, and passes it to the main function as
+    ``frame_writer`` if ``pass_frame_writer=True`` is given.
+
+    The frames go through a fixed ring of preallocated buffers. The frame loop takes a free one using
+    :meth:`acquire`, copies a frame into it, then hands it over using :meth:`submit`. The thread writes it, then puts
+    it back to the ring.
+
+    .. code-block::
+
+        writer = FrameWriter()
+        writer.start(file, [bytearray(frame_size) for __ in range(3)])
+
+        # every frame
+        buffer = writer.acquire()
+        if buffer is not None:
+            copy_frame_into(buffer)
+            writer.submit(buffer)
+
+    A frame identical to the previous one can be skipped before being copied, using :meth:`is_unchanged`.
+
+    :param on_lag: What :meth:`acquire` does when all the buffers are waiting to be written.
+                   ``'block'`` waits for the thread to write one. ``'drop'`` returns None, and the frame is dropped,
+                   which keeps the frame loop going at the cost of the recording getting shorter than the session.
+    '''
+    __slots__ = ('_file', '_free', '_filled', '_block', '_thread', '_exception', 'max_queue_depth', '_n_submitted',
+                 '_n_done', '_n_dropped', '_last_submitted', )
+
+    def __init__(self, *, on_lag='block'):
+        if on_lag not in ('block', 'drop', ):
+            raise ValueError(f"'on_lag' must be either 'block' or 'drop'. (was {on_lag!r})")
+        self._file = None
+        self._free = SimpleQueue()
+        self._filled = SimpleQueue()
+        self._block = on_lag == 'block'
+        self._thread = None
+        self._exception = None
+        self.max_queue_depth = 0
+        self._n_submitted = 0
+        self._n_done = 0
+        self._n_dropped = 0
+        self._last_submitted = None
+
+    def start(self, file, buffers: Sequence):
+        '''
+        Starts the thread.
+
+        :param buffers: The ring. Each buffer must be a C-contiguous bytes-like object.
+        '''
+        if self._thread is not None:
+            raise RuntimeError("The writer has already started.")
+        if not buffers:
+            raise ValueError("At least one buffer is required.")
+        self._file = file
+        free = self._free
+        for buffer in buffers:
+            free.put(buffer)
+        self.max_queue_depth = len(buffers)
+        self._thread = thread = Thread(target=self._write_frames, daemon=True, name="asyncpygame.FrameWriter")
+        thread.start()
+
+    @property
+    def queue_depth(self) -> int:
+        '''The number of frames submitted but not written yet.'''
+        return self._n_submitted - self._n_done
+
+    @property
+    def n_dropped(self) -> int:
+        '''The number of frames dropped because of the ``'drop'`` policy.'''
+        return self._n_dropped
+
+    def acquire(self):
+        '''
+        Takes a free buffer. Re-raises the exception that occurred in the thread, if any.
+        '''
+        if (exc := self._exception) is not None:
+            raise exc
+        try:
+            return self._free.get(self._block)
+        except Empty:
+            self._n_dropped += 1
+            return None
+
+    def submit(self, buffer, header: bytes=b''):
+        '''
+        Hands a buffer taken by :meth:`acquire` over to the thread.
+
+        :param header: Written right before the buffer, such as the timestamp of the frame in a container format.
+        '''
+        self._n_submitted += 1
+        self._last_submitted = buffer
+        self._filled.put((header, buffer, ))
+
+    @property
+    def last_submitted(self):
+        '''
+        The buffer submitted last, or None. Its content stays intact until the next :meth:`acquire`, even after being
+        written.
+        '''
+        return self._last_submitted
+
+    def is_unchanged(self, frame) -> bool:
+        '''
+        Whether the ``frame`` is byte-for-byte identical to the buffer submitted last, which can be checked without
+        copying it into a buffer. Call this before :meth:`acquire`. The buffers must be :class:`bytearray`\\ s, and
+        the ``frame`` a bytes-like object in the same layout, such as ``screen.get_view('0')``.
+        '''
+        return (last := self._last_submitted) is not None and last == frame
+
+    def _write_frames(self):
+        write = self._file.write
+        get = self._filled.get
+        put_back = self._free.put
+        while (item := get()) is not None:
+            header, buffer = item
+            if self._exception is None:
+                try:
+                    for data in (memoryview(header), memoryview(buffer).cast('B'), ):
+                        while data:
+                            data = data[write(data):]
+                except Exception as e:
+                    # Keeps taking the buffers so that the frame loop doesn't get stuck in acquire().
+                    self._exception = e
+            self._n_done += 1
+            put_back(buffer)
+
+    def close(self):
+        '''Waits for the submitted frames to be written, then stops the thread.'''
+        if (thread := self._thread) is None:
+            return
+        self._filled.put(None)
+        thread.join()
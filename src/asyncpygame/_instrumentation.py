@@ -0,0 +1,261 @@
+__all__ = ('CallStats', 'Instrumentation', 'instrument', )
+
+from collections.abc import Iterable
+from dataclasses import dataclass, replace
+from functools import partial
+from itertools import chain
+from operator import attrgetter
+from time import perf_counter
+
+from asyncgui import Task
+
+from ._sdlevent import SDLEvent, Subscriber, _stream_callback
+from ._priority_executor import PriorityExecutor, ScalablePriorityExecutor, ExecutionRequest
+
+
+@dataclass(slots=True)
+class CallStats:
+    label: str = ''
+    '''The ``label`` of the subscriber or the request. See :class:`Instrumentation` for the default.'''
+
+    n_calls: int = 0
+    '''The number of times the callbacks were called.'''
+
+    total_time: float = 0.
+    '''The cumulative wall time spent in the callbacks, in seconds.'''
+
+    max_time: float = 0.
+    '''The longest wall time spent in a single call, in seconds.'''
+
+
+def _timed_call(stats: CallStats, callback, *args, perf_counter=perf_counter):
+    start = perf_counter()
+    try:
+        return callback(*args)
+    finally:
+        elapsed = perf_counter() - start
+        stats.n_calls += 1
+        stats.total_time += elapsed
+        if elapsed > stats.max_time:
+            stats.max_time = elapsed
+
+
+def _find_task(callback) -> Task | None:
+    '''Returns the task that the callback resumes, such as the one calling :meth:`asyncpygame.SDLEvent.wait`.'''
+    while isinstance(callback, partial):
+        for arg in callback.args:
+            if isinstance(task := getattr(arg, '__self__', None), Task):
+                return task
+        callback = callback.func
+    return None
+
+
+_UNKNOWN_TASK_LABEL = 'Task'
+
+
+def _task_label(task: Task) -> str:
+    '''
+    The name of the awaitable the task was started with, which the root coroutine awaits while the task is suspended.
+    :data:`_UNKNOWN_TASK_LABEL` if the task isn't suspended.
+    '''
+    if (aw := task.root_coro.cr_await) is None:
+        return _UNKNOWN_TASK_LABEL
+    return getattr(aw, '__qualname__', None) or type(aw).__qualname__
+
+
+def _default_label(callback) -> str:
+    while isinstance(callback, partial):
+        callback = callback.func
+    if callback is _stream_callback:
+        return 'SDLEvent.stream'
+    return getattr(callback, '__qualname__', None) or type(callback).__qualname__
+
+
+def _timed_call_labeled_by_task(req, callback, *args):
+    if (task := _find_task(callback)) is None:
+        # Such as the function that SDLEvent.wait_freq() puts in place while the task isn't waiting. The stats are
+        # determined when the callback that resumes the task gets called.
+        return _timed_call(req._instr._get_labeled_stats(_default_label(callback)), callback, *args)
+    # The task that the callback resumes is suspended at this point, so its label can be determined.
+    req._stats = stats = req._instr._get_labeled_stats(_task_label(task))
+    req._timed_callback = partial(_timed_call, stats, callback)
+    return _timed_call(stats, callback, *args)
+
+
+def _get_timed_callback(self):
+    return self._timed_callback
+
+
+def _set_callback(self, callback):
+    if (stats := self._stats) is None:
+        self._timed_callback = partial(_timed_call_labeled_by_task, self, callback)
+    else:
+        self._timed_callback = partial(_timed_call, stats, callback)
+
+
+class _InstrumentedSubscriber(Subscriber):
+    __slots__ = ('_instr', '_stats', '_timed_callback', )
+
+    def __init__(self, sdlevent, priority, callback, topics, index=None, region=None, label=None):
+        self._instr = instr = sdlevent._instrumentation
+        self._stats = instr._get_stats(label, callback)
+        super().__init__(sdlevent, priority, callback, topics, index, region, label)
+
+    def cancel(self):
+        if not self._cancelled:
+            self._instr._retire(self._stats)
+        super().cancel()
+
+    callback = property(_get_timed_callback, _set_callback)
+
+
+class _InstrumentedSDLEvent(SDLEvent):
+    _subscriber_cls = _InstrumentedSubscriber
+
+
+class _InstrumentedExecutionRequest(ExecutionRequest):
+    __slots__ = ('_instr', '_stats', '_timed_callback', )
+
+    def __init__(self, executor, priority, callback, label=None, rect=None):
+        self._instr = instr = executor._instrumentation
+        self._stats = instr._get_stats(label, callback)
+        super().__init__(executor, priority, callback, label, rect)
+
+    def cancel(self):
+        self._instr._retire(self._stats)
+        super().cancel()
+
+    callback = property(_get_timed_callback, _set_callback)
+
+
+class _InstrumentedPriorityExecutor(PriorityExecutor):
+    __slots__ = ()
+    _request_cls = _InstrumentedExecutionRequest
+
+
+class _InstrumentedScalablePriorityExecutor(ScalablePriorityExecutor):
+    __slots__ = ()
+    _request_cls = _InstrumentedExecutionRequest
+
+
+_INSTRUMENTED_CLASSES = {
+    SDLEvent: _InstrumentedSDLEvent,
+    PriorityExecutor: _InstrumentedPriorityExecutor,
+    ScalablePriorityExecutor: _InstrumentedScalablePriorityExecutor,
+}
+
+
+class Instrumentation:
+    '''
+    Measures how long the callbacks registered to a :class:`asyncpygame.SDLEvent` or a
+    :class:`asyncpygame.PriorityExecutor` take.
+
+    .. code-block::
+
+        instr = instrument(executor)
+        executor.register(draw_background, priority=0, label='background')
+        ...
+        for stats in instr.snapshot():
+            print(stats.label, stats.n_calls, stats.total_time, stats.max_time)
+
+    Each subscriber or request is measured on its own, except for the ones sharing a ``label``, which is given to
+    :meth:`asyncpygame.PriorityExecutor.register` or :meth:`asyncpygame.SDLEvent.subscribe`, and are measured
+    together. If it's not given:
+
+    * The callbacks that resume a task, such as the ones of :meth:`asyncpygame.SDLEvent.wait`, are labeled with the
+      name of the coroutine the task was started with, and are measured together per name. The name is taken on the
+      first call, and if the task isn't suspended at that time, ``'Task'`` is used instead.
+    * The others are labeled with the name of the callback function, and are measured on their own until they get
+      cancelled. Then their measurements are added up per name, so that the ones registered over and over don't
+      pile up.
+
+    Only the callbacks registered after the instrumentation has started are measured, and instrumenting has no cost
+    at all until then. While instrumenting, the ``callback`` attribute of a request returns a wrapper of the function
+    assigned to it.
+    '''
+    __slots__ = ('_target', '_original_cls', '_stats_per_label', '_own_stats', '_retired_stats', )
+
+    def __init__(self, target: SDLEvent | PriorityExecutor):
+        try:
+            instrumented_cls = _INSTRUMENTED_CLASSES[target.__class__]
+        except KeyError:
+            raise TypeError(f"Cannot instrument {target!r}. It might already be instrumented.") from None
+        self._target = target
+        self._original_cls = target.__class__
+        self._stats_per_label: dict[str, CallStats] = {}
+        self._own_stats: dict[int, CallStats] = {}  # id -> the stats of a live callback measured on its own
+        self._retired_stats: dict[str, CallStats] = {}  # label -> the sum of the stats of the cancelled ones
+        target._instrumentation = self
+        target.__class__ = instrumented_cls
+
+    def _get_stats(self, label, callback) -> CallStats | None:
+        '''
+        Returns None if the callback resumes a task, in which case the stats are determined on its first call.
+        '''
+        if label is not None:
+            return self._get_labeled_stats(label)
+        if _find_task(callback) is not None:
+            return None
+        stats = CallStats(_default_label(callback))
+        self._own_stats[id(stats)] = stats
+        return stats
+
+    def _get_labeled_stats(self, label) -> CallStats:
+        try:
+            return self._stats_per_label[label]
+        except KeyError:
+            stats = self._stats_per_label[label] = CallStats(label)
+            return stats
+
+    def _retire(self, stats: CallStats | None):
+        '''Adds the stats of a cancelled callback measured on its own to the ones of the cancelled callbacks.'''
+        if stats is None or self._own_stats.pop(id(stats), None) is None:
+            return
+        try:
+            retired = self._retired_stats[stats.label]
+        except KeyError:
+            retired = self._retired_stats[stats.label] = CallStats(stats.label)
+        retired.n_calls += stats.n_calls
+        retired.total_time += stats.total_time
+        if stats.max_time > retired.max_time:
+            retired.max_time = stats.max_time
+
+    def _all_stats(self) -> Iterable[CallStats]:
+        return chain(self._stats_per_label.values(), self._own_stats.values(), self._retired_stats.values())
+
+    def snapshot(self) -> list[CallStats]:
+        '''Returns a copy of the current measurements, the most time-consuming first.'''
+        return sorted(map(replace, self._all_stats()), key=attrgetter('total_time'), reverse=True)
+
+    def reset(self):
+        '''Sets all the measurements back to zero.'''
+        for stats in self._all_stats():
+            stats.n_calls = 0
+            stats.total_time = 0.
+            stats.max_time = 0.
+
+    def close(self):
+        '''
+        Stops instrumenting. The callbacks registered while instrumenting stay wrapped until they get cancelled.
+        '''
+        target = self._target
+        if target.__class__ is not self._original_cls:
+            target.__class__ = self._original_cls
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *__):
+        self.close()
+
+
+def instrument(target: SDLEvent | PriorityExecutor) -> Instrumentation:
+    '''
+    Starts measuring the callbacks registered to the ``target``. See :class:`Instrumentation` for details.
+
+    .. code-block::
+
+        with instrument(executor) as instr:
+            ...
+    '''
+    return Instrumentation(target)
@@ -0,0 +1,98 @@
+'''
+Just enough of Matroska for :func:`asyncpygame.run_and_record` to hand raw frames to ffmpeg together with their
+timestamps, which ``-f rawvideo`` cannot carry.
+
+The segment and the clusters are written with an unknown size so that the stream can be written to a pipe from front to
+back. Every size is written in 8 bytes, so nothing has to be measured twice.
+'''
+
+__all__ = ('FOURCCS', 'stream_header', 'BlockHeaders', )
+
+from struct import Struct
+
+FOURCCS = {
+    'bgr0': b'BGR\x00', 'rgb0': b'RGB\x00', '0bgr': b'\x00BGR', '0rgb': b'\x00RGB',
+    'bgr24': b'BGR\x18', 'rgb24': b'RGB\x18',
+}
+'''ffmpeg's pixel format -> the FourCC of ``V_UNCOMPRESSED`` that ffmpeg reads as that format.'''
+
+_UNKNOWN_SIZE = b'\x01\xff\xff\xff\xff\xff\xff\xff'
+_CLUSTER = b'\x1f\x43\xb6\x75'
+_CLUSTER_TIMESTAMP = b'\xe7'
+_SIMPLE_BLOCK = b'\xa3'
+_RELATIVE_TIMESTAMP_MAX = 0x7FFF
+_track_number_and_timestamp = Struct('>BhB')  # track number (as a vint), relative timestamp, flags (keyframe)
+
+
+def _size(n: int) -> bytes:
+    return (0x01 << 56 | n).to_bytes(8, 'big')
+
+
+def _uint(n: int) -> bytes:
+    return n.to_bytes(max(1, (n.bit_length() + 7) // 8), 'big')
+
+
+def _element(id: bytes, *children: bytes) -> bytes:
+    data = b''.join(children)
+    return id + _size(len(data)) + data
+
+
+def stream_header(width: int, height: int, pixel_format: str, fps) -> bytes:
+    '''
+    The bytes that precede the first frame. The timestamps are in milliseconds.
+    '''
+    return _element(
+        b'\x1a\x45\xdf\xa3',  # EBML
+        _element(b'\x42\x86', _uint(1)),  # EBMLVersion
+        _element(b'\x42\xf7', _uint(1)),  # EBMLReadVersion
+        _element(b'\x42\xf2', _uint(4)),  # EBMLMaxIDLength
+        _element(b'\x42\xf3', _uint(8)),  # EBMLMaxSizeLength
+        _element(b'\x42\x82', b'matroska'),  # DocType
+        _element(b'\x42\x87', _uint(4)),  # DocTypeVersion
+        _element(b'\x42\x85', _uint(2)),  # DocTypeReadVersion
+    ) + b'\x18\x53\x80\x67' + _UNKNOWN_SIZE + _element(  # Segment
+        b'\x15\x49\xa9\x66',  # Info
+        _element(b'\x2a\xd7\xb1', _uint(1_000_000)),  # TimestampScale (ns)
+        _element(b'\x4d\x80', b'asyncpygame'),  # MuxingApp
+        _element(b'\x57\x41', b'asyncpygame'),  # WritingApp
+    ) + _element(
+        b'\x16\x54\xae\x6b',  # Tracks
+        _element(
+            b'\xae',  # TrackEntry
+            _element(b'\xd7', _uint(1)),  # TrackNumber
+            _element(b'\x73\xc5', _uint(1)),  # TrackUID
+            _element(b'\x83', _uint(1)),  # TrackType (video)
+            _element(b'\x23\xe3\x83', _uint(round(1_000_000_000 / fps))),  # DefaultDuration (ns)
+            _element(b'\x86', b'V_UNCOMPRESSED'),  # CodecID
+            _element(
+                b'\xe0',  # Video
+                _element(b'\xb0', _uint(width)),  # PixelWidth
+                _element(b'\xba', _uint(height)),  # PixelHeight
+                _element(b'\x2e\xb5\x24', FOURCCS[pixel_format]),  # UncompressedFourCC
+            ),
+        ),
+    )
+
+
+class BlockHeaders:
+    '''
+    Creates the bytes that precede each frame. A new cluster begins whenever the timestamp of a frame relative to the
+    current cluster doesn't fit in 16 bits.
+    '''
+    __slots__ = ('_cluster_timestamp', )
+
+    def __init__(self):
+        self._cluster_timestamp = None
+
+    def __call__(self, timestamp: int, frame_size: int) -> bytes:
+        '''
+        :param timestamp: In milliseconds. Must not decrease.
+        '''
+        cluster_timestamp = self._cluster_timestamp
+        if cluster_timestamp is None or timestamp - cluster_timestamp > _RELATIVE_TIMESTAMP_MAX:
+            self._cluster_timestamp = cluster_timestamp = timestamp
+            cluster = _CLUSTER + _UNKNOWN_SIZE + _element(_CLUSTER_TIMESTAMP, _uint(timestamp))
+        else:
+            cluster = b''
+        return cluster + _SIMPLE_BLOCK + _size(frame_size + 4) + \
+            _track_number_and_timestamp.pack(0x81, timestamp - cluster_timestamp, 0x80)
@@ -0,0 +1,170 @@
+__all__ = ('Net', )
+
+import types
+import errno
+from selectors import DefaultSelector, EVENT_READ, EVENT_WRITE
+from socket import socket, SOL_SOCKET, SO_ERROR
+
+from asyncgui import _current_task, _sleep_forever
+
+
+def _ensure_non_blocking(sock: socket):
+    if sock.gettimeout() != 0:
+        raise ValueError(f"{sock!r} must be in non-blocking mode.")
+
+
+def _resume(steps: list):
+    # A task resumed earlier may cancel one of the others, which removes it from the list.
+    for step in steps.copy():
+        if step in steps:
+            step()
+
+
+class Net:
+    '''
+    Socket I/O without threads. When ``use_net=True`` is given, :func:`asyncpygame.run` polls the sockets every frame
+    without blocking, and passes an instance of this class to the main function as ``net``.
+
+    .. code-block::
+
+        sock = socket.socket()
+        sock.setblocking(False)
+        await net.connect(sock, ("localhost", 8000))
+        await net.send_all(sock, b"hello")
+        data = await net.recv(sock, 1024)
+
+    The sockets must be in non-blocking mode. Any number of tasks can wait for the same socket. All of them are
+    resumed when it becomes ready, and the ones that find nothing to do wait again.
+    '''
+    __slots__ = ('_selector', '_get_map', '_next_poll_waiters', )
+
+    def __init__(self):
+        self._selector = DefaultSelector()
+        self._get_map = self._selector.get_map
+        self._next_poll_waiters = []
+
+    def poll(self):
+        '''
+        Resumes the tasks waiting for sockets that are ready.
+        :func:`asyncpygame.run` calls this every frame, and the app should not.
+        '''
+        if (waiters := self._next_poll_waiters):
+            self._next_poll_waiters = []
+            for task in waiters:
+                if task is not None:
+                    task._step()
+        if not self._get_map():
+            return
+        for key, mask in self._selector.select(0):
+            readers, writers = key.data  # the task._step of the tasks waiting to read, and of the ones to write
+            if mask & EVENT_READ:
+                _resume(readers)
+            if mask & EVENT_WRITE:
+                _resume(writers)
+
+    def close(self):
+        self._selector.close()
+
+    def _add(self, fd: int, event, step):
+        selector = self._selector
+        try:
+            key = selector.get_key(fd)
+        except KeyError:
+            waiters = ([], [], )
+            waiters[event - 1].append(step)
+            selector.register(fd, event, waiters)
+        else:
+            key.data[event - 1].append(step)
+            if not key.events & event:
+                selector.modify(fd, key.events | event, key.data)
+
+    def _remove(self, fd: int, event, step):
+        selector = self._selector
+        key = selector.get_key(fd)
+        steps = key.data[event - 1]
+        steps.remove(step)
+        if steps:
+            return
+        if (events := key.events & ~event):
+            selector.modify(fd, events, key.data)
+        else:
+            selector.unregister(fd)
+
+    @types.coroutine
+    def _wait(self, fileobj, event):
+        fd = fileobj if isinstance(fileobj, int) else fileobj.fileno()
+        step = (yield _current_task)[0][0]._step
+        self._add(fd, event, step)
+        try:
+            yield _sleep_forever
+        finally:
+            self._remove(fd, event, step)
+
+    @types.coroutine
+    def _wait_for_next_poll(self):
+        '''For the things that cannot be waited for using a selector.'''
+        waiters = self._next_poll_waiters
+        idx = len(waiters)
+        try:
+            yield waiters.append
+        finally:
+            waiters[idx] = None
+
+    def wait_readable(self, fileobj):
+        '''Waits for a file object, or a file descriptor, to become readable.'''
+        return self._wait(fileobj, EVENT_READ)
+
+    def wait_writable(self, fileobj):
+        '''Waits for a file object, or a file descriptor, to become writable.'''
+        return self._wait(fileobj, EVENT_WRITE)
+
+    async def recv(self, sock: socket, n: int) -> bytes:
+        '''
+        Receives up to ``n`` bytes. Returns an empty bytes when the peer has closed the connection.
+        '''
+        _ensure_non_blocking(sock)
+        while True:
+            try:
+                return sock.recv(n)
+            except (BlockingIOError, InterruptedError):
+                await self._wait(sock, EVENT_READ)
+
+    async def send_all(self, sock: socket, data):
+        '''Sends the whole ``data``.'''
+        _ensure_non_blocking(sock)
+        data = memoryview(data).cast('B')
+        while data:
+            try:
+                n = sock.send(data)
+            except (BlockingIOError, InterruptedError):
+                await self._wait(sock, EVENT_WRITE)
+            else:
+                data = data[n:]
+
+    async def accept(self, listener: socket) -> tuple[socket, tuple]:
+        '''
+        Accepts a connection. The returned socket is in non-blocking mode.
+
+        .. code-block::
+
+            conn, address = await net.accept(listener)
+        '''
+        _ensure_non_blocking(listener)
+        while True:
+            try:
+                conn, address = listener.accept()
+            except (BlockingIOError, InterruptedError):
+                await self._wait(listener, EVENT_READ)
+            else:
+                conn.setblocking(False)
+                return conn, address
+
+    async def connect(self, sock: socket, address):
+        '''Connects to a remote socket.'''
+        _ensure_non_blocking(sock)
+        err = sock.connect_ex(address)
+        if err in (errno.EINPROGRESS, errno.EWOULDBLOCK, errno.EAGAIN, ):
+            await self._wait(sock, EVENT_WRITE)
+            err = sock.getsockopt(SOL_SOCKET, SO_ERROR)
+        if err:
+            raise OSError(err, f"Connect call failed {address!r}")
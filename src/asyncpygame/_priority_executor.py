@@ -1,16 +1,76 @@
 from heapq import merge as heapq_merge
+from bisect import insort
+from operator import attrgetter
+
+from pygame.rect import Rect
+import pygame.display
 
 
 class ExecutionRequest:
-    __slots__ = ('_priority', 'callback', '_cancelled', )
+    __slots__ = ('_executor', '_priority', 'callback', '_cancelled', 'label', '_rect', )
 
-    def __init__(self, priority, callback):
+    def __init__(self, executor, priority, callback, label=None, rect=None):
+        self._executor = executor
         self._priority = priority
         self.callback = callback
         self._cancelled = False
+        self.label = label
+        self._rect = None if rect is None else Rect(rect)
+        if rect is not None:
+            executor._mark_dirty(self._rect)
 
     def cancel(self):
         self._cancelled = True
+        if (rect := self._rect) is not None:
+            self._executor._mark_dirty(rect)
+
+    @property
+    def priority(self):
+        '''
+        You can change it by simply assigning to this attribute. The executor re-sorts the requests in the next frame,
+        which costs little when only some of them have changed, so it's fine to do every frame.
+
+        .. code-block::
+
+            # y-sorting
+            req.priority = sprite_rect.bottom
+        '''
+        return self._priority
+
+    @priority.setter
+    def priority(self, priority):
+        if priority == self._priority:
+            return
+        self._priority = priority
+        executor = self._executor
+        executor._needs_sort = True
+        if (rect := self._rect) is not None:
+            executor._mark_dirty(rect)
+
+    @property
+    def rect(self) -> Rect | None:
+        '''
+        The area the callback draws in. Only used in the dirty-rect mode.
+        Assigning a new one marks both the old and the new area dirty. Modifying the one returned has no effect.
+        '''
+        rect = self._rect
+        return None if rect is None else rect.copy()
+
+    @rect.setter
+    def rect(self, rect):
+        executor = self._executor
+        if (old_rect := self._rect) is not None:
+            executor._mark_dirty(old_rect)
+        if rect is None:
+            self._rect = None
+        else:
+            self._rect = rect = Rect(rect)
+            executor._mark_dirty(rect)
+
+    def mark_dirty(self):
+        '''Tells the executor that the drawing has changed without moving. Only used in the dirty-rect mode.'''
+        if (rect := self._rect) is not None:
+            self._executor._mark_dirty(rect)
 
     def __eq__(self, other):
         return self._priority == other._priority
@@ -34,7 +94,7 @@ class ExecutionRequest:
         return self
 
     def __exit__(self, *__):
-        self._cancelled = True
+        self.cancel()
 
 
 class PriorityExecutor:
@@ -57,30 +117,51 @@ class PriorityExecutor:
         assert values == ['B', 'C', 'A', ]
 
     The :func:`asyncpygame.run` creates an instance of this class and calls its :meth:`__call__` every frame.
+
+    **Dirty-rect mode**
+
+    By default, every function gets called every frame. After :meth:`enable_dirty_rects`, the ones registered with a
+    ``rect`` only get called when some part of it needs to be repainted, clipped to that part, so that an app where
+    only a spinner moves doesn't repaint and upload the whole screen every frame.
+
+    .. code-block::
+
+        executor.enable_dirty_rects(screen)
+        executor.register(partial(screen.fill, "black"), priority=0, rect=screen.get_rect())
+        req = executor.register(partial(screen.blit, img, dest), priority=100, rect=img.get_rect(topleft=dest))
+        executor.register(executor.update_display, priority=0xFFFFFF00)
+
+        # when the image moves
+        req.callback = partial(screen.blit, img, new_dest)
+        req.rect = img.get_rect(topleft=new_dest)
+
+        # when the image changes without moving
+        req.mark_dirty()
+
+    An area becomes dirty when a request covering it is registered, cancelled, moved or marked dirty. The functions
+    registered without a ``rect`` get called every frame, without clipping, and should not draw on the target.
     '''
-    __slots__ = ('_reqs', '_reqs_2', '_reqs_to_be_added', '_reqs_to_be_added_2', )
+    __slots__ = ('_reqs', '_reqs_2', '_reqs_to_be_added', '_reqs_to_be_added_2', '_instrumentation', '_dirty_target',
+                 '_dirty_rects', '_next_dirty_rects', '_needs_sort', '_req_in_parent', )
+
+    _request_cls = ExecutionRequest
 
     def __init__(self):
         self._reqs: list[ExecutionRequest] = []
         self._reqs_2: list[ExecutionRequest] = []  # double buffering
         self._reqs_to_be_added: list[ExecutionRequest] = []
         self._reqs_to_be_added_2: list[ExecutionRequest] = []  # double buffering
+        self._needs_sort = False  # whether the priority of any request has changed
+        self._dirty_target = None
+        self._dirty_rects: list[Rect] = []
+        self._next_dirty_rects: list[Rect] = None
+        self._req_in_parent: ExecutionRequest = None  # only for the executors created by create_child()
 
     def __call__(self, *args):
+        if self._dirty_target is not None:
+            return self._call_with_dirty_rects(args)
+        req_iter = self._merge_new_requests()
         reqs = self._reqs
-        reqs_tba = self._reqs_to_be_added
-        if reqs_tba:
-            reqs_tba.sort()
-            req_iter = heapq_merge(reqs, reqs_tba)
-            reqs_tba2 = self._reqs_to_be_added_2
-            reqs_tba2.clear()
-            self._reqs_to_be_added = reqs_tba2
-            self._reqs_to_be_added_2 = reqs_tba
-            del reqs_tba2
-        else:
-            req_iter = iter(reqs)
-        del reqs_tba
-
         reqs2 = self._reqs_2
         reqs2_append = reqs2.append
         try:
@@ -94,7 +175,209 @@ class PriorityExecutor:
             self._reqs = reqs2
             self._reqs_2 = reqs
 
-    def register(self, func, priority) -> ExecutionRequest:
-        req = ExecutionRequest(priority, func)
+    def register(self, func, priority, *, label=None, rect=None) -> ExecutionRequest:
+        '''
+        :param label: See :class:`asyncpygame.Instrumentation`.
+        :param rect: The area the ``func`` draws in. Only used in the dirty-rect mode.
+        '''
+        req = self._request_cls(self, priority, func, label, rect)
         self._reqs_to_be_added.append(req)
         return req
+
+    def create_child(self, priority, *, label=None) -> 'PriorityExecutor':
+        '''
+        Creates an executor that runs as a single function registered to this one. It has its own priority space, and
+        can be cancelled or paused in O(1) together with everything registered to it.
+
+        .. code-block::
+
+            with executor.create_child(priority=0x100) as child:
+                child.register(draw_background, priority=0)
+                child.register(draw_player, priority=1)
+                ...
+                child.pause()
+                ...
+                child.resume()
+
+        A child doesn't take part in the dirty-rect mode of its parent.
+        '''
+        child = self._child_cls()
+        child._req_in_parent = self.register(child, priority, label=label)
+        return child
+
+    def _get_req_in_parent(self) -> ExecutionRequest:
+        if (req := self._req_in_parent) is None:
+            raise RuntimeError("Only the executors created by create_child() can do this.")
+        return req
+
+    def pause(self):
+        '''Stops being called by the parent. Only for the executors created by :meth:`create_child`.'''
+        self._get_req_in_parent().callback = _do_nothing
+
+    def resume(self):
+        '''Undoes :meth:`pause`.'''
+        self._get_req_in_parent().callback = self
+
+    def cancel(self):
+        '''Unregisters from the parent for good. Only for the executors created by :meth:`create_child`.'''
+        self._get_req_in_parent().cancel()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *__):
+        self.cancel()
+
+    def _merge_new_requests(self):
+        reqs = self._reqs
+        if self._needs_sort:
+            # Timsort takes linear time on a list that is mostly sorted.
+            self._needs_sort = False
+            reqs.sort()
+        reqs_tba = self._reqs_to_be_added
+        if not reqs_tba:
+            return iter(reqs)
+        reqs_tba.sort()
+        reqs_tba2 = self._reqs_to_be_added_2
+        reqs_tba2.clear()
+        self._reqs_to_be_added = reqs_tba2
+        self._reqs_to_be_added_2 = reqs_tba
+        return heapq_merge(reqs, reqs_tba)
+
+    def _call_with_dirty_rects(self, args):
+        target = self._dirty_target
+        self._dirty_rects = dirty_rects = _merge_rects(self._next_dirty_rects, target.get_rect())
+        self._next_dirty_rects = []
+        req_iter = self._merge_new_requests()
+        reqs = self._reqs
+        reqs2 = self._reqs_2
+        reqs2_append = reqs2.append
+        set_clip = target.set_clip
+        original_clip = target.get_clip()
+        try:
+            for req in req_iter:
+                if req._cancelled:
+                    continue
+                reqs2_append(req)
+                if (rect := req._rect) is None:
+                    req.callback(*args)
+                    continue
+                for dirty_rect in dirty_rects:
+                    if rect.colliderect(dirty_rect):
+                        set_clip(dirty_rect)
+                        try:
+                            req.callback(*args)
+                        finally:
+                            set_clip(original_clip)
+        finally:
+            reqs.clear()
+            self._reqs = reqs2
+            self._reqs_2 = reqs
+
+    def _mark_dirty(self, rect: Rect):
+        if (rects := self._next_dirty_rects) is not None:
+            rects.append(rect)
+
+    def enable_dirty_rects(self, draw_target):
+        '''
+        Enters the dirty-rect mode. The whole ``draw_target`` gets repainted in the next frame.
+        '''
+        self._dirty_target = draw_target
+        self._next_dirty_rects = [draw_target.get_rect()]
+
+    def disable_dirty_rects(self):
+        self._dirty_target = None
+        self._dirty_rects = []
+        self._next_dirty_rects = None
+
+    @property
+    def dirty_rects(self) -> list[Rect]:
+        '''The areas repainted in the current or the latest frame. They don't overlap each other.'''
+        return self._dirty_rects
+
+    def update_display(self):
+        '''
+        :func:`pygame.display.update` with :attr:`dirty_rects`. Register this instead of :func:`pygame.display.flip`
+        in the dirty-rect mode.
+        '''
+        if (dirty_rects := self._dirty_rects):
+            pygame.display.update(dirty_rects)
+
+
+PriorityExecutor._child_cls = PriorityExecutor
+
+
+class ScalablePriorityExecutor(PriorityExecutor):
+    '''
+    A :class:`PriorityExecutor` for apps that have tens of thousands of requests, most of which persist across frames.
+    The order in which the functions get called is exactly the same.
+
+    :class:`PriorityExecutor` rebuilds its list of requests every frame, dropping the cancelled ones along the way.
+    This one keeps a single sorted list instead. New requests are inserted into it, and the cancelled ones are left
+    in place until they exceed :attr:`compaction_threshold` of the list, at which point the list gets compacted.
+    So a frame where nothing changed costs only the calls themselves.
+
+    .. code-block::
+
+        asyncpygame.run(main, executor_cls=ScalablePriorityExecutor)
+
+    The dirty-rect mode works the same, but doesn't benefit from this.
+    '''
+    __slots__ = ()
+
+    compaction_threshold = 0.25
+    '''The ratio of the cancelled requests to all the requests that triggers a compaction.'''
+
+    _n_insorts = 8
+    '''If more requests than this are added in a frame, they are merged by sorting instead of being inserted.'''
+
+    def __call__(self, *args):
+        if self._dirty_target is not None:
+            return self._call_with_dirty_rects(args)
+        reqs = self._reqs
+        self._merge_new_requests()
+        n_cancelled = 0
+        for req in reqs:
+            if req._cancelled:
+                n_cancelled += 1
+                continue
+            req.callback(*args)
+        if n_cancelled > len(reqs) * self.compaction_threshold:
+            reqs[:] = [req for req in reqs if not req._cancelled]
+
+    def _merge_new_requests(self, _key=attrgetter('_priority')):
+        # Sorting by a key compares the priorities directly instead of calling ExecutionRequest.__lt__().
+        reqs = self._reqs
+        if self._needs_sort:
+            self._needs_sort = False
+            reqs.sort(key=_key)
+        if (reqs_tba := self._reqs_to_be_added):
+            # Both ways put the new requests after the existing ones with the same priority, in the order they were
+            # registered, as heapq.merge() does in PriorityExecutor.
+            if len(reqs_tba) > self._n_insorts:
+                reqs.extend(reqs_tba)
+                reqs.sort(key=_key)
+            else:
+                for req in reqs_tba:
+                    insort(reqs, req, key=_key)
+            reqs_tba.clear()
+        return iter(reqs)
+
+
+ScalablePriorityExecutor._child_cls = ScalablePriorityExecutor
+
+
+def _do_nothing(*args):
+    pass
+
+
+def _merge_rects(rects: list[Rect], bounds: Rect) -> list[Rect]:
+    '''Clips the rects to the ``bounds``, and merges the overlapping ones.'''
+    merged = []
+    for rect in rects:
+        if not (rect := rect.clip(bounds)):
+            continue
+        while (i := rect.collidelist(merged)) != -1:
+            rect = rect.union(merged.pop(i))
+        merged.append(rect)
+    return merged
@@ -0,0 +1,133 @@
+__all__ = ('SharedBuffer', 'run_in_process', )
+
+import weakref
+from collections.abc import Awaitable, Callable
+from concurrent.futures import Future
+from multiprocessing.shared_memory import SharedMemory
+
+import pygame.image
+from pygame.surface import Surface
+
+from ._threading import ThreadSafeFuture, WorkerPool
+
+
+_shms_to_close: list[SharedMemory] = []
+
+
+def _close_later(shm: SharedMemory):
+    # This is called while the surface using the 'shm' is being deallocated, before it releases the buffer, so closing
+    # the 'shm' right now would fail.
+    _close_pending()
+    _shms_to_close.append(shm)
+
+
+def _close_pending():
+    while _shms_to_close:
+        _shms_to_close.pop().close()
+
+
+class SharedBuffer:
+    '''
+    A block of bytes in :mod:`multiprocessing.shared_memory`, which lets a worker process hand a large result, such
+    as decoded pixels, over to the main process without pickling it.
+
+    .. code-block::
+
+        # in a worker process
+        def decode_image(path) -> tuple[SharedBuffer, tuple[int, int]]:
+            image = PIL.Image.open(path).convert('RGBA')
+            return SharedBuffer.from_bytes(image.tobytes()), image.size
+
+        # in the main process
+        buffer, size = await run_in_process(decode_image, path, pool=pool)
+        surface = buffer.to_surface(size, 'RGBA')
+
+    The block is freed by :meth:`to_surface`, :meth:`to_bytes` or :meth:`discard`, so exactly one of them must be
+    called on each instance. :func:`run_in_process` takes care of the instances that are never delivered because the
+    caller got cancelled.
+
+    Only POSIX is supported. The worker closes its handle to the block before the main process opens it, which frees
+    the block on Windows, where a block only lives as long as someone has a handle to it.
+    '''
+    __slots__ = ('name', 'size', )
+
+    def __init__(self, name: str, size: int):
+        self.name = name
+        self.size = size
+
+    @classmethod
+    def from_bytes(cls, data) -> 'SharedBuffer':
+        '''Copies a bytes-like object into a new block of shared memory. Usually called in a worker process.'''
+        data = memoryview(data).cast('B')
+        size = len(data)
+        shm = SharedMemory(create=True, size=max(size, 1))
+        try:
+            shm.buf[:size] = data
+        finally:
+            shm.close()
+        return cls(shm.name, size)
+
+    def _open(self) -> SharedMemory:
+        _close_pending()
+        shm = SharedMemory(self.name)
+        # The mapping outlives the name, so the block is freed as soon as nothing maps it, even if the app crashes.
+        shm.unlink()
+        return shm
+
+    def to_surface(self, size, format='RGBA') -> Surface:
+        '''
+        Creates a :class:`pygame.Surface` that directly uses the shared memory as its pixels, using
+        :func:`pygame.image.frombuffer`. The parameters are the same as the ones of it.
+        The memory is released when the surface gets garbage-collected.
+        '''
+        shm = self._open()
+        surface = pygame.image.frombuffer(shm.buf[:self.size], size, format)
+        weakref.finalize(surface, _close_later, shm)
+        return surface
+
+    def to_bytes(self) -> bytes:
+        '''Copies the content into a :class:`bytes`, and frees the shared memory.'''
+        shm = self._open()
+        try:
+            return bytes(shm.buf[:self.size])
+        finally:
+            shm.close()
+
+    def discard(self):
+        '''Frees the shared memory without reading it.'''
+        self._open().close()
+
+
+def _discard_shared_buffers(cf: Future):
+    if cf.cancelled() or cf.exception() is not None:
+        return
+    result = cf.result()
+    for obj in (result if isinstance(result, tuple) else (result, )):
+        if isinstance(obj, SharedBuffer):
+            obj.discard()
+
+
+async def run_in_process(func: Callable, *args, pool: WorkerPool) -> Awaitable:
+    '''
+    :func:`asyncpygame.run_in_executor` for the :class:`asyncpygame.WorkerPool` s backed by a
+    :class:`concurrent.futures.ProcessPoolExecutor`. The ``func`` and the ``args`` must be picklable.
+
+    .. code-block::
+
+        with WorkerPool(sdlevent, executor_cls=ProcessPoolExecutor) as pool:
+            path = await run_in_process(find_path, grid, start, goal, pool=pool)
+
+    If the caller gets cancelled, the :class:`SharedBuffer` s in the result, either the result itself or the elements
+    of a tuple, are freed.
+    '''
+    future = ThreadSafeFuture(pool._sdlevent)
+    cf = pool._submit(future, func, args)
+    try:
+        return await future
+    except BaseException:
+        if not future.done:
+            cf.add_done_callback(_discard_shared_buffers)
+        raise
+    finally:
+        future.cancel()
+        cf.cancel()
@@ -1,8 +1,23 @@
-__all__ = ("run", "quit", "run_and_record", )
+__all__ = ("run", "quit", "run_and_record", "replay", "run_headless", )
 
-from collections.abc import Iterator
+from collections.abc import Iterator, Iterable
+from contextlib import contextmanager, nullcontext
+from functools import partial
+from itertools import chain, islice, repeat
+from os import PathLike
+import os
+import sys
 import pygame
+from pygame.event import Event
 import asyncpygame as ap
+from ._utils import coalesce_motion_events
+from ._event_log import _EventLogWriter, read_event_log
+from ._event_budget import EventBudget
+from ._net import Net
+from ._asyncio_bridge import AsyncioBridge
+from ._frame_writer import FrameWriter
+from . import _matroska
+from ._priority_executor import PriorityExecutor
 
 
 class AppQuit(Exception):
@@ -13,27 +28,61 @@ def quit(*args):
     raise AppQuit()
 
 
-def run(main_func, *, fps=30, auto_quit=True):
+def run(main_func, *, fps=30, auto_quit=True, coalesce_motion=False, record_events_to: str | PathLike=None,
+        event_budget: EventBudget=None, asyncio_mode: str=None, executor_cls: type[PriorityExecutor]=None,
+        use_net=False):
+    '''
+    :param coalesce_motion: If True, the motion events that occurred within a frame are merged using
+                            :func:`asyncpygame.coalesce_motion_events` before being dispatched.
+    :param record_events_to: If specified, the events dispatched and the delta times of frames are recorded to this
+                             file, which can be played back using :func:`replay`.
+    :param event_budget: If specified, the number of events dispatched in a frame and/or the time spent on it is
+                         limited by this. See :class:`asyncpygame.EventBudget`. When used together with
+                         ``record_events_to``, the events are recorded before being limited, so the same budget should
+                         be given to :func:`replay` to reproduce the session.
+    :param asyncio_mode: If specified, an :mod:`asyncio` event loop runs next to the frame loop, and an
+                         :class:`asyncpygame.AsyncioBridge` is passed to the main function as ``asyncio_bridge``.
+                         Either ``'step'`` or ``'thread'``. See :class:`asyncpygame.AsyncioBridge` for details.
+    :param executor_cls: :class:`asyncpygame.PriorityExecutor` (default) or
+                         :class:`asyncpygame.ScalablePriorityExecutor`.
+    :param use_net: If True, an :class:`asyncpygame.Net` is passed to the main function as ``net``, and its sockets
+                    are polled every frame.
+    '''
     pygame_clock = pygame.Clock()
     clock = ap.Clock()
     sdlevent = ap.SDLEvent()
-    executor = ap.PriorityExecutor()
-    main_task = ap.start(main_func(clock=clock, sdlevent=sdlevent, executor=executor, pygame_clock=pygame_clock))
+    executor = (PriorityExecutor if executor_cls is None else executor_cls)()
+    net, net_params = _create_net(use_net)
+    asyncio_bridge, optional_params = _create_asyncio_bridge(sdlevent, asyncio_mode)
+    main_task = ap.start(main_func(
+        clock=clock, sdlevent=sdlevent, executor=executor, pygame_clock=pygame_clock, **net_params,
+        **optional_params))
 
     if auto_quit:
         sdlevent.subscribe((pygame.QUIT, ), quit, priority=0)
-        sdlevent.subscribe((pygame.KEYDOWN, ), lambda e, K=pygame.K_ESCAPE: e.key == K and quit(), priority=0)
+        sdlevent.subscribe((pygame.KEYDOWN, ), quit, priority=0, attr=('key', pygame.K_ESCAPE))
 
     # LOAD_FAST
-    pygame_event_get = pygame.event.get
+    pygame_event_get = _get_coalesced_events if coalesce_motion else pygame.event.get
     pygame_clock_tick = pygame_clock.tick
     clock_tick = clock.tick
-    sdlevent_dispatch = sdlevent.dispatch
+    net_poll = _do_nothing if net is None else net.poll
+    asyncio_step = _do_nothing if asyncio_bridge is None else asyncio_bridge.step
+    sdlevent_dispatch_many = \
+        sdlevent.dispatch_many if event_budget is None else partial(event_budget.dispatch, sdlevent)
+
+    if record_events_to is None:
+        writer = None
+    else:
+        writer = _EventLogWriter(record_events_to)
+        pygame_event_get = partial(writer.get_events, pygame_event_get)
+        pygame_clock_tick = partial(writer.tick, pygame_clock_tick)
 
     try:
         while True:
-            for event in pygame_event_get():
-                sdlevent_dispatch(event)
+            sdlevent_dispatch_many(pygame_event_get())
+            net_poll()
+            asyncio_step()
             clock_tick(pygame_clock_tick(fps))
             executor()
     except AppQuit:
@@ -44,13 +93,141 @@ def run(main_func, *, fps=30, auto_quit=True):
             raise ap.ExceptionGroup(group.message, unignorable_excs)
     finally:
         main_task.cancel()
+        if net is not None:
+            net.close()
+        if asyncio_bridge is not None:
+            asyncio_bridge.close()
+        if writer is not None:
+            writer.close()
+
+
+def replay(main_func, infile: str | PathLike, *, auto_quit=True, headless=True,
+           event_budget: EventBudget=None, use_net=False) -> ap.Task:
+    '''
+    Runs the program using the events and the delta times recorded by :func:`run` instead of real ones.
+    Frames are processed as fast as possible, and the function returns the main task when the recording ends.
+
+    .. code-block::
+
+        run(main, record_events_to="./events.log")
+        replay(main, "./events.log")
+
+    :param headless: If True, the SDL dummy video driver is used so that no window is shown.
+                     The ``SDL_VIDEODRIVER`` environment variable is set back to its previous value when the function
+                     returns.
+    :param event_budget: Same as the one of :func:`run`.
+    :param use_net: Same as the one of :func:`run`.
+    '''
+    with (_dummy_video_driver() if headless else nullcontext()):
+        return _run_frames(
+            main_func, read_event_log(infile), _without_live_events, auto_quit, event_budget, None, None, use_net)
+
+
+def run_headless(main_func, *, dt=1000 / 30, max_frames=None, event_source: Iterable[Iterable[Event]]=(),
+                 auto_quit=True, event_budget: EventBudget=None, asyncio_mode: str=None,
+                 executor_cls: type[PriorityExecutor]=None, use_net=False) -> ap.Task:
+    '''
+    Runs the program without a window, advancing the clock by ``dt`` every frame as fast as possible.
+    Useful for testing and simulation.
+
+    .. code-block::
+
+        # Each element of 'event_source' is the events of a frame.
+        event_source = [
+            [Event(MOUSEBUTTONDOWN, button=1, pos=(100, 100))],
+            [],
+            [Event(MOUSEBUTTONUP, button=1, pos=(100, 100))],
+        ]
+        main_task = run_headless(main, max_frames=100, event_source=event_source)
+
+    The function returns the main task when any of the following happens:
+
+    * The app quits.
+    * The main task ends.
+    * ``max_frames`` frames have been processed.
+
+    The events posted by the app itself using :func:`pygame.event.post` are dispatched after the ones from the
+    ``event_source``.
+
+    The SDL dummy video driver is used while the function runs, and the ``SDL_VIDEODRIVER`` environment variable is
+    set back to its previous value when it returns.
+
+    :param event_budget: Same as the one of :func:`run`.
+    :param asyncio_mode: Same as the one of :func:`run`.
+    :param executor_cls: Same as the one of :func:`run`.
+    :param use_net: Same as the one of :func:`run`.
+    '''
+    frames = zip(chain(event_source, repeat(())), repeat(dt))
+    if max_frames is not None:
+        frames = islice(frames, max_frames)
+    with _dummy_video_driver():
+        return _run_frames(
+            main_func, frames, _with_live_events, auto_quit, event_budget, asyncio_mode, executor_cls, use_net)
+
+
+def _run_frames(main_func, frames: Iterable[tuple[Iterable[Event], float | None]], process_live_events,
+                auto_quit, event_budget, asyncio_mode, executor_cls, use_net) -> ap.Task:
+    '''
+    The common part of :func:`replay` and :func:`run_headless`. A delta time of None ends the loop.
+    '''
+    clock = ap.Clock()
+    sdlevent = ap.SDLEvent()
+    executor = (PriorityExecutor if executor_cls is None else executor_cls)()
+    net, net_params = _create_net(use_net)
+    asyncio_bridge, optional_params = _create_asyncio_bridge(sdlevent, asyncio_mode)
+    main_task = ap.start(main_func(clock=clock, sdlevent=sdlevent, executor=executor, **net_params, **optional_params))
+
+    if auto_quit:
+        sdlevent.subscribe((pygame.QUIT, ), quit, priority=0)
+        sdlevent.subscribe((pygame.KEYDOWN, ), quit, priority=0, attr=('key', pygame.K_ESCAPE))
+
+    # LOAD_FAST
+    clock_tick = clock.tick
+    net_poll = _do_nothing if net is None else net.poll
+    asyncio_step = _do_nothing if asyncio_bridge is None else asyncio_bridge.step
+    sdlevent_dispatch_many = \
+        sdlevent.dispatch_many if event_budget is None else partial(event_budget.dispatch, sdlevent)
+    STARTED = ap.TaskState.STARTED
+
+    try:
+        for events, dt in frames:
+            if main_task.state is not STARTED:
+                break
+            sdlevent_dispatch_many(process_live_events(events))
+            net_poll()
+            asyncio_step()
+            if dt is None:
+                break
+            clock_tick(dt)
+            executor()
+    except AppQuit:
+        pass
+    except ap.ExceptionGroup as group:
+        unignorable_excs = tuple(e for e in group.exceptions if not isinstance(e, AppQuit))
+        if unignorable_excs:
+            raise ap.ExceptionGroup(group.message, unignorable_excs)
+    finally:
+        main_task.cancel()
+        if net is not None:
+            net.close()
+        if asyncio_bridge is not None:
+            asyncio_bridge.close()
+        _without_live_events(())
+    return main_task
 
 
-def run_and_record(main_func, *, fps=30, auto_quit=True, outfile="./output.mkv", overwrite=False,
-                   outfile_options: Iterator[str]=r"-codec:v libx265 -qscale:v 0".split()):
+def run_and_record(main_func, *, fps=30, auto_quit=True, coalesce_motion=False, event_budget: EventBudget=None,
+                   outfile="./output.mkv", overwrite=False,
+                   outfile_options: Iterator[str]=r"-codec:v libx265 -qscale:v 0".split(),
+                   encoder_queue_size=3, on_encoder_lag='block', drop_duplicate_frames=False, pass_frame_writer=False,
+                   use_net=False):
     '''
     Runs the program while recording the screen to a video file using ffmpeg.
-    Requires numpy.
+
+    The pixels of the screen are handed to ffmpeg as they are in memory, using the pixel format that matches them.
+    Screens whose layout ffmpeg cannot read directly are converted to ``rgb24`` instead, which requires numpy.
+
+    The frames are written to ffmpeg in a background thread, so the frame loop only copies them.
 
     .. code-block::
 
@@ -62,60 +239,91 @@ def run_and_record(main_func, *, fps=30, auto_quit=True, outfile="./output.mkv",
 
         # WebP, lossless compression, infinite loop
         run_and_record(..., outfile_options=r"-codec:v libwebp -lossless 1 -loop 0".split(), outfile="./output.webp")
+
+    :param encoder_queue_size: The number of frames that can wait for ffmpeg.
+    :param on_encoder_lag: What happens when ffmpeg falls behind that much. ``'block'`` or ``'drop'``.
+                           See :class:`asyncpygame.FrameWriter` for details.
+    :param drop_duplicate_frames: If True, the frames identical to the previous one are neither copied nor handed to
+                                  ffmpeg, and the video gets a variable frame rate, which makes recordings of mostly
+                                  static screens, such as menus, much cheaper to record, encode and store. To let the
+                                  rest of the frames keep their timestamps, they are sent in Matroska instead of as
+                                  raw video. ffmpeg older than 5.1 is told to keep them using ``-vsync vfr``
+                                  instead of ``-fps_mode vfr``.
+    :param pass_frame_writer: If True, the :class:`asyncpygame.FrameWriter` that hands the frames to ffmpeg is passed
+                              to the main function as ``frame_writer``, which tells how far ffmpeg is behind.
+    :param use_net: Same as the one of :func:`run`.
     '''
     import subprocess
-    from numpy import copyto as numpy_copyto
-    from pygame.surfarray import pixels3d
 
     clock = ap.Clock()
     sdlevent = ap.SDLEvent()
     executor = ap.PriorityExecutor()
-    main_task = ap.start(main_func(clock=clock, sdlevent=sdlevent, executor=executor))
+    net, optional_params = _create_net(use_net)
+    frame_writer = FrameWriter(on_lag=on_encoder_lag)
+    if pass_frame_writer:
+        optional_params['frame_writer'] = frame_writer
+    main_task = ap.start(main_func(clock=clock, sdlevent=sdlevent, executor=executor, **optional_params))
     screen = pygame.display.get_surface()
 
     if auto_quit:
         sdlevent.subscribe((pygame.QUIT, ), quit, priority=0)
-        sdlevent.subscribe((pygame.KEYDOWN, ), lambda e, K=pygame.K_ESCAPE: e.key == K and quit(), priority=0)
+        sdlevent.subscribe((pygame.KEYDOWN, ), quit, priority=0, attr=('key', pygame.K_ESCAPE))
+
+    if (pixel_format := _native_pixel_format(screen)) is None:
+        pixel_format = 'rgb24'
+        buffers = [_create_output_buffer_for_surface(screen) for __ in range(encoder_queue_size)]
+        is_unchanged, copy_frame = _create_change_detector(screen, _create_rgb24_frame_copier(screen))
+    else:
+        buffers = [bytearray(screen.get_pitch() * screen.height) for __ in range(encoder_queue_size)]
+        copy_frame = partial(_copy_frame_as_is, screen.get_view)
+        is_unchanged = partial(_is_unchanged_as_is, frame_writer.is_unchanged, screen.get_view)
+
+    if drop_duplicate_frames:
+        record_frame = _DeduplicatingRecorder(
+            frame_writer, copy_frame, is_unchanged, memoryview(buffers[0]).nbytes,
+            _matroska.stream_header(screen.width, screen.height, pixel_format, fps), fps)
+        finish_recording = record_frame.finish
+        input_options = ('-f', 'matroska', )
+        outfile_options = (*_vfr_options(), *outfile_options, )
+    else:
+        record_frame = partial(_record_frame, frame_writer.acquire, copy_frame, frame_writer.submit)
+        finish_recording = _do_nothing
+        input_options = (
+            '-f', 'rawvideo',
+            '-codec:v', 'rawvideo',
+            '-pixel_format', pixel_format,
+            '-video_size', f'{screen.width}x{screen.height}',
+            '-framerate', str(fps),
+        )
 
     ffmpeg_cmd = (
         'ffmpeg',
         '-y' if overwrite else '-n',
-        '-f', 'rawvideo',
-        '-codec:v', 'rawvideo',
-        '-pixel_format', 'rgb24',
-        '-video_size', f'{screen.width}x{screen.height}',
-        '-framerate', str(fps),
+        *input_options,
         '-i', '-',  # stdin as the input source
         '-an',  # no audio
         *outfile_options,
         outfile,
     )
     process = subprocess.Popen(ffmpeg_cmd, stdin=subprocess.PIPE, bufsize=0)
-    output_buffer = _create_output_buffer_for_surface(screen)
-    output_axis_order = (1, 0, 2)  # 高さ 幅 画素 の順
+    frame_writer.start(process.stdin, buffers)
+    del buffers
 
     # LOAD_FAST
-    pygame_event_get = pygame.event.get
+    pygame_event_get = _get_coalesced_events if coalesce_motion else pygame.event.get
     clock_tick = clock.tick
-    sdlevent_dispatch = sdlevent.dispatch
-    process_stdin_write = process.stdin.write
-    screen_lock = screen.lock
-    screen_unlock = screen.unlock
+    net_poll = _do_nothing if net is None else net.poll
+    sdlevent_dispatch_many = \
+        sdlevent.dispatch_many if event_budget is None else partial(event_budget.dispatch, sdlevent)
 
     try:
         dt = 1000.0 / fps
         while True:
-            for event in pygame_event_get():
-                sdlevent_dispatch(event)
+            sdlevent_dispatch_many(pygame_event_get())
+            net_poll()
             clock_tick(dt)
             executor()
-
-            screen_lock()
-            frame = pixels3d(screen).transpose(output_axis_order)
-            numpy_copyto(output_buffer, frame)
-            process_stdin_write(output_buffer)
-            del frame
-            screen_unlock()
+            record_frame()
     except AppQuit:
         pass
     except ap.ExceptionGroup as group:
@@ -124,8 +332,190 @@ def run_and_record(main_func, *, fps=30, auto_quit=True, outfile="./output.mkv",
             raise ap.ExceptionGroup(group.message, unignorable_excs)
     finally:
         main_task.cancel()
-        process.stdin.close()
-        process.wait()
+        if net is not None:
+            net.close()
+        try:
+            finish_recording()
+        finally:
+            frame_writer.close()
+            process.stdin.close()
+            process.wait()
+
+
+def _do_nothing():
+    pass
+
+
+def _vfr_options() -> tuple[str, ...]:
+    '''
+    The options that let ffmpeg output a variable frame rate. ``-fps_mode`` was added in ffmpeg 5.1 and replaced
+    ``-vsync``, which the older ones only understand.
+    '''
+    import subprocess
+    help_text = subprocess.run(('ffmpeg', '-hide_banner', '-h', 'full', ), capture_output=True, text=True).stdout
+    return ('-fps_mode', 'vfr', ) if '-fps_mode' in help_text else ('-vsync', 'vfr', )
+
+
+def _create_net(use_net) -> tuple[Net | None, dict]:
+    if not use_net:
+        return None, {}
+    net = Net()
+    return net, {'net': net}
+
+
+def _create_asyncio_bridge(sdlevent, asyncio_mode) -> tuple[AsyncioBridge | None, dict]:
+    if asyncio_mode is None:
+        return None, {}
+    bridge = AsyncioBridge(sdlevent, mode=asyncio_mode)
+    return bridge, {'asyncio_bridge': bridge}
+
+
+def _without_live_events(events, get_init=pygame.display.get_init, clear=pygame.event.clear):
+    '''
+    Discards the events that occurred during a replay, including the ones posted by the app itself, as they are
+    already in the recording.
+    '''
+    if get_init():
+        clear()
+    return events
+
+
+def _with_live_events(events, get_init=pygame.display.get_init, get=pygame.event.get):
+    return [*events, *get()] if get_init() else events
+
+
+@contextmanager
+def _dummy_video_driver():
+    # Only the display initialized inside the with-block is affected, as SDL reads the variable at initialization.
+    prev_value = os.environ.get("SDL_VIDEODRIVER")
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+    try:
+        yield
+    finally:
+        if prev_value is None:
+            del os.environ["SDL_VIDEODRIVER"]
+        else:
+            os.environ["SDL_VIDEODRIVER"] = prev_value
+
+
+def _get_coalesced_events(pygame_event_get=pygame.event.get, coalesce_motion_events=coalesce_motion_events):
+    return coalesce_motion_events(pygame_event_get())
+
+
+def _native_pixel_format(surface: pygame.Surface) -> str | None:
+    '''
+    The ffmpeg's pixel format that matches the memory layout of the surface, or None if there isn't one.
+    The alpha channel is ignored as the one of a screen is meaningless.
+    '''
+    bytesize = surface.get_bytesize()
+    if bytesize not in (3, 4) or surface.get_pitch() != surface.width * bytesize:
+        return None
+    channels = ['0'] * bytesize
+    for name, mask in zip('rgb', surface.get_masks()):
+        shift = mask.bit_length() - 8
+        if shift < 0 or shift % 8 or mask != 0xFF << shift:
+            return None
+        idx = shift // 8
+        channels[bytesize - 1 - idx if sys.byteorder == 'big' else idx] = name
+    pixel_format = ''.join(channels)
+    if bytesize == 3:
+        return pixel_format + '24' if pixel_format in ('rgb', 'bgr', ) else None
+    return pixel_format if pixel_format in ('rgb0', 'bgr0', '0rgb', '0bgr', ) else None
+
+
+def _copy_frame_as_is(get_view, buffer: bytearray):
+    buffer[:] = get_view('0')
+
+
+def _is_unchanged_as_is(is_unchanged, get_view) -> bool:
+    return is_unchanged(get_view('0'))
+
+
+def _create_change_detector(screen: pygame.Surface, copy_frame):
+    '''
+    For the screens that are converted before being written, which cannot be compared with the buffers.
+    Keeps a copy of the screen to compare with instead, which gets updated when a frame is copied into a buffer,
+    so that a frame dropped by :meth:`asyncpygame.FrameWriter.acquire` doesn't become the one to compare with.
+
+    Returns the function that tells whether the screen is unchanged, and ``copy_frame`` wrapped to do the above.
+    '''
+    prev_frame = bytearray()
+
+    def is_unchanged(get_buffer=screen.get_buffer) -> bool:
+        return prev_frame == get_buffer()
+
+    def copy_frame_and_remember(buffer, get_buffer=screen.get_buffer):
+        prev_frame[:] = get_buffer()
+        copy_frame(buffer)
+    return is_unchanged, copy_frame_and_remember
+
+
+def _record_frame(acquire, copy_frame, submit):
+    if (buffer := acquire()) is not None:
+        copy_frame(buffer)
+        submit(buffer)
+
+
+class _DeduplicatingRecorder:
+    '''
+    Hands the frames to ffmpeg in Matroska, skipping the ones identical to the previous one before copying them.
+    The rest carry the timestamps of the frames they were taken at.
+    '''
+    __slots__ = ('_writer', '_copy_frame', '_is_unchanged', '_frame_size', '_header', '_block_headers',
+                 '_ms_per_frame', '_n_frames', '_last_index', )
+
+    def __init__(self, writer: FrameWriter, copy_frame, is_unchanged, frame_size, stream_header: bytes, fps):
+        self._writer = writer
+        self._copy_frame = copy_frame
+        self._is_unchanged = is_unchanged
+        self._frame_size = frame_size
+        self._header = stream_header
+        self._block_headers = _matroska.BlockHeaders()
+        self._ms_per_frame = 1000 / fps
+        self._n_frames = 0
+        self._last_index = None
+
+    def __call__(self):
+        self._n_frames = (index := self._n_frames) + 1
+        if self._is_unchanged() or (buffer := self._writer.acquire()) is None:
+            return
+        self._copy_frame(buffer)
+        self._submit(buffer, index)
+
+    def _submit(self, buffer, index):
+        header = self._header + self._block_headers(round(index * self._ms_per_frame), self._frame_size)
+        self._header = b''
+        self._writer.submit(buffer, header)
+        self._last_index = index
+
+    def finish(self):
+        '''
+        Hands the last frame again if it was skipped, so that the video lasts as long as the recording did.
+        '''
+        last_index = self._last_index
+        if last_index is None or last_index == (index := self._n_frames - 1):
+            return
+        writer = self._writer
+        last_buffer = writer.last_submitted
+        if (buffer := writer.acquire()) is None:
+            return
+        if buffer is not last_buffer:
+            memoryview(buffer).cast('B')[:] = memoryview(last_buffer).cast('B')
+        self._submit(buffer, index)
+
+
+def _create_rgb24_frame_copier(screen: pygame.Surface):
+    from numpy import copyto as numpy_copyto
+    from pygame.surfarray import pixels3d
+    output_axis_order = (1, 0, 2)  # 高さ 幅 画素 の順
+
+    def copy_frame(buffer, screen_lock=screen.lock, screen_unlock=screen.unlock):
+        screen_lock()
+        frame = pixels3d(screen).transpose(output_axis_order)
+        numpy_copyto(buffer, frame)
+        del frame
+        screen_unlock()
+    return copy_frame
 
 
 def _create_output_buffer_for_surface(surface: pygame.Surface):
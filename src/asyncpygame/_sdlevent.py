@@ -1,12 +1,15 @@
 import types
-from collections.abc import Awaitable, Callable, Container
-from dataclasses import dataclass
+from collections import defaultdict, deque
+from collections.abc import Awaitable, Callable, Iterable, Hashable
+from itertools import chain, count
 from heapq import merge as heapq_merge
 from functools import partial
 from contextlib import asynccontextmanager
 
-from pygame.event import Event
-from asyncgui import _current_task, _sleep_forever, current_task
+from pygame.constants import QUIT, FINGERDOWN, FINGERUP, FINGERMOTION
+from pygame.event import Event, set_allowed, set_blocked
+from pygame.display import get_surface
+from asyncgui import _current_task, _sleep_forever, current_task, run_as_daemon
 
 
 def _callback(filter, consume, task_step, event: Event):
@@ -24,64 +27,377 @@ def _do_nothing(event: Event):
     pass
 
 
-@dataclass(slots=True)
-class Subscriber:
+_MISSING = object()
+_REGION = object()  # used in place of an attribute name for the subscribers indexed by a region
+_GRID_CELL_SIZE = 128
+_MAX_GRID_CELLS = 64  # a rectangle that overlaps more cells than this goes into the bucket of the function regions
+_FINGER_EVENTS = frozenset((FINGERDOWN, FINGERUP, FINGERMOTION, ))  # have normalized 'x' and 'y' instead of 'pos'
+_MIN_PRUNE_THRESHOLD = 1024
+_next_seq = count().__next__
+
+
+def _match_attrs(attrs, filter, event: Event, getattr=getattr, _MISSING=_MISSING):
+    for name, value in attrs:
+        if getattr(event, name, _MISSING) != value:
+            return False
+    return filter(event)
+
+
+def _split_attrs(attrs: dict, filter, region):
     '''
-    :meta exclude:
+    Splits the attribute filters passed to :meth:`SDLEvent.wait` into the one used for indexing and the rest, which
+    gets merged into the ``filter``. If a ``region`` is specified, it's used for indexing instead.
+    '''
+    if not attrs:
+        return None, filter
+    if region is None:
+        attr, *rest = attrs.items()
+    else:
+        attr, rest = None, attrs.items()
+    if rest:
+        filter = partial(_match_attrs, tuple(rest), filter)
+    return attr, filter
+
+
+def _grid_cells(rect, cell_size=_GRID_CELL_SIZE, max_cells=_MAX_GRID_CELLS) -> tuple:
+    '''
+    Returns the cells of the grid that the ``rect`` overlaps. If there are more than ``max_cells`` of them, returns
+    ``(None, )`` instead, which is the key of the bucket checked against every event that has a position.
     '''
+    if rect.width <= 0 or rect.height <= 0:
+        return ()
+    x_range = range(int(rect.left // cell_size), int((rect.right - 1) // cell_size) + 1)
+    y_range = range(int(rect.top // cell_size), int((rect.bottom - 1) // cell_size) + 1)
+    if len(x_range) * len(y_range) > max_cells:
+        return (None, )
+    return tuple((x, y) for x in x_range for y in y_range)
 
-    _priority: int
 
-    callback: Callable
+def _position_of(event: Event, event_type, getattr=getattr, get_surface=get_surface):
     '''
-    The callback function registered using the :meth:`SDLEvent.subscribe` call that returned this instance.
-    You can replace it with another one by simply assigning to this attribute.
+    Returns the position of the ``event`` in pixels, or None if it doesn't have one. The normalized position of a
+    finger event is scaled to the size of the display surface, which is what the ``pos`` of a mouse event is relative
+    to.
+    '''
+    if event_type not in _FINGER_EVENTS:
+        return getattr(event, 'pos', None)
+    if (surface := get_surface()) is None:
+        return None
+    w, h = surface.get_size()
+    return (event.x * w, event.y * h)
 
-    .. code-block::
 
-        sub = sdl_event.subscribe(...)
-        sub.callback = another_function
+def _bucket_keys(event_type, attrs, event: Event, pos, getattr=getattr, _MISSING=_MISSING, _REGION=_REGION,
+                 cell_size=_GRID_CELL_SIZE) -> list:
     '''
-
-    topics: Container = None
+    Returns the keys of the buckets that contain the subscribers possibly interested in the ``event``, whose position
+    is ``pos``.
     '''
-    The types of :class:`pygame.event.Event` that the subscriber is interested in.
-    You can change it by simply assigning to this attribute.
+    keys = [event_type]
+    for name in attrs:
+        if name is not _REGION:
+            keys.append((event_type, name, getattr(event, name, _MISSING)))
+        elif pos is not None:
+            keys.append((event_type, _REGION, (pos[0] // cell_size, pos[1] // cell_size)))
+            keys.append((event_type, _REGION, None))
+    return keys
 
-    .. code-block::
 
-        sub = sdl_event.subscribe(...)
-        sub.topics = (FINGERMOTION, FINGERUP, )
+class Subscriber:
+    '''
+    :meta exclude:
     '''
+    __slots__ = (
+        '_priority', '_seq', 'callback', '_topics', '_cancelled', '_sdlevent', '_indexed_topics', '_index', '_region',
+        '_rect', 'label', '_counted',
+    )
+
+    def __init__(self, sdlevent, priority, callback, topics, index=None, region=None, label=None):
+        self._sdlevent = sdlevent
+        self._priority = priority
+        self._seq = _next_seq()  # breaks ties between the subscribers with the same priority
+        self.label = label
+        '''
+        The name of the subscriber shown in :meth:`asyncpygame.Instrumentation.snapshot`.
+        '''
+        self.callback: Callable = callback
+        '''
+        The callback function registered using the :meth:`SDLEvent.subscribe` call that returned this instance.
+        You can replace it with another one by simply assigning to this attribute.
+
+        .. code-block::
+
+            sub = sdl_event.subscribe(...)
+            sub.callback = another_function
+        '''
+        self._topics = topics
+        self._cancelled = False
+        self._indexed_topics = None
+        self._index = index  # (attribute name, values) or None
+        if hasattr(region, 'collidepoint'):
+            self._rect = region  # a copy of the Rect passed to SDLEvent.subscribe()
+            self._region = region.collidepoint
+        else:
+            self._rect = None
+            self._region = region  # a function that tells whether a position is inside the region, or None
+        self._counted = False  # whether the subscriber is counted in SDLEvent._live_counts
+
+    @property
+    def topics(self) -> Iterable:
+        '''
+        The types of :class:`pygame.event.Event` that the subscriber is interested in.
+        You can change it by simply assigning to this attribute.
+
+        .. code-block::
+
+            sub = sdl_event.subscribe(...)
+            sub.topics = (FINGERMOTION, FINGERUP, )
+        '''
+        return self._topics
+
+    @topics.setter
+    def topics(self, topics):
+        if self._cancelled:
+            self._topics = topics
+            return
+        # The subscriber stays in the lists of the event types it is no longer interested in, and gets filtered out by
+        # the ``event_type in sub._topics`` check in SDLEvent.dispatch(). So it only needs to join the lists it is
+        # not in yet.
+        indexed = self._indexed_topics
+        if indexed is None:
+            indexed = self._indexed_topics = set(self._topics)
+        sdlevent = self._sdlevent
+        if self._counted:
+            sdlevent._uncount(self)
+            self._topics = topics
+            sdlevent._count(self)
+        else:
+            self._topics = topics
+        enqueue = sdlevent._enqueue
+        for t in topics:
+            if t not in indexed:
+                indexed.add(t)
+                enqueue(self, t)
+
+    @property
+    def priority(self):
+        '''
+        You can change it by simply assigning to this attribute. The buckets the subscriber is in get re-sorted at the
+        beginning of the next :meth:`SDLEvent.dispatch_many` call.
+        '''
+        return self._priority
+
+    @priority.setter
+    def priority(self, priority):
+        if priority == self._priority:
+            return
+        self._priority = priority
+        self._sdlevent._unsorted_keys.update(self._keys_of_buckets())
+
+    @property
+    def region(self):
+        '''
+        The region passed to :meth:`SDLEvent.subscribe`, or None. A rectangle is returned as a copy, so modifying the
+        one returned has no effect. You can change the region by simply assigning to this attribute, which is how a
+        subscriber follows a rectangle that moves.
+
+        .. code-block::
 
-    _cancelled: bool = False
+            sub = sdl_event.subscribe(..., region=button_rect)
+            button_rect.move_ip(100, 0)
+            sub.region = button_rect
+
+        A rectangle can only be replaced with a rectangle, and a function with a function. The subscriber gets indexed
+        by the cells of the grid that the new rectangle covers, and stays in the ones that the old one covered until
+        it's cancelled, so assigning the same area again costs nothing.
+        '''
+        rect = self._rect
+        return self._region if rect is None else rect.copy()
+
+    @region.setter
+    def region(self, region):
+        rect = self._rect
+        if rect is None:
+            if self._region is None or hasattr(region, 'collidepoint'):
+                raise ValueError("A function region can only be replaced with another function.")
+            self._region = region
+            return
+        if not hasattr(region, 'collidepoint'):
+            raise ValueError("A rectangle region can only be replaced with another rectangle.")
+        if region == rect:
+            return
+        self._rect = rect = region.copy()
+        self._region = rect.collidepoint
+        name, cells = self._index
+        known_cells = set(cells)
+        if None in known_cells:  # The subscriber is already checked against every event that has a position.
+            return
+        if (new_cells := tuple(c for c in _grid_cells(rect) if c not in known_cells)):
+            self._index = (name, cells + new_cells)
+            if not self._cancelled:
+                self._sdlevent._enqueue_values(self, new_cells)
+
+    def _keys_of_buckets(self) -> Iterable[Hashable]:
+        topics = self._topics if self._indexed_topics is None else self._indexed_topics
+        if (index := self._index) is None:
+            return topics
+        name, values = index
+        return [(t, name, v) for t in topics for v in values]
 
     def cancel(self):
+        if self._cancelled:
+            return
         self._cancelled = True
+        if self._counted:
+            self._sdlevent._uncount(self)
+        if self._index is not None:
+            self._sdlevent._forget_indexed(self)
+
+    # The subscribers are ordered by priority in descending order, then by the order of subscription. The latter is
+    # what the stable sort kept before the subscribers were split into buckets.
 
     def __eq__(self, other):
-        return self._priority == other._priority
+        return self._priority == other._priority and self._seq == other._seq
 
     def __ne__(self, other):
-        return self._priority != other._priority
+        return self._priority != other._priority or self._seq != other._seq
 
     def __lt__(self, other):
-        return self._priority > other._priority
+        p1 = self._priority
+        p2 = other._priority
+        return p1 > p2 or (p1 == p2 and self._seq < other._seq)
 
     def __le__(self, other):
-        return self._priority >= other._priority
+        p1 = self._priority
+        p2 = other._priority
+        return p1 > p2 or (p1 == p2 and self._seq <= other._seq)
 
     def __gt__(self, other):
-        return self._priority < other._priority
+        p1 = self._priority
+        p2 = other._priority
+        return p1 < p2 or (p1 == p2 and self._seq > other._seq)
 
     def __ge__(self, other):
-        return self._priority <= other._priority
+        p1 = self._priority
+        p2 = other._priority
+        return p1 < p2 or (p1 == p2 and self._seq >= other._seq)
 
     def __enter__(self):
         return self
 
     def __exit__(self, *__):
-        self._cancelled = True
+        self.cancel()
+
+
+class _StreamAnext:
+    '''
+    The awaitable that :meth:`EventStream.__anext__` returns. Unlike a coroutine, the same instance is reused for every
+    event so that iterating over a stream doesn't allocate anything.
+    '''
+    __slots__ = ('task', 'waiting', 'stopped', )
+
+    def __init__(self):
+        self.task = None  # the task iterating over the stream, which is determined on the first iteration
+        self.waiting = False
+        self.stopped = False
+
+    def __await__(self):
+        return self
+
+    def __next__(self, _current_task=_current_task, _sleep_forever=_sleep_forever):
+        if self.stopped:
+            raise StopAsyncIteration
+        if self.task is None:
+            return _current_task
+        self.waiting = True
+        return _sleep_forever
+
+    def send(self, value, _sleep_forever=_sleep_forever):
+        args = value[0]
+        if not self.waiting:  # resumed by _current_task
+            self.task = args[0]
+            self.waiting = True
+            return _sleep_forever
+        self.waiting = False
+        if not args:  # woken up by the 'until' awaitable
+            raise StopAsyncIteration
+        raise StopIteration(args[0])
+
+    def throw(self, exc, value=None, traceback=None):
+        self.waiting = False
+        raise exc if value is None else value
+
+    def close(self):
+        self.waiting = False
+
+
+def _stream_callback(filter, consume, anext: _StreamAnext, event: Event):
+    if anext.waiting and filter(event):
+        anext.task._step(event)
+        return consume
+
+
+async def _stop_stream_when(aw, sub: Subscriber, anext: _StreamAnext):
+    await aw
+    sub.cancel()
+    anext.stopped = True
+    if anext.waiting:
+        anext.task._step()
+
+
+class EventStream:
+    '''
+    :meta exclude:
+
+    The async iterator returned by :meth:`SDLEvent.stream`.
+    '''
+    __slots__ = ('_sub', '_anext', '_until', '_daemon', )
+
+    def __init__(self, sub: Subscriber, anext: _StreamAnext, until: Awaitable | None):
+        self._sub = sub
+        self._anext = anext
+        self._until = until
+        self._daemon = None  # the context manager that runs the 'until' awaitable
+
+    async def __aenter__(self):
+        if (until := self._until) is not None:
+            self._until = None
+            self._daemon = daemon = run_as_daemon(_stop_stream_when(until, self._sub, self._anext))
+            await daemon.__aenter__()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self._close()
+        if (daemon := self._daemon) is not None:
+            self._daemon = None
+            return await daemon.__aexit__(*exc_info)
+
+    def _close(self):
+        self._sub.cancel()
+        self._anext.stopped = True
+
+    async def aclose(self):
+        '''
+        Stops receiving events. This is done automatically when the ``async with`` block ends, so you don't need to
+        call this if the stream is used that way.
+        '''
+        self._close()
+
+    @property
+    def subscriber(self) -> Subscriber:
+        '''
+        The subscriber that feeds the stream. Its ``priority``, ``topics`` and ``region`` can be changed while the
+        stream is in use, e.g. to follow a rectangle that moves.
+        '''
+        return self._sub
+
+    def __aiter__(self):
+        if self._until is not None:
+            raise RuntimeError("A stream with 'until' must be entered with 'async with' before being iterated over.")
+        return self
+
+    def __anext__(self):
+        return self._anext
 
 
 class SDLEvent:
@@ -95,6 +411,9 @@ class SDLEvent:
         e = await sdlevent.wait(MOUSEBUTTONDOWN, MOUSEBUTTONUP)
 
         # Waits for the left mouse button to be pressed.
+        e = await sdlevent.wait(MOUSEBUTTONDOWN, attrs={'button': 1})
+
+        # Same as above, but less efficient.
         e = await sdlevent.wait(MOUSEBUTTONDOWN, filter=lambda e: e.button == 1)
 
     .. note::
@@ -102,69 +421,388 @@ class SDLEvent:
         ``priority`` 引数は ``PriorityExecutor`` の物とは逆に働きます。すなわち大きい値で ``wait()`` しているタスクほと早く再開します。
     '''
 
+    _subscriber_cls = Subscriber
+
     def __init__(self):
-        self._subs: list[Subscriber] = []
-        self._subs_2: list[Subscriber] = []  # double buffering
-        self._subs_to_be_added: list[Subscriber] = []
-        self._subs_to_be_added_2: list[Subscriber] = []  # double buffering
+        # Subscribers are stored in buckets, each of which is sorted by priority. The key of a bucket is either an
+        # event type, or a tuple of an event type, an attribute name and its value.
+        self._subs: dict[Hashable, list[Subscriber]] = {}
+        self._subs_to_be_added: defaultdict[Hashable, list[Subscriber]] = defaultdict(list)
+        self._spare_list: list[Subscriber] = []  # double buffering
+        self._indexed_attrs: dict[int, tuple[str]] = {}  # event type -> names of the attributes used as keys
+        self._n_indexed: dict[int, int] = {}  # event type -> number of live indexed subscribers
+        self._unsorted_keys: set[Hashable] = set()  # keys of the buckets that need re-sorting
+
+        # The buckets of a type of event that doesn't occur never get rid of their cancelled subscribers by themselves,
+        # so all the buckets get pruned after a certain number of subscriptions.
+        self._n_subscribed = 0  # since the last pruning
+        self._prune_threshold = _MIN_PRUNE_THRESHOLD
+        self._keys_to_be_pruned: set[Hashable] = set()  # keys of the buckets that cancelled indexed subscribers are in
+
+        # for enable_sdl_filtering()
+        self._live_counts: dict[int, int] = None  # event type -> number of live subscribers, or None if disabled
+        self._sdl_allowed: set[int] = set()  # event types currently allowed in SDL's queue
+        self._always_allowed: frozenset[int] = frozenset()
+        self._needs_blocking = False
+
+        self._posted: deque[Event] = deque()  # for post_threadsafe()
 
     def dispatch(self, event: Event):
         '''
         イベントの発生を待っているタスクにイベントを通知する。
         :func:`asyncpygame.run` のみがこれを呼ぶべきでありアプリ側からは呼ぶべきではない。
         '''
-        subs = self._subs
-        subs_tba = self._subs_to_be_added
-        if subs_tba:
-            subs_tba.sort()
-            sub_iter = heapq_merge(subs, subs_tba)
-            subs_tba2 = self._subs_to_be_added_2
-            subs_tba2.clear()
-            self._subs_to_be_added = subs_tba2
-            self._subs_to_be_added_2 = subs_tba
-            del subs_tba2
-        else:
-            sub_iter = iter(subs)
-        del subs_tba
+        self.dispatch_many((event, ))
 
-        subs2 = self._subs_2
-        subs2_append = subs2.append
-        event_type = event.type
+    def dispatch_many(self, events: Iterable[Event]):
+        '''
+        :meth:`dispatch` を複数のイベントに対して順に行う。
+        :func:`asyncpygame.run` はこれを用いて一フレーム分のイベントを一度に通知する。
+        '''
+        if self._needs_blocking:
+            self._block_unused_types()
+        if self._n_subscribed > self._prune_threshold:
+            self._prune_all_buckets()
+        elif self._keys_to_be_pruned:
+            self._prune_buckets(self._keys_to_be_pruned)
+        if self._unsorted_keys:
+            self._sort_buckets()
+        if self._posted:
+            events = chain(self._take_posted_events(), events)
+        subs_per_type = self._subs
+        subs_get = subs_per_type.get
+        subs_tba_pop = self._subs_to_be_added.pop
+        indexed_attrs_get = self._indexed_attrs.get
+        spare = self._spare_list
         try:
-            for sub in sub_iter:
-                if sub._cancelled:
+            for event in events:
+                event_type = event.type
+                if (attrs := indexed_attrs_get(event_type)) is not None:
+                    self._dispatch_to_buckets(event, event_type, attrs)
                     continue
-                subs2_append(sub)
-                if event_type in sub.topics and sub.callback(event):
-                    subs2.extend(sub_iter)
-                    return
+                subs = subs_get(event_type)
+                subs_tba = subs_tba_pop(event_type, None)
+                if subs_tba is None:
+                    if not subs:
+                        continue
+                    sub_iter = iter(subs)
+                else:
+                    subs_tba.sort()
+                    sub_iter = heapq_merge(subs, subs_tba) if subs else iter(subs_tba)
+                del subs_tba
+
+                subs2 = spare
+                subs2_append = subs2.append
+                try:
+                    for sub in sub_iter:
+                        if sub._cancelled:
+                            continue
+                        subs2_append(sub)
+                        if event_type in sub._topics and sub.callback(event):
+                            subs2.extend(sub_iter)
+                            break
+                finally:
+                    subs_per_type[event_type] = subs2
+                    if subs is None:
+                        spare = []
+                    else:
+                        subs.clear()
+                        spare = subs
         finally:
-            subs.clear()
-            self._subs = subs2
-            self._subs_2 = subs
+            self._spare_list = spare
 
-    def subscribe(self, topics, callback, priority) -> Subscriber:
+    def post_threadsafe(self, event: Event):
+        '''
+        Dispatches an event in the next :meth:`dispatch_many` call, ahead of the events passed to it.
+        Unlike the other methods, this one can be called from any thread.
+
+        .. code-block::
+
+            MY_EVENT = pygame.event.custom_type()
+
+            def worker():
+                ...
+                sdlevent.post_threadsafe(Event(MY_EVENT, value=...))
+
+            Thread(target=worker).start()
+            e = await sdlevent.wait(MY_EVENT, priority=0)
+
+        Unlike :func:`pygame.event.post`, the event doesn't go through SDL, so it's neither affected by
+        :meth:`enable_sdl_filtering` nor recorded by :func:`asyncpygame.run`.
+        '''
+        self._posted.append(event)
+
+    def _sort_buckets(self):
+        # The buckets waiting in self._subs_to_be_added don't need this, as they get sorted when being merged.
+        subs_get = self._subs.get
+        for key in self._unsorted_keys:
+            if (subs := subs_get(key)) is not None:
+                subs.sort()
+        self._unsorted_keys.clear()
+
+    def _prune_buckets(self, keys: Iterable[Hashable]):
+        for buckets in (self._subs, self._subs_to_be_added):
+            for key in keys:
+                if (subs := buckets.get(key)) is None:
+                    continue
+                if (subs := [sub for sub in subs if not sub._cancelled]):
+                    buckets[key] = subs
+                else:
+                    del buckets[key]
+        self._keys_to_be_pruned.clear()
+
+    def _prune_all_buckets(self):
+        # The next pruning happens after as many subscriptions as there are subscribers left, so that the cost of
+        # pruning is amortized over the subscriptions.
+        self._prune_buckets(set(chain(self._subs, self._subs_to_be_added)))
+        n_left = sum(map(len, chain(self._subs.values(), self._subs_to_be_added.values())))
+        self._n_subscribed = 0
+        self._prune_threshold = max(n_left, _MIN_PRUNE_THRESHOLD)
+
+    def _take_posted_events(self) -> list[Event]:
+        # Only the events that had been posted before this call are taken so that a worker thread that keeps
+        # posting cannot stall the main thread.
+        popleft = self._posted.popleft
+        return [popleft() for __ in range(len(self._posted))]
+
+    def _dispatch_to_buckets(self, event: Event, event_type, attrs):
+        '''
+        The slow path of :meth:`dispatch_many`, which is taken when some of the subscribers are indexed by an
+        attribute or a region.
+        '''
+        subs_per_type = self._subs
+        subs_get = subs_per_type.get
+        subs_tba_pop = self._subs_to_be_added.pop
+        pos = _position_of(event, event_type) if _REGION in attrs else None
+        keys = []  # the keys of the buckets that exist
+        bucket_list = []
+        for key in _bucket_keys(event_type, attrs, event, pos):
+            try:
+                subs = subs_get(key)
+            except TypeError:  # The attribute value is unhashable, so no subscriber is indexed by it.
+                continue
+            if (subs_tba := subs_tba_pop(key, None)) is not None:
+                # The bucket gets copied anyway, so the cancelled subscribers are removed at the same time.
+                subs_tba.sort()
+                subs = subs_per_type[key] = [
+                    sub for sub in (heapq_merge(subs, subs_tba) if subs else subs_tba) if not sub._cancelled]
+            if subs:
+                keys.append(key)
+                bucket_list.append(subs)
+        if not bucket_list:
+            return
+        # The buckets are iterated as they are. The cancelled subscribers in them get removed at the beginning of the
+        # next dispatch_many() call.
+        if self._call_subscribers(
+                event, event_type, pos, bucket_list[0] if len(bucket_list) == 1 else heapq_merge(*bucket_list)):
+            self._keys_to_be_pruned.update(keys)
+
+    @staticmethod
+    def _call_subscribers(event: Event, event_type, pos, subs: Iterable[Subscriber]) -> bool:
+        '''Returns whether any cancelled subscriber has been skipped.'''
+        found_cancelled = False
+        prev = None
+        for sub in subs:
+            # A subscriber whose rectangle grew too large can be in both a cell of the grid and the bucket of the
+            # function regions, in which case it comes out of the merge twice in a row.
+            if sub is prev:
+                continue
+            prev = sub
+            if sub._cancelled:
+                found_cancelled = True
+                continue
+            if event_type not in sub._topics:
+                continue
+            if (region := sub._region) is not None and not region(pos):
+                continue
+            if sub.callback(event):
+                break
+        return found_cancelled
+
+    def enable_sdl_filtering(self, *, always_allowed: Iterable[int]=(QUIT, )):
+        '''
+        Keeps :func:`pygame.event.set_allowed` and :func:`pygame.event.set_blocked` in sync with the subscriptions, so
+        that the types of events no one is waiting for get dropped inside SDL before reaching Python.
+        This must be called after :func:`pygame.init`.
+
+        .. code-block::
+
+            pygame.init()
+            sdlevent.enable_sdl_filtering()
+
+        A type of event gets allowed as soon as someone subscribes to it, and gets blocked at the next
+        :meth:`dispatch_many` call after its last subscriber is cancelled, so repeatedly calling :meth:`wait` doesn't
+        toggle the setting.
+
+        .. warning::
+
+            :func:`pygame.event.post` cannot post a blocked type of event. Put the types of the events the app posts
+            without subscribing to them in ``always_allowed``.
+
+        :param always_allowed: The types of events that are never blocked.
+        '''
+        self._live_counts = counts = {}
+        for sub in self._live_subscribers():
+            for t in sub._topics:
+                counts[t] = counts.get(t, 0) + 1
+            sub._counted = True
+        self._always_allowed = always_allowed = frozenset(always_allowed)
+        self._sdl_allowed = allowed = {t for t, n in counts.items() if n}.union(always_allowed)
+        self._needs_blocking = False
+        set_blocked(None)
+        set_allowed(list(allowed))
+
+    def disable_sdl_filtering(self):
+        '''Stops the effect of :meth:`enable_sdl_filtering`, and allows all types of events.'''
+        self._live_counts = None
+        self._sdl_allowed = set()
+        self._needs_blocking = False
+        for sub in self._live_subscribers():
+            sub._counted = False
+        set_allowed(None)
+
+    def _live_subscribers(self) -> Iterable[Subscriber]:
+        # A subscriber can be in multiple buckets.
+        return {
+            id(sub): sub
+            for sub in chain.from_iterable(chain(self._subs.values(), self._subs_to_be_added.values()))
+            if not sub._cancelled
+        }.values()
+
+    def _count(self, sub: Subscriber):
+        counts = self._live_counts
+        allowed = self._sdl_allowed
+        sub._counted = True
+        for t in sub._topics:
+            counts[t] = counts.get(t, 0) + 1
+            if t not in allowed:
+                allowed.add(t)
+                set_allowed(t)
+
+    def _uncount(self, sub: Subscriber):
+        sub._counted = False
+        counts = self._live_counts
+        for t in sub._topics:
+            n = counts[t] = counts[t] - 1
+            if not n:
+                self._needs_blocking = True
+
+    def _block_unused_types(self):
+        self._needs_blocking = False
+        counts_get = self._live_counts.get
+        always_allowed = self._always_allowed
+        unused = [t for t in self._sdl_allowed if not counts_get(t) and t not in always_allowed]
+        if unused:
+            self._sdl_allowed.difference_update(unused)
+            set_blocked(unused)
+
+    def _enqueue(self, sub: Subscriber, event_type):
+        subs_tba = self._subs_to_be_added
+        if (index := sub._index) is None:
+            subs_tba[event_type].append(sub)
+            return
+        self._n_indexed[event_type] = self._n_indexed.get(event_type, 0) + 1
+        name, values = index
+        attrs = self._indexed_attrs.get(event_type, ())
+        if name not in attrs:
+            self._indexed_attrs[event_type] = (*attrs, name)
+        for value in values:
+            subs_tba[(event_type, name, value)].append(sub)
+
+    def _enqueue_values(self, sub: Subscriber, values: Iterable[Hashable]):
+        '''Adds an indexed subscriber to the buckets of the attribute values it has newly become interested in.'''
+        subs_tba = self._subs_to_be_added
+        name = sub._index[0]
+        for t in (sub._topics if sub._indexed_topics is None else sub._indexed_topics):
+            for value in values:
+                subs_tba[(t, name, value)].append(sub)
+
+    def _forget_indexed(self, sub: Subscriber):
+        # Unlike the bucket of an event type, the one of an attribute value may never be dispatched again, so it has to
+        # be pruned explicitly.
+        self._keys_to_be_pruned.update(sub._keys_of_buckets())
+        # A type of event goes back to the fast path of dispatch_many() when its last indexed subscriber is cancelled.
+        n_indexed = self._n_indexed
+        for t in (sub._topics if sub._indexed_topics is None else sub._indexed_topics):
+            if (n := n_indexed[t] - 1):
+                n_indexed[t] = n
+            else:
+                del n_indexed[t]
+                del self._indexed_attrs[t]
+
+    def subscribe(self, topics, callback, priority, *, attr: tuple[str, Hashable]=None, region=None,
+                  label=None) -> Subscriber:
         '''
         async型APIの礎となっているコールバック型API。直接触るべきではない。
+
+        :param attr: A pair of an attribute name and a value. If specified, the subscriber receives only the events
+                     whose attribute has the value. This is more efficient than checking it in the ``callback``
+                     because the subscribers are indexed by the pair.
+        :param region: A :class:`pygame.Rect` or a function that takes a position and returns whether it's inside the
+                       region. If specified, the subscriber receives only the events whose ``pos`` is inside the
+                       region. A rectangle is copied and indexed by the area it occupies at the time of this call, so
+                       moving or resizing it afterwards has no effect until it's assigned to the ``region`` attribute
+                       of the returned subscriber. A function, or a rectangle too large to be indexed, is checked
+                       against every event that has a position. The normalized position of a finger event is scaled to
+                       the size of the display surface. The events that don't have a position never reach the
+                       subscriber.
+        :param label: See :class:`asyncpygame.Instrumentation`.
         '''
-        sub = Subscriber(priority, callback, topics)
-        self._subs_to_be_added.append(sub)
+        if region is None:
+            index = None if attr is None else (attr[0], (attr[1], ))
+        elif attr is not None:
+            raise ValueError("'attr' and 'region' cannot be specified at the same time.")
+        else:
+            if hasattr(region, 'collidepoint'):
+                region = region.copy()
+                index = (_REGION, _grid_cells(region))
+            else:
+                index = (_REGION, (None, ))
+        sub = self._subscriber_cls(self, priority, callback, topics, index, region, label)
+        self._n_subscribed += 1
+        if self._live_counts is not None:
+            self._count(sub)
+        if index is None:
+            subs_tba = self._subs_to_be_added
+            for t in topics:
+                subs_tba[t].append(sub)
+        else:
+            enqueue = self._enqueue
+            for t in topics:
+                enqueue(sub, t)
         return sub
 
     @types.coroutine
-    def wait(self, *event_types, filter=_accept_any, priority, consume=False) -> Awaitable[Event]:
+    def wait(self, *event_types, filter=_accept_any, priority, consume=False, attrs: dict[str, Hashable]=None,
+             region=None, label=None) -> Awaitable[Event]:
         '''
         Waits for any of the specified types of events to occur.
+
+        :param attrs: The values that the attributes of the event must have, keyed by the attribute names.
+                      ``wait(KEYDOWN, attrs={'key': K_ESCAPE})`` is equivalent to
+                      ``wait(KEYDOWN, filter=lambda e: e.key == K_ESCAPE)`` but more efficient.
+                      The values must be hashable.
+        :param region: Same as the one of :meth:`subscribe`.
+        :param label: Same as the one of :meth:`subscribe`.
+
+        .. code-block::
+
+            # Waits for the left mouse button to be pressed inside the button.
+            e = await sdlevent.wait(MOUSEBUTTONDOWN, attrs={'button': 1}, region=button_rect)
         '''
         task = (yield _current_task)[0][0]
-        sub = self.subscribe(event_types, partial(_callback, filter, consume, task._step), priority)
+        attr, filter = _split_attrs(attrs, filter, region)
+        sub = self.subscribe(
+            event_types, partial(_callback, filter, consume, task._step), priority, attr=attr, region=region,
+            label=label)
         try:
             return (yield _sleep_forever)[0][0]
         finally:
             sub.cancel()
 
     @asynccontextmanager
-    async def wait_freq(self, *event_types, filter=_accept_any, priority, consume=False):
+    async def wait_freq(self, *event_types, filter=_accept_any, priority, consume=False,
+                        attrs: dict[str, Hashable]=None, region=None, label=None):
         '''
         ``MOUSEMOTION`` や ``FINGERMOTION`` などの頻りに起こりうるイベントを効率良く捌けるかもしれない機能。
         以下のようなコードは
@@ -205,9 +843,13 @@ class SDLEvent:
             async with sdlevent.wait_freq(FINGERMOTION) as finger_motion:
                 another_func(finger_motion)  # NOT ALLOWED
                 another_func(finger_motion())   # NOT ALLOWED
+
+        ``attrs``, ``region``, ``label`` は :meth:`wait` のそれらと同じです。
         '''
+        attr, filter = _split_attrs(attrs, filter, region)
         callback = partial(_callback, filter, consume, (await current_task())._step)
-        sub = self.subscribe(event_types, _do_nothing, priority)
+        sub = self.subscribe(event_types, callback, priority, attr=attr, region=region, label=label)
+        sub.callback = _do_nothing
         try:
             yield partial(self._wait_freq, callback, sub)
         finally:
@@ -221,3 +863,33 @@ class SDLEvent:
         finally:
             sub.callback = _do_nothing
     _wait_freq = partial(_wait_freq, _sleep_forever, _do_nothing)
+
+    def stream(self, *event_types, filter=_accept_any, priority, consume=False, until: Awaitable=None,
+               attrs: dict[str, Hashable]=None, region=None, label=None) -> EventStream:
+        '''
+        :meth:`wait` を繰り返し呼ぶのと同じ事をより効率良く行う非同期イテレータを返す。
+        :meth:`wait_freq` と同じく購読はループ全体を通して一つだけですが、こちらは一回のイベント毎に ``partial`` を作らず、
+        コールバックの付け替えも行いません。
+
+        .. code-block::
+
+            async with sdlevent.stream(FINGERMOTION, priority=0, until=sdlevent.wait(FINGERUP, priority=0)) as stream:
+                async for e in stream:
+                    ...
+
+        購読は ``async with`` ブロックを抜けた時に解除されます。
+        ``async with`` を使わない場合はループを抜けた後に返されたイテレータの ``aclose()`` を呼んでください。
+
+        :param until: 完了した時にループを終わらせる awaitable 。 ``async with`` ブロックに入った時にそのタスクの子として開始され、
+                      ブロックを抜ける時に中断されます。これを渡す場合は ``async with`` が必須です。
+
+        注意点としてループの本体で他の物を ``await`` している間に起きたイベントは受け取れません。
+
+        ``filter``, ``consume``, ``attrs``, ``region``, ``label`` は :meth:`wait` のそれらと同じです。
+        '''
+        attr, filter = _split_attrs(attrs, filter, region)
+        anext = _StreamAnext()
+        sub = self.subscribe(
+            event_types, partial(_stream_callback, filter, consume, anext), priority, attr=attr, region=region,
+            label=label)
+        return EventStream(sub, anext, until)
@@ -0,0 +1,215 @@
+__all__ = ('ThreadSafeFuture', 'run_in_thread', 'FUTURE_DONE', 'WorkerPool', 'run_in_executor', )
+
+import os
+from collections.abc import Awaitable, Callable
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from functools import partial
+from threading import Thread, Lock
+
+from pygame.event import Event, custom_type
+from asyncgui import _current_task, _sleep_forever
+
+from ._sdlevent import SDLEvent
+
+
+FUTURE_DONE = custom_type()
+'''
+The type of the events that :class:`ThreadSafeFuture` posts through :meth:`asyncpygame.SDLEvent.post_threadsafe`.
+'''
+
+_PENDING = object()
+
+
+class ThreadSafeFuture:
+    '''
+    A future that can be completed from any thread. The task awaiting it resumes in the next frame, without polling.
+
+    .. code-block::
+
+        future = ThreadSafeFuture(sdlevent)
+        Thread(target=lambda: future.set_result(requests.get(url))).start()
+        response = await future
+
+    A future can be awaited any number of times, even after it's done, but by only one task at a time.
+    '''
+    __slots__ = ('_sdlevent', '_sub', '_result', '_exception', '_task', )
+
+    def __init__(self, sdlevent: SDLEvent):
+        self._sdlevent = sdlevent
+        self._result = _PENDING
+        self._exception = None
+        self._task = None
+        self._sub = sdlevent.subscribe((FUTURE_DONE, ), self._on_done, priority=0, attr=('future', self))
+
+    @property
+    def done(self) -> bool:
+        '''Whether the result or the exception has reached the main thread.'''
+        return self._result is not _PENDING
+
+    def set_result(self, value):
+        '''Thread-safe.'''
+        self._sdlevent.post_threadsafe(Event(FUTURE_DONE, future=self, result=value, exception=None))
+
+    def set_exception(self, exc: BaseException):
+        '''Thread-safe.'''
+        self._sdlevent.post_threadsafe(Event(FUTURE_DONE, future=self, result=None, exception=exc))
+
+    def cancel(self):
+        '''
+        Stops waiting for the result. The ones set after this are ignored. Not thread-safe.
+        '''
+        self._sub.cancel()
+
+    def _on_done(self, e: Event):
+        self._sub.cancel()
+        self._result = e.result
+        self._exception = e.exception
+        if (task := self._task) is not None:
+            task._step()
+        return True
+
+    def __await__(self):
+        if self._result is _PENDING:
+            self._task = (yield _current_task)[0][0]
+            try:
+                yield _sleep_forever
+            finally:
+                self._task = None
+        if (exc := self._exception) is not None:
+            raise exc
+        return self._result
+
+
+def _run_and_set_result(future: ThreadSafeFuture, func: Callable):
+    try:
+        result = func()
+    except Exception as e:
+        future.set_exception(e)
+    else:
+        future.set_result(result)
+
+
+async def run_in_thread(sdlevent: SDLEvent, func: Callable, *, daemon=None) -> Awaitable:
+    '''
+    Creates a new thread, runs a function within it, then waits for the completion of that function.
+    Unlike :meth:`asyncpygame.Clock.run_in_thread`, this doesn't poll, and the caller resumes in the frame right after
+    the function has returned.
+
+    .. code-block::
+
+        return_value = await run_in_thread(sdlevent, func)
+    '''
+    future = ThreadSafeFuture(sdlevent)
+    Thread(target=_run_and_set_result, args=(future, func, ), daemon=daemon,
+           name="asyncpygame.run_in_thread").start()
+    try:
+        return await future
+    finally:
+        future.cancel()
+
+
+class WorkerPool:
+    '''
+    A bounded pool of worker threads or processes, shared by :func:`run_in_executor` calls.
+
+    .. code-block::
+
+        with WorkerPool(sdlevent, max_workers=4) as pool:
+            return_value = await run_in_executor(func, arg1, arg2, pool=pool)
+
+        # processes instead of threads
+        with WorkerPool(sdlevent, executor_cls=ProcessPoolExecutor) as pool:
+            ...
+
+    The pool doesn't know when a worker picks up a function, so :attr:`queue_depth` and :attr:`utilization` are
+    derived from the number of functions submitted but not finished yet, assuming that every worker is busy as long as
+    there is more than one such function per worker.
+    '''
+    __slots__ = ('_sdlevent', '_executor', 'max_workers', '_lock', '_n_pending', '_n_completed', )
+
+    def __init__(self, sdlevent: SDLEvent, *, max_workers: int=None, executor_cls: type[Executor]=ThreadPoolExecutor):
+        '''
+        :param max_workers: Defaults to the number of CPUs.
+        :param executor_cls: :class:`concurrent.futures.ThreadPoolExecutor` or
+                             :class:`concurrent.futures.ProcessPoolExecutor`.
+        '''
+        if max_workers is None:
+            max_workers = os.cpu_count() or 1
+        self._sdlevent = sdlevent
+        self._executor = executor_cls(max_workers=max_workers)
+        self.max_workers = max_workers
+        self._lock = Lock()
+        self._n_pending = 0
+        self._n_completed = 0
+
+    @property
+    def n_pending(self) -> int:
+        '''The number of functions either running or waiting for a worker.'''
+        return self._n_pending
+
+    @property
+    def n_completed(self) -> int:
+        '''The number of functions that have finished, including the ones that raised an exception.'''
+        return self._n_completed
+
+    @property
+    def queue_depth(self) -> int:
+        '''The number of functions waiting for a worker.'''
+        return max(0, self._n_pending - self.max_workers)
+
+    @property
+    def utilization(self) -> float:
+        '''The ratio of busy workers, from 0.0 to 1.0.'''
+        return min(self._n_pending, self.max_workers) / self.max_workers
+
+    def _submit(self, future: ThreadSafeFuture, func, args) -> Future:
+        with self._lock:
+            self._n_pending += 1
+        cf = self._executor.submit(func, *args)
+        cf.add_done_callback(partial(self._on_done, future))
+        return cf
+
+    def _on_done(self, future: ThreadSafeFuture, cf: Future):
+        # This is called from a worker thread, or from the thread that cancelled the 'cf'.
+        with self._lock:
+            self._n_pending -= 1
+            if not cf.cancelled():
+                self._n_completed += 1
+        if cf.cancelled():
+            return
+        if (exc := cf.exception()) is None:
+            future.set_result(cf.result())
+        else:
+            future.set_exception(exc)
+
+    def close(self):
+        '''
+        Shuts down the pool without waiting for the running functions. The ones that haven't started are cancelled.
+        '''
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *__):
+        self.close()
+
+
+async def run_in_executor(func: Callable, *args, pool: WorkerPool) -> Awaitable:
+    '''
+    Runs a function within a :class:`WorkerPool`, and waits for its completion without polling.
+
+    .. code-block::
+
+        return_value = await run_in_executor(func, arg1, arg2, pool=pool)
+
+    If the caller gets cancelled, so does the function unless it has already started. A function that has started runs
+    to the end, and its result is discarded.
+    '''
+    future = ThreadSafeFuture(pool._sdlevent)
+    cf = pool._submit(future, func, args)
+    try:
+        return await future
+    finally:
+        future.cancel()
+        cf.cancel()
@@ -1,16 +1,22 @@
 __all__ = (
-    'CommonParams', 'capture_current_frame', 'block_input_events',
+    'CommonParams', 'capture_current_frame', 'block_input_events', 'coalesce_motion_events',
 )
 
 from typing import Awaitable, ContextManager, TypedDict
+from collections.abc import Iterable
 from asyncgui import ExclusiveEvent
 from asyncgui_ext.clock import Clock
+from pygame.event import Event
 from pygame.surface import Surface
+from pygame.constants import MOUSEMOTION, FINGERMOTION
 import pygame.time
 
 from .constants import INPUT_EVENTS
 from ._priority_executor import PriorityExecutor
 from ._sdlevent import SDLEvent, Subscriber
+from ._net import Net
+from ._asyncio_bridge import AsyncioBridge
+from ._frame_writer import FrameWriter
 
 
 class CommonParams(TypedDict, total=False):
@@ -29,6 +35,9 @@ class CommonParams(TypedDict, total=False):
     clock: Clock
     pygame_clock: pygame.time.Clock
     draw_target: Surface
+    net: Net
+    asyncio_bridge: AsyncioBridge
+    frame_writer: FrameWriter
     switcher: None
     userdata: None
 
@@ -61,3 +70,63 @@ def block_input_events(sdlevent: SDLEvent, priority) -> ContextManager[Subscribe
         called.
     '''
     return sdlevent.subscribe(INPUT_EVENTS, lambda e: True, priority)
+
+
+def coalesce_motion_events(events: Iterable[Event]) -> list[Event]:
+    '''
+    Merges the ``MOUSEMOTION`` events into one, and the ``FINGERMOTION`` events of the same finger into one, as long
+    as no other type of event occurs in between. The merged event has the last position and the sum of the relative
+    motions, and takes the place of the first event it merged.
+
+    The events other than motions stay in order, and so do the motions of each device relative to them. The motions of
+    different devices may change order, though. For instance, ``[mouse, finger, mouse]`` becomes ``[mouse, finger]``,
+    where the merged mouse motion is ahead of the finger motion it followed.
+
+    .. code-block::
+
+        events = coalesce_motion_events(pygame.event.get())
+
+    The original events are available through the ``coalesced_events`` attribute of the merged event.
+    Events that were not merged don't have the attribute.
+
+    .. code-block::
+
+        for e in getattr(merged_event, 'coalesced_events', (merged_event, )):
+            ...
+    '''
+    result = []
+    runs = {}  # key -> [index in result, 1st event, 2nd event, ...]
+    for e in events:
+        t = e.type
+        if t == MOUSEMOTION:
+            key = getattr(e, 'touch', False)
+        elif t == FINGERMOTION:
+            key = (e.touch_id, e.finger_id, )
+        else:
+            if runs:
+                _merge_runs(result, runs)
+            result.append(e)
+            continue
+        if (run := runs.get(key)) is None:
+            runs[key] = [len(result), e]
+            result.append(e)
+        else:
+            run.append(e)
+    if runs:
+        _merge_runs(result, runs)
+    return result
+
+
+def _merge_runs(result: list[Event], runs: dict, sum=sum):
+    for idx, *events in runs.values():
+        if len(events) == 1:
+            continue
+        last = events[-1]
+        if last.type == MOUSEMOTION:
+            merged = Event(MOUSEMOTION, last.dict, coalesced_events=events, rel=(
+                sum(e.rel[0] for e in events), sum(e.rel[1] for e in events), ))
+        else:
+            merged = Event(FINGERMOTION, last.dict, coalesced_events=events,
+                           dx=sum(e.dx for e in events), dy=sum(e.dy for e in events))
+        result[idx] = merged
+    runs.clear()
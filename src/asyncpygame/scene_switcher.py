@@ -72,17 +72,32 @@ class SceneSwitcher:
         '''
         self._next_scene_request.fire(next_scene, transition)
 
-    async def run(self, first_scene, *, userdata: Any=None, priority, sdlevent, **kwargs):
+    async def run(self, first_scene, *, userdata: Any=None, priority, sdlevent, executor=None, scene_priority=None,
+                  **kwargs):
         '''
         :param userdata: Use this to share data between scenes without relying on global variables.
+        :param scene_priority: If specified, each scene runs with its own child executor (See
+                               :meth:`asyncpygame.PriorityExecutor.create_child`), which is registered to the
+                               ``executor`` with this priority, so that a scene can be torn down at once.
+                               Everything a scene registers is then drawn at this single priority, so a dialog
+                               opened by a scene can no longer be drawn over a transition, for instance.
+                               ``priority - 1`` puts the scenes right below the transitions.
+                               If not specified, the scenes share the ``executor``, and what they register keeps
+                               its own priority.
         '''
         common_params = {
             'switcher': self,
             'sdlevent': sdlevent,
             'userdata': userdata,
             **kwargs}
+        if executor is not None:
+            common_params['executor'] = executor
+        if executor is None or scene_priority is None:
+            start_scene = _start_scene_without_child_executor
+        else:
+            start_scene = partial(_start_scene, executor, scene_priority)
         async with ag.open_nursery() as nursery:
-            task = nursery.start(first_scene(**common_params))
+            task = start_scene(nursery, first_scene, common_params)
             while True:
                 next_scene, transition = (await self._next_scene_request.wait())[0]
                 agen = transition(priority=priority, **common_params)
@@ -91,7 +106,7 @@ class SceneSwitcher:
                         await agen.asend(None)
                         task.cancel()
                         await agen.asend(None)
-                        task = nursery.start(next_scene(**common_params))
+                        task = start_scene(nursery, next_scene, common_params)
                         try:
                             await agen.asend(None)
                         except StopAsyncIteration:
@@ -102,6 +117,19 @@ class SceneSwitcher:
                     await agen.aclose()
 
 
+async def _run_scene_in_child_executor(executor, priority, scene, common_params):
+    with executor.create_child(priority, label='SceneSwitcher.scene') as child:
+        await scene(**{**common_params, 'executor': child})
+
+
+def _start_scene(executor, priority, nursery, scene, common_params) -> ag.Task:
+    return nursery.start(_run_scene_in_child_executor(executor, priority, scene, common_params))
+
+
+def _start_scene_without_child_executor(nursery, scene, common_params) -> ag.Task:
+    return nursery.start(scene(**common_params))
+
+
 class FadeTransition:
     '''
     .. code-block::
@@ -0,0 +1,220 @@
+'''
+Child processes whose pipes are polled by the frame loop, so that driving a program such as ffmpeg neither stalls the
+frame loop nor needs a thread.
+
+.. code-block::
+
+    import asyncpygame as apg
+
+    async def main(*, net, **kwargs):
+        completed = await apg.subprocess.run(net, ("ffmpeg", "-i", "pipe:0", "-f", "wav", "pipe:1"), input=source)
+        converted = completed.stdout
+
+    apg.run(main, use_net=True)
+
+Only POSIX is supported, as the pipes cannot be polled on Windows.
+'''
+
+__all__ = ('PIPE', 'DEVNULL', 'STDOUT', 'Process', 'StreamWriter', 'StreamReader', 'run', )
+
+import os
+import subprocess
+from subprocess import PIPE, DEVNULL, STDOUT, CompletedProcess
+from collections.abc import Sequence
+
+from asyncgui import wait_all
+
+from ._net import Net
+
+
+class StreamWriter:
+    '''The stdin of a :class:`Process`.'''
+    __slots__ = ('_net', '_file', '_fd', )
+
+    def __init__(self, net: Net, file):
+        self._net = net
+        self._file = file
+        self._fd = fd = file.fileno()
+        os.set_blocking(fd, False)
+
+    async def write(self, data):
+        '''
+        Writes the whole ``data``. Raises :exc:`BrokenPipeError` if the process has closed its stdin.
+        '''
+        fd = self._fd
+        data = memoryview(data).cast('B')
+        while data:
+            try:
+                n = os.write(fd, data)
+            except (BlockingIOError, InterruptedError):
+                await self._net.wait_writable(fd)
+            else:
+                data = data[n:]
+
+    def close(self):
+        '''Closes the pipe, which the process sees as the end of its input.'''
+        self._file.close()
+
+    @property
+    def closed(self) -> bool:
+        return self._file.closed
+
+
+class StreamReader:
+    '''The stdout or the stderr of a :class:`Process`.'''
+    __slots__ = ('_net', '_file', '_fd', )
+
+    def __init__(self, net: Net, file):
+        self._net = net
+        self._file = file
+        self._fd = fd = file.fileno()
+        os.set_blocking(fd, False)
+
+    async def read(self, n=-1) -> bytes:
+        '''
+        Reads up to ``n`` bytes, or until the end of the stream if ``n`` is negative.
+        Returns an empty bytes at the end of the stream.
+        '''
+        if n < 0:
+            chunks = []
+            while (chunk := await self.read(65536)):
+                chunks.append(chunk)
+            return b''.join(chunks)
+        fd = self._fd
+        while True:
+            try:
+                return os.read(fd, n)
+            except (BlockingIOError, InterruptedError):
+                await self._net.wait_readable(fd)
+
+    def close(self):
+        self._file.close()
+
+
+def _open_pidfd(pid):
+    try:
+        return os.pidfd_open(pid)
+    except (AttributeError, OSError):
+        return None
+
+
+class Process:
+    '''
+    A :class:`subprocess.Popen` whose pipes can be awaited.
+
+    .. code-block::
+
+        with Process(net, ("ffmpeg", ...), stdin=PIPE, stdout=PIPE) as p:
+            async def feed():
+                for chunk in chunks:
+                    await p.stdin.write(chunk)
+                p.stdin.close()
+
+            async with asyncgui.open_nursery() as nursery:
+                nursery.start(feed())
+                while (data := await p.stdout.read(65536)):
+                    ...
+            await p.wait()
+
+    Leaving the with-block kills the process if it's still running.
+
+    :param popen_kwargs: Passed to :class:`subprocess.Popen` as is, except ``bufsize``.
+    '''
+    __slots__ = ('_net', '_popen', '_pidfd', 'stdin', 'stdout', 'stderr', )
+
+    def __init__(self, net: Net, args: str | Sequence[str], **popen_kwargs):
+        self._net = net
+        self._popen = popen = subprocess.Popen(args, bufsize=0, **popen_kwargs)
+        self._pidfd = _open_pidfd(popen.pid)
+        self.stdin: StreamWriter | None = None if popen.stdin is None else StreamWriter(net, popen.stdin)
+        self.stdout: StreamReader | None = None if popen.stdout is None else StreamReader(net, popen.stdout)
+        self.stderr: StreamReader | None = None if popen.stderr is None else StreamReader(net, popen.stderr)
+
+    @property
+    def pid(self) -> int:
+        return self._popen.pid
+
+    @property
+    def returncode(self) -> int | None:
+        return self._popen.returncode
+
+    async def wait(self) -> int:
+        '''
+        Waits for the process to terminate, and returns its exit code.
+        On Linux, this doesn't poll. Elsewhere, the process is polled every frame.
+        '''
+        popen = self._popen
+        net = self._net
+        pidfd = self._pidfd
+        while popen.poll() is None:
+            await (net._wait_for_next_poll() if pidfd is None else net.wait_readable(pidfd))
+        return popen.returncode
+
+    def send_signal(self, sig):
+        self._popen.send_signal(sig)
+
+    def terminate(self):
+        self._popen.terminate()
+
+    def kill(self):
+        self._popen.kill()
+
+    def close(self):
+        '''Closes the pipes, and kills the process if it's still running.'''
+        for stream in (self.stdin, self.stdout, self.stderr):
+            if stream is not None:
+                stream.close()
+        popen = self._popen
+        if popen.poll() is None:
+            popen.kill()
+            popen.wait()
+        if (pidfd := self._pidfd) is not None:
+            self._pidfd = None
+            os.close(pidfd)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *__):
+        self.close()
+
+
+async def _feed(writer: StreamWriter, data):
+    try:
+        await writer.write(data)
+    except BrokenPipeError:
+        pass
+    writer.close()
+
+
+async def _read_all(reader: StreamReader | None):
+    return None if reader is None else await reader.read()
+
+
+async def run(net: Net, args: str | Sequence[str], *, input=None, stdout=PIPE, stderr=None, check=False,
+              **popen_kwargs) -> CompletedProcess:
+    '''
+    The async version of :func:`subprocess.run`. Feeds the ``input``, and collects the outputs, while the frame loop
+    keeps running. Any number of calls can run concurrently.
+
+    .. code-block::
+
+        completed = await run(net, ("ffmpeg", ...), input=source)
+        converted = completed.stdout
+
+    Unlike :func:`subprocess.run`, the stdout is captured by default.
+    If the caller gets cancelled, the process gets killed.
+
+    :param check: If True, :exc:`subprocess.CalledProcessError` is raised when the exit code is non-zero.
+    '''
+    if input is not None:
+        popen_kwargs['stdin'] = PIPE
+    with Process(net, args, stdout=stdout, stderr=stderr, **popen_kwargs) as p:
+        aws = [_read_all(p.stdout), _read_all(p.stderr), p.wait(), ]
+        if input is not None:
+            aws.append(_feed(p.stdin, input))
+        tasks = await wait_all(*aws)
+    completed = CompletedProcess(args, tasks[2].result, tasks[0].result, tasks[1].result)
+    if check:
+        completed.check_returncode()
+    return completed
@@ -0,0 +1,82 @@
+import pytest
+import asyncio
+
+
+@pytest.fixture(autouse=True)
+def dummy_video_driver(monkeypatch):
+    monkeypatch.setenv('SDL_VIDEODRIVER', 'dummy')
+
+
+@pytest.fixture(params=['step', 'thread'])
+def asyncio_mode(request):
+    return request.param
+
+
+def run(main, asyncio_mode):
+    import asyncpygame as ap
+    return ap.run_headless(main, dt=10, max_frames=10000, asyncio_mode=asyncio_mode)
+
+
+def test_from_asyncio(asyncio_mode):
+    async def main(*, asyncio_bridge, **kwargs):
+        return await asyncio_bridge.from_asyncio(asyncio.sleep(0, 'A'))
+
+    assert run(main, asyncio_mode).result == 'A'
+
+
+def test_from_asyncio_raises(asyncio_mode):
+    async def asyncio_func():
+        raise ZeroDivisionError
+
+    async def main(*, asyncio_bridge, **kwargs):
+        with pytest.raises(ZeroDivisionError):
+            await asyncio_bridge.from_asyncio(asyncio_func())
+        return 'A'
+
+    assert run(main, asyncio_mode).result == 'A'
+
+
+def test_cancel_from_asyncgui_side(asyncio_mode):
+    import asyncpygame as ap
+
+    async def asyncio_func():
+        try:
+            await asyncio.sleep(100)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    async def main(*, asyncio_bridge, clock, **kwargs):
+        await ap.wait_any(clock.sleep(100), asyncio_bridge.from_asyncio(asyncio_func()))
+        await clock.sleep(100)
+        return 'A'
+
+    cancelled = []
+    assert run(main, asyncio_mode).result == 'A'
+    assert cancelled == [True]
+
+
+def test_cancel_from_asyncio_side(asyncio_mode):
+    async def main(*, asyncio_bridge, clock, **kwargs):
+        async def asyncio_func():
+            asyncio.current_task().cancel()
+            await asyncio.sleep(0)
+
+        try:
+            await asyncio_bridge.from_asyncio(asyncio_func())
+        except asyncio.CancelledError:
+            await clock.sleep(100)
+            return 'A'
+
+    assert run(main, asyncio_mode).result == 'A'
+
+
+def test_to_asyncio(asyncio_mode):
+    async def main(*, asyncio_bridge, clock, **kwargs):
+        async def asyncio_func():
+            await asyncio_bridge.to_asyncio(clock.sleep(50))
+            return clock.current_time
+
+        return await asyncio_bridge.from_asyncio(asyncio_func())
+
+    assert run(main, asyncio_mode).result >= 50
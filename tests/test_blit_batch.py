@@ -0,0 +1,106 @@
+import pytest
+
+
+@pytest.fixture()
+def executor():
+    from asyncpygame import PriorityExecutor
+    return PriorityExecutor()
+
+
+@pytest.fixture()
+def target():
+    from pygame import Surface
+    return Surface((10, 10))
+
+
+def image(color):
+    from pygame import Surface
+    s = Surface((1, 1))
+    s.fill(color)
+    return s
+
+
+def pixels(target, *points):
+    return [tuple(target.get_at(p))[:3] for p in points]
+
+
+def test_draw(executor, target):
+    from pygame import Rect
+    from asyncpygame import BlitBatch
+    red = image((255, 0, 0))
+    batch = BlitBatch(executor, target, 0)
+    dest = Rect(1, 1, 1, 1)
+    batch.add(red, dest)
+    batch.add(red, (5, 5))
+    executor()
+    assert pixels(target, (1, 1), (5, 5)) == [(255, 0, 0), (255, 0, 0)]
+
+    target.fill((0, 0, 0))
+    dest.move_ip(1, 0)
+    executor()
+    assert pixels(target, (1, 1), (2, 1)) == [(0, 0, 0), (255, 0, 0)]
+
+    target.fill((0, 0, 0))
+    batch.close()
+    executor()
+    assert pixels(target, (2, 1), (5, 5)) == [(0, 0, 0), (0, 0, 0)]
+
+
+def test_remove(executor, target):
+    from asyncpygame import BlitBatch
+    images = [image((i, 0, 0)) for i in range(1, 5)]
+    batch = BlitBatch(executor, target, 0)
+    handles = [batch.add(img, (i, 0)) for i, img in enumerate(images)]
+    handles[1].cancel()
+    handles[1].cancel()
+    with handles[0]:
+        assert len(batch) == 3
+    assert len(batch) == 2
+    assert {h.source for h in handles[2:]} == set(images[2:])
+    assert [h.dest for h in handles[2:]] == [(2, 0), (3, 0)]
+    executor()
+    assert pixels(target, (0, 0), (1, 0), (2, 0), (3, 0)) == [(0, 0, 0), (0, 0, 0), (3, 0, 0), (4, 0, 0)]
+    handles[3].cancel()
+    handles[2].cancel()
+    assert len(batch) == 0
+    executor()
+
+
+def test_drawing_order_is_kept_after_removal(executor, target):
+    from asyncpygame import BlitBatch
+    from asyncpygame._blit_batch import _HOLE
+    batch = BlitBatch(executor, target, 0)
+    handles = [batch.add(image((i, 0, 0)), (0, 0)) for i in range(1, 11)]
+    for i in (0, 4, 5, 6):
+        handles[i].cancel()
+        executor()
+        assert pixels(target, (0, 0)) == [(10, 0, 0)]
+    assert len(batch) == 6
+    assert len(batch._pairs) == 7  # compacted once
+    assert [pair[0].get_at((0, 0))[0] for pair in batch._pairs if pair is not _HOLE] == [2, 3, 4, 8, 9, 10]
+    assert [h.source.get_at((0, 0))[0] for h in (handles[1], handles[9])] == [2, 10]
+
+
+def test_replace_source_and_dest(executor, target):
+    from asyncpygame import BlitBatch
+    batch = BlitBatch(executor, target, 0)
+    batch.add(image((0, 0, 255)), (0, 0))
+    h = batch.add(image((255, 0, 0)), (1, 1))
+    h.source = green = image((0, 255, 0))
+    h.dest = (2, 2)
+    assert h.source is green
+    executor()
+    assert pixels(target, (0, 0), (1, 1), (2, 2)) == [(0, 0, 255), (0, 0, 0), (0, 255, 0)]
+
+
+@pytest.mark.parametrize('attr', ['source', 'dest'])
+def test_access_after_cancel(executor, target, attr):
+    from asyncpygame import BlitBatch
+    batch = BlitBatch(executor, target, 0)
+    h = batch.add(image((255, 0, 0)), (0, 0))
+    h.cancel()
+    with pytest.raises(RuntimeError):
+        getattr(h, attr)
+    with pytest.raises(RuntimeError):
+        setattr(h, attr, (1, 1))
+    assert len(batch) == 0
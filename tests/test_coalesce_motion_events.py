@@ -0,0 +1,70 @@
+from pygame.event import Event
+from pygame.constants import MOUSEMOTION, FINGERMOTION, KEYDOWN, MOUSEBUTTONDOWN
+
+
+def mouse_motion(pos, rel):
+    return Event(MOUSEMOTION, pos=pos, rel=rel, buttons=(0, 0, 0), touch=False)
+
+
+def finger_motion(finger_id, x, dx):
+    return Event(FINGERMOTION, touch_id=0, finger_id=finger_id, x=x, y=0., dx=dx, dy=0., pressure=1.)
+
+
+def test_empty():
+    from asyncpygame import coalesce_motion_events
+    assert coalesce_motion_events([]) == []
+
+
+def test_non_motion_events_stay_as_they_are():
+    from asyncpygame import coalesce_motion_events
+    events = [Event(KEYDOWN), mouse_motion((0, 0), (1, 1)), Event(KEYDOWN), ]
+    assert coalesce_motion_events(events) == events
+
+
+def test_mouse_motion():
+    from asyncpygame import coalesce_motion_events
+    events = [mouse_motion((1, 1), (1, 1)), mouse_motion((3, 2), (2, 1)), mouse_motion((6, 3), (3, 1)), ]
+    result = coalesce_motion_events(events)
+    assert len(result) == 1
+    e = result[0]
+    assert e.type == MOUSEMOTION
+    assert e.pos == (6, 3)
+    assert e.rel == (6, 3)
+    assert list(e.coalesced_events) == events
+
+
+def test_sequence_gets_broken_by_another_type_of_event():
+    from asyncpygame import coalesce_motion_events
+    events = [
+        mouse_motion((1, 1), (1, 1)), mouse_motion((2, 2), (1, 1)),
+        Event(MOUSEBUTTONDOWN),
+        mouse_motion((3, 3), (1, 1)), mouse_motion((4, 4), (1, 1)),
+    ]
+    result = coalesce_motion_events(events)
+    assert [e.type for e in result] == [MOUSEMOTION, MOUSEBUTTONDOWN, MOUSEMOTION, ]
+    assert [e.pos for e in (result[0], result[2])] == [(2, 2), (4, 4), ]
+
+
+def test_fingers_are_merged_separately():
+    from asyncpygame import coalesce_motion_events
+    events = [
+        finger_motion(1, .1, .1), finger_motion(2, .5, .5),
+        finger_motion(1, .3, .2), finger_motion(2, .6, .1),
+    ]
+    result = coalesce_motion_events(events)
+    assert [(e.finger_id, e.x) for e in result] == [(1, .3), (2, .6), ]
+    assert result[0].dx == .1 + .2
+    assert result[1].dx == .5 + .1
+
+
+def test_motions_of_different_devices_may_change_order():
+    from asyncpygame import coalesce_motion_events
+    events = [
+        finger_motion(1, .1, .1), mouse_motion((1, 1), (1, 1)), finger_motion(1, .3, .2),
+        Event(KEYDOWN),
+        mouse_motion((2, 2), (1, 1)), finger_motion(1, .5, .2), mouse_motion((4, 4), (2, 2)),
+    ]
+    result = coalesce_motion_events(events)
+    assert [e.type for e in result] == [FINGERMOTION, MOUSEMOTION, KEYDOWN, MOUSEMOTION, FINGERMOTION, ]
+    assert [e.x for e in (result[0], result[4])] == [.3, .5, ]
+    assert [e.pos for e in (result[1], result[3])] == [(1, 1), (4, 4), ]
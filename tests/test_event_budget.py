@@ -0,0 +1,84 @@
+from pygame.event import Event as E
+
+
+def test_no_limit():
+    import asyncpygame as ap
+    se = ap.SDLEvent()
+    received = []
+    se.subscribe((1, ), received.append, priority=0)
+    budget = ap.EventBudget()
+    budget.dispatch(se, [E(1), E(1), E(1), ])
+    assert len(received) == 3
+    assert budget.n_exceeded == 0
+    assert budget.n_pending == 0
+
+
+def test_max_events():
+    import asyncpygame as ap
+    se = ap.SDLEvent()
+    received = []
+    se.subscribe((1, ), lambda e: received.append(e.value), priority=0)
+    budget = ap.EventBudget(max_events=2)
+    budget.dispatch(se, [E(1, value=v) for v in 'ABC'])
+    assert received == ['A', 'B', ]
+    assert budget.n_exceeded == 1
+    assert budget.n_pending == 1
+    budget.dispatch(se, [E(1, value=v) for v in 'DEFG'])
+    assert received == ['A', 'B', 'C', 'D', ]
+    assert budget.n_exceeded == 2
+    assert budget.n_pending == 3
+    budget.dispatch(se, [])
+    assert received == ['A', 'B', 'C', 'D', 'E', 'F', ]
+    budget.dispatch(se, [])
+    assert received == ['A', 'B', 'C', 'D', 'E', 'F', 'G', ]
+    assert budget.n_exceeded == 3
+    assert budget.n_pending == 0
+
+
+def test_max_time():
+    import asyncpygame as ap
+    now = 0.
+
+    def callback(e):
+        nonlocal now
+        received.append(e.value)
+        now += 0.01
+
+    se = ap.SDLEvent()
+    received = []
+    se.subscribe((1, ), callback, priority=0)
+    budget = ap.EventBudget(max_time=15, clock=lambda: now)
+    budget.dispatch(se, [E(1, value=v) for v in 'ABCD'])
+    assert received == ['A', 'B', ]
+    assert budget.n_exceeded == 1
+    budget.dispatch(se, [])
+    assert received == ['A', 'B', 'C', 'D', ]
+    assert budget.n_exceeded == 1
+
+
+def test_max_time_dispatches_at_least_one_event():
+    import time
+    import asyncpygame as ap
+    se = ap.SDLEvent()
+    received = []
+    se.subscribe((1, ), lambda e: received.append(e.value) or time.sleep(0.01), priority=0)
+    budget = ap.EventBudget(max_time=0)
+    budget.dispatch(se, [E(1, value=v) for v in 'AB'])
+    assert received == ['A', ]
+
+
+def test_run_headless(monkeypatch):
+    import asyncpygame as ap
+    monkeypatch.setenv('SDL_VIDEODRIVER', 'dummy')
+
+    async def main(*, clock, sdlevent, **kwargs):
+        values = []
+        for __ in range(4):
+            e = await sdlevent.wait(1, priority=0)
+            values.append((e.value, clock.current_time))
+        return values
+
+    budget = ap.EventBudget(max_events=3)
+    task = ap.run_headless(main, dt=10, event_source=[[E(1, value=v) for v in 'ABCD']], event_budget=budget)
+    assert task.result == [('A', 0), ('B', 0), ('C', 0), ('D', 10), ]
+    assert budget.n_exceeded == 1
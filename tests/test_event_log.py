@@ -0,0 +1,81 @@
+import pytest
+
+
+@pytest.fixture()
+def log_path(tmp_path, monkeypatch):
+    monkeypatch.setenv('SDL_VIDEODRIVER', 'dummy')
+    return tmp_path / 'events.log'
+
+
+def create_main(received: list, n_frames: int):
+    async def main(*, clock, sdlevent, **kwargs):
+        import pygame
+        from pygame.event import Event, post
+        import asyncpygame as ap
+        pygame.init()
+        pygame.display.set_mode((100, 100))
+
+        async def record_events():
+            while True:
+                e = await sdlevent.wait(pygame.USEREVENT, priority=0)
+                received.append((e.value, clock.current_time))
+
+        async with ap.run_as_daemon(record_events()):
+            for i in range(n_frames):
+                post(Event(pygame.USEREVENT, value=i, window=object()))
+                await clock.n_frames(1)
+            post(Event(pygame.QUIT))
+            await ap.sleep_forever()
+    return main
+
+
+def test_record_and_replay(log_path):
+    import asyncpygame as ap
+
+    recorded = []
+    ap.run(create_main(recorded, 5), fps=200, record_events_to=log_path)
+    assert [v for v, t in recorded] == list(range(5))
+
+    replayed = []
+    ap.replay(create_main(replayed, 0), log_path)
+    assert replayed == recorded
+
+
+def test_read_event_log(log_path):
+    import pygame
+    import asyncpygame as ap
+
+    ap.run(create_main([], 3), fps=200, record_events_to=log_path)
+    frames = list(ap.read_event_log(log_path))
+    assert frames[-1][1] is None
+    assert all(isinstance(dt, int) for events, dt in frames[:-1])
+    events = [e for events, dt in frames for e in events]
+    assert [e.value for e in events if e.type == pygame.USEREVENT] == [0, 1, 2, ]
+    assert events[-1].type == pygame.QUIT
+    assert all('window' not in e.dict for e in events)
+
+
+def test_read_something_else(tmp_path):
+    import gzip
+    import asyncpygame as ap
+
+    path = tmp_path / 'something_else'
+    with gzip.open(path, 'wb') as f:
+        f.write(b'something else')
+    with pytest.raises(ValueError):
+        list(ap.read_event_log(path))
+
+
+def test_read_a_log_that_contains_a_global(tmp_path):
+    import gzip
+    import pickle
+    from collections import Counter
+    import asyncpygame as ap
+    from asyncpygame._event_log import _MAGIC
+
+    path = tmp_path / 'malicious.log'
+    with gzip.open(path, 'wb') as f:
+        f.write(_MAGIC)
+        pickle.dump([(1, {'value': Counter()}), ], f)
+    with pytest.raises(pickle.UnpicklingError):
+        list(ap.read_event_log(path))
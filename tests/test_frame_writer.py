@@ -0,0 +1,115 @@
+import pytest
+import threading
+
+
+class SlowFile:
+    '''Writes at most 'n' bytes at a time, and only while 'can_write' is set.'''
+    def __init__(self, n=3):
+        self.n = n
+        self.can_write = threading.Event()
+        self.can_write.set()
+        self.data = bytearray()
+
+    def write(self, data):
+        self.can_write.wait()
+        data = data[:self.n]
+        self.data += data
+        return len(data)
+
+
+def frame(value):
+    return bytes([value]) * 8
+
+
+@pytest.mark.parametrize('on_lag', ['block', 'drop'])
+def test_all_frames_written_in_order(on_lag):
+    from asyncpygame import FrameWriter
+    f = SlowFile()
+    w = FrameWriter(on_lag=on_lag)
+    w.start(f, [bytearray(8) for __ in range(3)])
+    for i in range(10):
+        while (buffer := w.acquire()) is None:
+            pass
+        buffer[:] = frame(i)
+        w.submit(buffer)
+    w.close()
+    assert f.data == b''.join(frame(i) for i in range(10))
+    assert w.queue_depth == 0
+
+
+def test_header():
+    from asyncpygame import FrameWriter
+    f = SlowFile()
+    w = FrameWriter()
+    w.start(f, [bytearray(8) for __ in range(2)])
+    for i in range(3):
+        buffer = w.acquire()
+        buffer[:] = frame(i)
+        w.submit(buffer, header=b'#' * i)
+    w.close()
+    assert f.data == frame(0) + b'#' + frame(1) + b'##' + frame(2)
+
+
+def test_is_unchanged():
+    from asyncpygame import FrameWriter
+    f = SlowFile()
+    w = FrameWriter()
+    w.start(f, [bytearray(8)])
+    assert w.last_submitted is None
+    assert not w.is_unchanged(frame(0))
+    buffer = w.acquire()
+    buffer[:] = frame(0)
+    w.submit(buffer)
+    assert w.last_submitted is buffer
+    assert w.is_unchanged(frame(0))
+    assert not w.is_unchanged(frame(1))
+    w.close()
+    assert w.is_unchanged(frame(0))  # even after being written
+
+
+def test_drop():
+    from asyncpygame import FrameWriter
+    f = SlowFile()
+    f.can_write.clear()
+    w = FrameWriter(on_lag='drop')
+    w.start(f, [bytearray(8) for __ in range(2)])
+    assert w.max_queue_depth == 2
+    submitted = []
+    for i in range(5):
+        if (buffer := w.acquire()) is not None:
+            buffer[:] = frame(i)
+            w.submit(buffer)
+            submitted.append(i)
+    assert submitted == [0, 1]
+    assert w.queue_depth == 2
+    assert w.n_dropped == 3
+    f.can_write.set()
+    w.close()
+    assert f.data == frame(0) + frame(1)
+    assert w.queue_depth == 0
+
+
+def test_exception_in_the_thread():
+    from asyncpygame import FrameWriter
+
+    class BrokenFile:
+        def write(self, data):
+            raise BrokenPipeError()
+
+    w = FrameWriter()
+    w.start(BrokenFile(), [bytearray(8)])
+    with pytest.raises(BrokenPipeError):
+        while True:
+            w.submit(w.acquire())
+    w.close()
+
+
+def test_invalid_on_lag():
+    from asyncpygame import FrameWriter
+    with pytest.raises(ValueError):
+        FrameWriter(on_lag='skip')
+
+
+def test_close_before_start():
+    from asyncpygame import FrameWriter
+    FrameWriter().close()
@@ -0,0 +1,173 @@
+import pytest
+from pygame.event import Event as E
+
+
+def to_dict(snapshot):
+    return {stats.label: stats for stats in snapshot}
+
+
+def test_executor():
+    import asyncpygame as ap
+    executor = ap.PriorityExecutor()
+    values = []
+    executor.register(lambda: values.append('A'), priority=0)
+    with ap.instrument(executor) as instr:
+        executor.register(lambda: values.append('B'), priority=1, label='B')
+        req = executor.register(lambda: values.append('C'), priority=2, label='C')
+        executor()
+        executor()
+        req.callback = lambda: values.append('D')
+        executor()
+        assert values == ['A', 'B', 'C', ] * 2 + ['A', 'B', 'D', ]
+        snapshot = to_dict(instr.snapshot())
+        assert set(snapshot) == {'B', 'C', }
+        assert snapshot['B'].n_calls == 3
+        assert snapshot['C'].n_calls == 3
+        assert snapshot['B'].total_time >= snapshot['B'].max_time > 0.
+        instr.reset()
+        assert to_dict(instr.snapshot())['B'].n_calls == 0
+        assert snapshot['B'].n_calls == 3
+    assert type(executor) is ap.PriorityExecutor
+    executor.register(lambda: values.append('E'), priority=3, label='E')
+    executor()
+    assert 'E' not in to_dict(instr.snapshot())
+    assert to_dict(instr.snapshot())['B'].n_calls == 1
+
+
+def test_default_label():
+    import asyncpygame as ap
+    executor = ap.PriorityExecutor()
+
+    def func():
+        pass
+
+    instr = ap.instrument(executor)
+    executor.register(func, priority=0)
+    executor()
+    assert [(stats.label, stats.n_calls) for stats in instr.snapshot()] == [('test_default_label.<locals>.func', 1), ]
+
+
+def test_unlabeled_requests_are_measured_on_their_own():
+    from functools import partial
+    import asyncpygame as ap
+    executor = ap.PriorityExecutor()
+    instr = ap.instrument(executor)
+    values = []
+    executor.register(partial(values.append, 'A'), priority=0)
+    executor.register(partial(values.append, 'B'), priority=1)
+    executor.register(partial(values.append, 'C'), priority=2, label='C')
+    executor.register(partial(values.append, 'D'), priority=3, label='C')
+    executor()
+    executor.create_child(priority=4)
+    executor()
+    snapshot = instr.snapshot()
+    assert sorted((stats.label, stats.n_calls) for stats in snapshot) == [
+        ('C', 4), ('PriorityExecutor', 1), ('list.append', 2), ('list.append', 2),
+    ]
+    assert [stats.total_time for stats in snapshot] == sorted((stats.total_time for stats in snapshot), reverse=True)
+
+
+def test_measurements_of_cancelled_requests_are_added_up():
+    import asyncpygame as ap
+    executor = ap.PriorityExecutor()
+    sdlevent = ap.SDLEvent()
+    instr_executor = ap.instrument(executor)
+    instr_sdlevent = ap.instrument(sdlevent)
+    for i in range(100):
+        req = executor.register(lambda: None, priority=0)
+        sub = sdlevent.subscribe((1, ), lambda e: None, priority=0)
+        executor()
+        sdlevent.dispatch(E(1))
+        req.cancel()
+        sub.cancel()
+    executor.register(lambda: None, priority=0)
+    executor()
+    for instr in (instr_executor, instr_sdlevent):
+        assert len(instr._own_stats) <= 1
+        assert len(instr._retired_stats) == 1
+    assert sorted(stats.n_calls for stats in instr_executor.snapshot()) == [1, 100]
+    assert [stats.n_calls for stats in instr_sdlevent.snapshot()] == [100]
+
+
+def test_sdlevent():
+    import asyncpygame as ap
+    sdlevent = ap.SDLEvent()
+    instr = ap.instrument(sdlevent)
+    received = []
+    sdlevent.subscribe((1, ), received.append, priority=0, label='A')
+    task = ap.start(sdlevent.wait(1, priority=1))
+    sdlevent.subscribe((1, ), lambda e: True, priority=2, label='consumer', attr=('value', 'X'))
+    sdlevent.dispatch(E(1, value='Y'))
+    assert task.finished
+    assert len(received) == 1
+    sdlevent.dispatch(E(1, value='X'))
+    assert len(received) == 1
+    snapshot = to_dict(instr.snapshot())
+    assert snapshot['A'].n_calls == 1
+    assert snapshot['SDLEvent.wait'].n_calls == 1
+    assert snapshot['consumer'].n_calls == 1
+
+
+def test_instrument_twice():
+    import asyncpygame as ap
+    executor = ap.PriorityExecutor()
+    ap.instrument(executor)
+    with pytest.raises(TypeError):
+        ap.instrument(executor)
+
+
+def test_waits_are_measured_per_coroutine():
+    import asyncpygame as ap
+    sdlevent = ap.SDLEvent()
+    instr = ap.instrument(sdlevent)
+
+    async def wait_repeatedly():
+        while True:
+            await sdlevent.wait(1, priority=0)
+
+    async def wait_freq_repeatedly():
+        async with sdlevent.wait_freq(1, priority=0) as one:
+            while True:
+                await one()
+
+    async def wait_freq_after_another_wait():
+        async with sdlevent.wait_freq(1, priority=0) as one:
+            await sdlevent.wait(2, priority=0)
+            while True:
+                await one()
+
+    async def stream():
+        async with sdlevent.stream(1, priority=0) as events:
+            async for e in events:
+                pass
+
+    tasks = [ap.start(wait_repeatedly()), ap.start(wait_repeatedly()), ap.start(wait_freq_repeatedly()), ap.start(stream()),
+             ap.start(wait_freq_after_another_wait()), ]
+    sdlevent.dispatch(E(1))  # arrives while wait_freq_after_another_wait() isn't waiting for it
+    sdlevent.dispatch(E(2))
+    for __ in range(3):
+        sdlevent.dispatch(E(1))
+    snapshot = to_dict(instr.snapshot())
+    assert snapshot['test_waits_are_measured_per_coroutine.<locals>.wait_repeatedly'].n_calls == 8
+    assert snapshot['test_waits_are_measured_per_coroutine.<locals>.wait_freq_repeatedly'].n_calls == 4
+    assert snapshot['test_waits_are_measured_per_coroutine.<locals>.wait_freq_after_another_wait'].n_calls == 4
+    assert snapshot['_do_nothing'].n_calls == 1
+    assert snapshot['SDLEvent.stream'].n_calls == 4
+    for task in tasks:
+        task.cancel()
+
+
+def test_task_label():
+    import asyncpygame as ap
+    from asyncpygame._instrumentation import _task_label, _UNKNOWN_TASK_LABEL
+    labels = []
+
+    async def async_fn():
+        labels.append(_task_label(await ap.current_task()))
+        await ap.sleep_forever()
+
+    task = ap.start(async_fn())
+    labels.append(_task_label(task))
+    task.cancel()
+    labels.append(_task_label(task))
+    assert labels == [_UNKNOWN_TASK_LABEL, 'test_task_label.<locals>.async_fn', _UNKNOWN_TASK_LABEL, ]
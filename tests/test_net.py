@@ -0,0 +1,121 @@
+import pytest
+import socket
+
+
+@pytest.fixture()
+def net():
+    from asyncpygame import Net
+    net = Net()
+    yield net
+    net.close()
+
+
+@pytest.fixture()
+def listener():
+    with socket.create_server(('127.0.0.1', 0)) as sock:
+        sock.setblocking(False)
+        yield sock
+
+
+def poll_until_done(net, *tasks, max_polls=10000):
+    import asyncpygame as ap
+    for __ in range(max_polls):
+        if all(t.state is not ap.TaskState.STARTED for t in tasks):
+            return
+        net.poll()
+    raise AssertionError("Tasks did not complete.")
+
+
+def test_echo(net, listener):
+    import asyncpygame as ap
+
+    async def server():
+        conn, __ = await net.accept(listener)
+        with conn:
+            while (data := await net.recv(conn, 4)):
+                await net.send_all(conn, data)
+
+    async def client():
+        with socket.socket() as sock:
+            sock.setblocking(False)
+            await net.connect(sock, listener.getsockname())
+            await net.send_all(sock, b'x' * 100_000)
+            sock.shutdown(socket.SHUT_WR)
+            received = []
+            while (data := await net.recv(sock, 65536)):
+                received.append(data)
+            return b''.join(received)
+
+    server_task = ap.start(server())
+    client_task = ap.start(client())
+    poll_until_done(net, server_task, client_task)
+    assert client_task.result == b'x' * 100_000
+    assert server_task.finished
+    assert not net._selector.get_map()
+
+
+def test_cancel(net, listener):
+    import asyncpygame as ap
+
+    task = ap.start(net.accept(listener))
+    assert net._selector.get_map()
+    task.cancel()
+    assert not net._selector.get_map()
+
+
+def test_two_readers(net):
+    import asyncpygame as ap
+
+    a, b = socket.socketpair()
+    with a, b:
+        a.setblocking(False)
+        b.setblocking(False)
+        task1 = ap.start(net.recv(a, 1))
+        task2 = ap.start(net.recv(a, 1))
+        task3 = ap.start(net.recv(a, 1))
+        task3.cancel()
+        b.send(b'x')
+        for __ in range(100):
+            net.poll()
+        assert [task1.finished, task2.finished] in ([True, False], [False, True])
+        b.send(b'y')
+        poll_until_done(net, task1, task2)
+        assert sorted((task1.result, task2.result)) == [b'x', b'y']
+        assert not net._selector.get_map()
+
+
+def test_blocking_socket(net):
+    import asyncpygame as ap
+
+    with socket.socket() as sock:
+        with pytest.raises(ValueError):
+            ap.start(net.recv(sock, 1))
+
+
+def test_connection_refused(net, listener):
+    import asyncpygame as ap
+
+    address = listener.getsockname()
+    listener.close()
+    with socket.socket() as sock:
+        sock.setblocking(False)
+        task = ap.start(net.connect(sock, address))
+        with pytest.raises(ConnectionRefusedError):
+            poll_until_done(net, task)
+
+
+def test_run_headless_polls(monkeypatch, listener):
+    import asyncpygame as ap
+    monkeypatch.setenv('SDL_VIDEODRIVER', 'dummy')
+
+    async def main(*, net, **kwargs):
+        with socket.socket() as sock:
+            sock.setblocking(False)
+            await net.connect(sock, listener.getsockname())
+            conn, __ = await net.accept(listener)
+            with conn:
+                await net.send_all(conn, b'abc')
+                return await net.recv(sock, 3)
+
+    task = ap.run_headless(main, dt=0, max_frames=10000, use_net=True)
+    assert task.result == b'abc'
@@ -1,10 +1,11 @@
 import pytest
+from functools import partial
 
 
-@pytest.fixture()
-def executor():
-    from asyncpygame._priority_executor import PriorityExecutor
-    return PriorityExecutor()
+@pytest.fixture(params=['PriorityExecutor', 'ScalablePriorityExecutor'])
+def executor(request):
+    import asyncpygame._priority_executor as m
+    return getattr(m, request.param)()
 
 
 def test_basis(executor):
@@ -47,3 +48,191 @@ def test_different_priorities(executor):
     req.cancel()
     executor()
     assert values == ['B', 'A', 'B', 'C', 'A', 'B', 'C', ]
+
+
+def test_change_priority(executor):
+    values = []
+    req_a = executor.register(lambda: values.append('A'), priority=0)
+    executor.register(lambda: values.append('B'), priority=1)
+    req_c = executor.register(lambda: values.append('C'), priority=2)
+    executor()
+    assert values == ['A', 'B', 'C', ]
+    values.clear()
+    req_a.priority = 3
+    req_c.priority = -1
+    assert req_a.priority == 3
+    executor.register(lambda: values.append('D'), priority=2)
+    executor()
+    assert values == ['C', 'B', 'D', 'A', ]
+
+
+def test_change_priority_during_a_frame(executor):
+    values = []
+
+    def a():
+        values.append('A')
+        req_a.priority = 2
+
+    req_a = executor.register(a, priority=0)
+    executor.register(lambda: values.append('B'), priority=1)
+    executor()
+    assert values == ['A', 'B', ]
+    values.clear()
+    executor()
+    assert values == ['B', 'A', ]
+
+
+def test_child(executor):
+    values = []
+    executor.register(lambda: values.append('A'), priority=0)
+    executor.register(lambda: values.append('C'), priority=2)
+    child = executor.create_child(priority=1)
+    child.register(lambda: values.append('B2'), priority=-5)
+    child.register(lambda: values.append('B1'), priority=-10)
+    executor()
+    assert values == ['A', 'B1', 'B2', 'C', ]
+    values.clear()
+    child.pause()
+    executor()
+    assert values == ['A', 'C', ]
+    values.clear()
+    child.resume()
+    executor()
+    assert values == ['A', 'B1', 'B2', 'C', ]
+    values.clear()
+    with child:
+        pass
+    executor()
+    assert values == ['A', 'C', ]
+
+
+def test_root_cannot_be_paused(executor):
+    with pytest.raises(RuntimeError):
+        executor.pause()
+
+
+def test_both_implementations_call_in_the_same_order():
+    from random import Random
+    from asyncpygame import PriorityExecutor, ScalablePriorityExecutor
+    rng = Random(0)
+    executors = (PriorityExecutor(), ScalablePriorityExecutor())
+    calls = ([], [])
+    reqs = ([], [])
+    for frame in range(100):
+        # registers 0 to 20 requests, cancels some and changes priorities of some, in the same way for both
+        n_new = rng.choice((0, 1, 3, 20))
+        new_priorities = [rng.randrange(10) for __ in range(n_new)]
+        n_alive = len(reqs[0])
+        to_cancel = rng.sample(range(n_alive), min(n_alive, rng.choice((0, 1, 5))))
+        to_move = [(i, rng.randrange(10)) for i in rng.sample(range(n_alive), min(n_alive, rng.choice((0, 2))))]
+        for executor, call_list, req_list in zip(executors, calls, reqs):
+            for i, p in to_move:
+                req_list[i].priority = p
+            for i in to_cancel:
+                req_list[i].cancel()
+            for p in new_priorities:
+                req_list.append(executor.register(partial(call_list.append, (frame, len(req_list))), p))
+            executor()
+    assert calls[0] == calls[1]
+
+
+def test_compaction():
+    from asyncpygame import ScalablePriorityExecutor
+    executor = ScalablePriorityExecutor()
+    reqs = [executor.register(lambda: None, i) for i in range(100)]
+    executor()
+    for req in reqs[:25]:
+        req.cancel()
+    executor()
+    assert len(executor._reqs) == 100
+    reqs[25].cancel()
+    executor()
+    assert executor._reqs == reqs[26:]
+
+
+@pytest.fixture()
+def surface():
+    from pygame import Surface
+    return Surface((100, 100))
+
+
+def test_dirty_rects_merge():
+    from pygame import Rect
+    from asyncpygame._priority_executor import _merge_rects
+    rects = [Rect(0, 0, 10, 10), Rect(50, 50, 10, 10), Rect(5, 5, 10, 10), Rect(90, 90, 20, 20), Rect(10, 0, 0, 10)]
+    assert _merge_rects(rects, Rect(0, 0, 100, 100)) == [Rect(50, 50, 10, 10), Rect(0, 0, 15, 15), Rect(90, 90, 10, 10)]
+
+
+def test_dirty_rects(executor, surface):
+    from pygame import Rect
+    clips = []
+
+    def record(name):
+        return lambda: clips.append((name, surface.get_clip()))
+
+    executor.enable_dirty_rects(surface)
+    executor.register(record('bg'), 0, rect=surface.get_rect())
+    req = executor.register(record('A'), 1, rect=(10, 10, 10, 10))
+    executor.register(record('B'), 1, rect=(60, 60, 10, 10))
+    executor.register(record('logic'), 2)
+    executor()
+    assert clips == [('bg', Rect(0, 0, 100, 100)), ('A', Rect(0, 0, 100, 100)), ('B', Rect(0, 0, 100, 100)),
+                     ('logic', Rect(0, 0, 100, 100))]
+    clips.clear()
+    executor()
+    assert clips == [('logic', Rect(0, 0, 100, 100))]
+    assert executor.dirty_rects == []
+    clips.clear()
+    req.mark_dirty()
+    executor()
+    assert clips == [('bg', Rect(10, 10, 10, 10)), ('A', Rect(10, 10, 10, 10)), ('logic', Rect(0, 0, 100, 100))]
+    clips.clear()
+    req.rect = (80, 10, 10, 10)
+    executor()
+    assert clips == [('bg', Rect(10, 10, 10, 10)), ('bg', Rect(80, 10, 10, 10)), ('A', Rect(80, 10, 10, 10)),
+                     ('logic', Rect(0, 0, 100, 100))]
+    assert executor.dirty_rects == [Rect(10, 10, 10, 10), Rect(80, 10, 10, 10)]
+    clips.clear()
+    req.cancel()
+    executor()
+    assert clips == [('bg', Rect(80, 10, 10, 10)), ('logic', Rect(0, 0, 100, 100))]
+
+
+def test_modifying_the_returned_rect_does_nothing(executor, surface):
+    from pygame import Rect
+    clips = []
+    executor.enable_dirty_rects(surface)
+    req = executor.register(lambda: clips.append(surface.get_clip()), 1, rect=(10, 10, 10, 10))
+    executor()
+    clips.clear()
+    req.rect.move_ip(50, 50)
+    assert req.rect == Rect(10, 10, 10, 10)
+    executor()
+    assert clips == []
+    assert executor.dirty_rects == []
+    req.mark_dirty()
+    executor()
+    assert clips == [Rect(10, 10, 10, 10)]
+
+
+def test_assigning_the_same_priority_does_nothing(executor, surface):
+    executor.enable_dirty_rects(surface)
+    req = executor.register(lambda: None, 1, rect=(10, 10, 10, 10))
+    executor()
+    executor()
+    req.priority = 1
+    assert not executor._needs_sort
+    executor()
+    assert executor.dirty_rects == []
+
+
+def test_rect_is_ignored_without_dirty_rects(executor, surface):
+    values = []
+    req = executor.register(lambda: values.append('A'), 0, rect=(0, 0, 10, 10))
+    executor()
+    executor()
+    req.rect = (10, 10, 10, 10)
+    req.cancel()
+    executor()
+    assert values == ['A', 'A', ]
+    assert executor.dirty_rects == []
@@ -0,0 +1,85 @@
+import pytest
+import sys
+
+pytestmark = pytest.mark.skipif(sys.platform == 'win32', reason="POSIX only")
+
+
+@pytest.fixture()
+def se():
+    from asyncpygame._sdlevent import SDLEvent
+    return SDLEvent()
+
+
+@pytest.fixture()
+def pool(se):
+    from concurrent.futures import ProcessPoolExecutor
+    import asyncpygame as ap
+    with ap.WorkerPool(se, max_workers=1, executor_cls=ProcessPoolExecutor) as pool:
+        yield pool
+
+
+def shm_exists(name):
+    from multiprocessing.shared_memory import SharedMemory
+    try:
+        SharedMemory(name).close()
+    except FileNotFoundError:
+        return False
+    return True
+
+
+def create_pixels(w, h):
+    from asyncpygame import SharedBuffer
+    return SharedBuffer.from_bytes(bytes(range(w * h * 4))), (w, h)
+
+
+def run_until_done(se, task):
+    import asyncpygame as ap
+    while task.state is ap.TaskState.STARTED:
+        se.dispatch_many(())
+
+
+def test_shared_buffer_to_bytes():
+    from asyncpygame import SharedBuffer
+    buffer = SharedBuffer.from_bytes(b'abc')
+    assert shm_exists(buffer.name)
+    assert buffer.to_bytes() == b'abc'
+    assert not shm_exists(buffer.name)
+
+
+def test_shared_buffer_to_surface():
+    import gc
+    buffer, size = create_pixels(4, 2)
+    surface = buffer.to_surface(size, 'RGBA')
+    assert not shm_exists(buffer.name)
+    assert tuple(surface.get_at((1, 0))) == (4, 5, 6, 7)
+    del surface
+    gc.collect()
+
+
+def test_run_in_process(se, pool):
+    import asyncpygame as ap
+
+    task = ap.start(ap.run_in_process(create_pixels, 4, 2, pool=pool))
+    run_until_done(se, task)
+    buffer, size = task.result
+    assert tuple(buffer.to_surface(size).get_at((3, 1))) == (28, 29, 30, 31)
+
+
+def test_cancel_run_in_process_after_the_function_finished(se):
+    import time
+    import asyncpygame as ap
+
+    names = []
+
+    def func():
+        buffer, size = create_pixels(4, 2)
+        names.append(buffer.name)
+        return buffer, size
+
+    with ap.WorkerPool(se, max_workers=1) as pool:
+        task = ap.start(ap.run_in_process(func, pool=pool))
+        while pool.n_pending:
+            time.sleep(0.01)
+        assert shm_exists(names[0])
+        task.cancel()
+        assert not shm_exists(names[0])
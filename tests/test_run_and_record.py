@@ -0,0 +1,176 @@
+import pytest
+import shutil
+import sys
+from functools import partial
+
+
+@pytest.mark.parametrize('masks, depth, expected', [
+    ((0xFF0000, 0xFF00, 0xFF, 0), 32, 'bgr0'),
+    ((0xFF0000, 0xFF00, 0xFF, 0xFF000000), 32, 'bgr0'),
+    ((0xFF, 0xFF00, 0xFF0000, 0), 32, 'rgb0'),
+    ((0xFF000000, 0xFF0000, 0xFF00, 0), 32, '0bgr'),
+    ((0xFF0000, 0xFF00, 0xFF, 0), 24, 'bgr24'),
+    ((0xFF, 0xFF00, 0xFF0000, 0), 24, 'rgb24'),
+    ((0xF800, 0x7E0, 0x1F, 0), 16, None),
+])
+@pytest.mark.skipif(sys.byteorder != 'little', reason="The expectations assume little-endian.")
+def test_native_pixel_format(masks, depth, expected):
+    from pygame import Surface
+    from asyncpygame._runner import _native_pixel_format
+    assert _native_pixel_format(Surface((4, 2), 0, depth, masks)) == expected
+
+
+def test_padded_rows_are_not_native():
+    from pygame import Surface
+    from asyncpygame._runner import _native_pixel_format
+    s = Surface((3, 2), 0, 24, (0xFF0000, 0xFF00, 0xFF, 0))
+    if s.get_pitch() == 9:
+        pytest.skip("Rows are not padded on this platform.")
+    assert _native_pixel_format(s) is None
+
+
+def test_copy_frame_as_is():
+    from pygame import Surface
+    from asyncpygame._runner import _copy_frame_as_is
+    s = Surface((4, 2), 0, 32, (0xFF0000, 0xFF00, 0xFF, 0))
+    s.fill((1, 2, 3))
+    buffer = bytearray(s.get_pitch() * s.height)
+    _copy_frame_as_is(s.get_view, buffer)
+    assert buffer == bytes(s.get_view('0'))
+    if sys.byteorder == 'little':
+        assert buffer[:3] == bytes((3, 2, 1))  # bgr0
+
+
+class Recording:
+    '''Lets a :class:`asyncpygame._runner._DeduplicatingRecorder` record a surface to memory.'''
+    def __init__(self, surface, fps=10, n_buffers=2):
+        from asyncpygame import FrameWriter
+        from asyncpygame._runner import _DeduplicatingRecorder, _copy_frame_as_is, _is_unchanged_as_is
+        from asyncpygame._matroska import stream_header
+        self.data = bytearray()
+        self.header = stream_header(surface.width, surface.height, 'bgr0', fps)
+        self.writer = w = FrameWriter()
+        w.start(self, [bytearray(surface.get_pitch() * surface.height) for __ in range(n_buffers)])
+        self.record_frame = _DeduplicatingRecorder(
+            w, partial(_copy_frame_as_is, surface.get_view), partial(_is_unchanged_as_is, w.is_unchanged, surface.get_view),
+            surface.get_pitch() * surface.height, self.header, fps)
+
+    def write(self, data):
+        self.data += data
+        return len(data)
+
+    def close(self):
+        self.record_frame.finish()
+        self.writer.close()
+
+    def blocks(self) -> list[tuple[int, bytes]]:
+        '''(timestamp in milliseconds, frame)'''
+        assert self.data.startswith(self.header)
+        data = memoryview(self.data)[len(self.header):]
+        blocks = []
+        while data:
+            if data[:4] == b'\x1f\x43\xb6\x75':  # Cluster
+                assert data[12:13] == b'\xe7'  # Timestamp
+                size = int.from_bytes(data[13:21], 'big') & 0xFFFF_FFFF_FFFF
+                cluster_timestamp = int.from_bytes(data[21:21 + size], 'big')
+                data = data[21 + size:]
+            assert data[:1] == b'\xa3'  # SimpleBlock
+            size = int.from_bytes(data[1:9], 'big') & 0xFFFF_FFFF_FFFF
+            relative_timestamp = int.from_bytes(data[10:12], 'big', signed=True)
+            blocks.append((cluster_timestamp + relative_timestamp, bytes(data[13:9 + size]), ))
+            data = data[9 + size:]
+        return blocks
+
+
+def test_duplicate_frames_are_not_written():
+    from pygame import Surface
+    s = Surface((4, 2), 0, 32, (0xFF0000, 0xFF00, 0xFF, 0))
+    r = Recording(s)
+    colors = [1, 1, 2, 2, 2, 1, 3, 3]
+    for c in colors:
+        s.fill((c, c, c))
+        r.record_frame()
+    r.close()
+    frames = {c: (bytes((c, c, c, 0)) * 8) for c in colors}
+    assert r.blocks() == [(0, frames[1]), (200, frames[2]), (500, frames[1]), (600, frames[3]), (700, frames[3])]
+
+
+def test_the_last_frame_is_not_repeated_if_it_has_been_written():
+    from pygame import Surface
+    s = Surface((4, 2), 0, 32, (0xFF0000, 0xFF00, 0xFF, 0))
+    r = Recording(s, n_buffers=1)
+    for c in (1, 2):
+        s.fill((c, c, c))
+        r.record_frame()
+    r.close()
+    assert [t for t, __ in r.blocks()] == [0, 100]
+
+
+def test_a_dropped_frame_is_not_treated_as_written():
+    from pygame import Surface
+    from asyncpygame._runner import _DeduplicatingRecorder, _create_change_detector, _copy_frame_as_is
+
+    class DroppingWriter:
+        def __init__(self):
+            self.dropping = False
+            self.frames = []
+
+        def acquire(self):
+            return None if self.dropping else bytearray(s.get_pitch() * s.height)
+
+        def submit(self, buffer, header):
+            self.frames.append(buffer[0])
+
+    s = Surface((4, 2), 0, 32, (0xFF0000, 0xFF00, 0xFF, 0))
+    w = DroppingWriter()
+    is_unchanged, copy_frame = _create_change_detector(s, partial(_copy_frame_as_is, s.get_view))
+    record_frame = _DeduplicatingRecorder(w, copy_frame, is_unchanged, s.get_pitch() * s.height, b'', 10)
+    for c, dropping in ((1, False), (2, True), (2, False), (2, False), ):
+        s.fill((c, c, c))
+        w.dropping = dropping
+        record_frame()
+    assert w.frames == [1, 2]
+
+
+def test_nothing_is_written_if_no_frame_was_recorded():
+    from pygame import Surface
+    r = Recording(Surface((4, 2), 0, 32, (0xFF0000, 0xFF00, 0xFF, 0)))
+    r.close()
+    assert r.data == b''
+
+
+def test_a_new_cluster_begins_before_the_relative_timestamp_overflows():
+    from asyncpygame._matroska import BlockHeaders
+    b = BlockHeaders()
+    assert b(0, 8).startswith(b'\x1f\x43\xb6\x75')
+    assert b(0x7FFF, 8).startswith(b'\xa3')
+    assert b(0x8000, 8).startswith(b'\x1f\x43\xb6\x75')
+    assert b(0x8000 + 0x7FFF, 8).startswith(b'\xa3')
+
+
+@pytest.mark.parametrize('help_text, expected', [
+    ("-fps_mode    set framerate mode for matching video streams\n-vsync    set video sync method globally", '-fps_mode'),
+    ("-vsync    video sync method", '-vsync'),
+])
+def test_vfr_options(monkeypatch, help_text, expected):
+    import subprocess
+    from asyncpygame._runner import _vfr_options
+    monkeypatch.setattr(subprocess, 'run', lambda *args, **kwargs: subprocess.CompletedProcess(args, 0, help_text))
+    assert _vfr_options() == (expected, 'vfr', )
+
+
+@pytest.mark.skipif(shutil.which('ffmpeg') is None, reason="ffmpeg is not installed.")
+def test_ffmpeg_reads_the_timestamps():
+    import subprocess
+    from pygame import Surface
+    s = Surface((4, 2), 0, 32, (0xFF0000, 0xFF00, 0xFF, 0))
+    r = Recording(s)
+    for c in (1, 1, 1, 2, 2):
+        s.fill((c, c, c))
+        r.record_frame()
+    r.close()
+    output = subprocess.run(
+        ('ffmpeg', '-v', 'error', '-f', 'matroska', '-i', '-', '-fps_mode', 'passthrough', '-f', 'framecrc', '-', ),
+        input=r.data, capture_output=True, check=True).stdout.decode()
+    pts = [int(line.split(',')[2]) for line in output.splitlines() if not line.startswith('#')]
+    assert pts == [0, 3, 4]  # in 1/fps
@@ -0,0 +1,102 @@
+import pytest
+from pygame.event import Event
+
+
+@pytest.fixture(autouse=True)
+def dummy_video_driver(monkeypatch):
+    monkeypatch.setenv('SDL_VIDEODRIVER', 'dummy')
+
+
+def test_time_advances_by_dt():
+    import asyncpygame as ap
+
+    async def main(*, clock, **kwargs):
+        await clock.sleep(1000)
+        return clock.current_time
+
+    task = ap.run_headless(main, dt=10)
+    assert task.result == 1000
+
+
+def test_max_frames():
+    import asyncpygame as ap
+
+    clocks = []
+
+    async def main(*, clock, **kwargs):
+        clocks.append(clock)
+        await ap.sleep_forever()
+
+    task = ap.run_headless(main, dt=10, max_frames=7)
+    assert task.cancelled
+    assert clocks[0].current_time == 70
+
+
+def test_main_without_kwargs():
+    import asyncpygame as ap
+
+    async def main(*, clock, sdlevent, executor):
+        await clock.sleep(10)
+        return 'done'
+
+    task = ap.run_headless(main, dt=10)
+    assert task.result == 'done'
+
+
+def test_event_source():
+    import asyncpygame as ap
+
+    async def main(*, clock, sdlevent, **kwargs):
+        values = []
+        for __ in range(3):
+            e = await sdlevent.wait(1, priority=0)
+            values.append((e.value, clock.current_time))
+        return values
+
+    event_source = [[Event(1, value='A'), Event(2, value='B')], [], [Event(1, value='C'), Event(1, value='D')]]
+    task = ap.run_headless(main, dt=10, event_source=event_source)
+    assert task.result == [('A', 0), ('C', 20), ('D', 20), ]
+
+
+def test_quit():
+    import pygame
+    import asyncpygame as ap
+
+    async def main(**kwargs):
+        await ap.sleep_forever()
+
+    task = ap.run_headless(main, event_source=[[], [Event(pygame.QUIT)]])
+    assert task.cancelled
+
+
+def test_events_posted_by_the_app():
+    import pygame
+    import asyncpygame as ap
+
+    async def main(*, sdlevent, **kwargs):
+        pygame.init()
+        pygame.display.set_mode((100, 100))
+        pygame.event.post(Event(pygame.USEREVENT, value='A'))
+        return (await sdlevent.wait(pygame.USEREVENT, priority=0)).value
+
+    task = ap.run_headless(main, max_frames=10)
+    assert task.result == 'A'
+
+
+@pytest.mark.parametrize('prev_value', [None, 'x11'])
+def test_video_driver_is_restored(monkeypatch, prev_value):
+    import os
+    import asyncpygame as ap
+
+    if prev_value is None:
+        monkeypatch.delenv('SDL_VIDEODRIVER')
+    else:
+        monkeypatch.setenv('SDL_VIDEODRIVER', prev_value)
+    drivers = []
+
+    async def main(**kwargs):
+        drivers.append(os.environ['SDL_VIDEODRIVER'])
+
+    ap.run_headless(main, max_frames=1)
+    assert drivers == ['dummy', ]
+    assert os.environ.get('SDL_VIDEODRIVER') == prev_value
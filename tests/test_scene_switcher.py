@@ -0,0 +1,75 @@
+import pytest
+from pygame.event import Event as E
+
+
+def test_each_scene_runs_in_its_own_child_executor():
+    import asyncpygame as ap
+    from asyncpygame.scene_switcher import SceneSwitcher
+
+    values = []
+    sdlevent = ap.SDLEvent()
+    executor = ap.PriorityExecutor()
+    executor.register(lambda: values.append('bg'), priority=0)
+    executor.register(lambda: values.append('fg'), priority=0xFFFF)
+
+    async def scene_a(*, switcher, sdlevent, executor, **kwargs):
+        executor.register(lambda: values.append('a2'), priority=0xFFFFFF)
+        executor.register(lambda: values.append('a1'), priority=1)
+        await sdlevent.wait(1, priority=0)
+        switcher.switch_to(scene_b)
+        await ap.sleep_forever()
+
+    async def scene_b(*, executor, **kwargs):
+        executor.register(lambda: values.append('b'), priority=0)
+        await ap.sleep_forever()
+
+    task = ap.start(SceneSwitcher().run(
+        scene_a, priority=0x100, scene_priority=0xFF, sdlevent=sdlevent, executor=executor))
+    executor()
+    assert values == ['bg', 'a1', 'a2', 'fg', ]
+    values.clear()
+    sdlevent.dispatch(E(1))
+    executor()
+    assert values == ['bg', 'b', 'fg', ]
+    task.cancel()
+    values.clear()
+    executor()
+    assert values == ['bg', 'fg', ]
+
+
+@pytest.mark.parametrize('scene_priority, registered_priority, expected', [
+    (None, 0, ['scene', 't']),
+    (None, 0x200, ['t', 'scene']),  # like a dialog opened by a scene
+    (0xFF, 0x200, ['scene', 't']),
+    (0x200, 0, ['t', 'scene']),
+])
+def test_scene_priority(scene_priority, registered_priority, expected):
+    import asyncpygame as ap
+    from asyncpygame.scene_switcher import SceneSwitcher
+
+    values = []
+    sdlevent = ap.SDLEvent()
+    executor = ap.PriorityExecutor()
+    end_transition = ap.Event()
+
+    async def scene(*, executor, **kwargs):
+        with executor.register(lambda: values.append('scene'), priority=registered_priority):
+            await ap.sleep_forever()
+
+    async def transition(*, priority, executor, **kwargs):
+        with executor.register(lambda: values.append('t'), priority=priority):
+            yield
+            yield
+            await end_transition.wait()
+
+    switcher = SceneSwitcher()
+    task = ap.start(switcher.run(
+        scene, priority=0x100, scene_priority=scene_priority, sdlevent=sdlevent, executor=executor))
+    switcher.switch_to(scene, transition)
+    executor()
+    assert values == expected
+    end_transition.fire()
+    values.clear()
+    executor()
+    assert values == ['scene', ]
+    task.cancel()
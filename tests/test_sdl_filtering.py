@@ -0,0 +1,94 @@
+import pytest
+from pygame.constants import QUIT, KEYDOWN, KEYUP, MOUSEMOTION, JOYAXISMOTION, USEREVENT
+
+
+@pytest.fixture()
+def se(monkeypatch):
+    import pygame
+    from asyncpygame._sdlevent import SDLEvent
+    monkeypatch.setenv('SDL_VIDEODRIVER', 'dummy')
+    pygame.init()
+    se = SDLEvent()
+    yield se
+    se.disable_sdl_filtering()
+    pygame.quit()
+
+
+def allowed(*event_types):
+    from pygame.event import get_blocked
+    return [not get_blocked(t) for t in event_types]
+
+
+def test_existing_subscribers(se):
+    se.subscribe((KEYDOWN, ), print, priority=0)
+    se.subscribe((MOUSEMOTION, ), print, priority=0).cancel()
+    se.enable_sdl_filtering()
+    assert allowed(QUIT, KEYDOWN, MOUSEMOTION, JOYAXISMOTION) == [True, True, False, False]
+
+
+def test_allowed_immediately_and_blocked_at_the_next_dispatch(se):
+    se.enable_sdl_filtering(always_allowed=())
+    sub = se.subscribe((KEYDOWN, KEYUP), print, priority=0)
+    assert allowed(QUIT, KEYDOWN, KEYUP) == [False, True, True]
+    sub.topics = (KEYDOWN, )
+    sub2 = se.subscribe((KEYDOWN, ), print, priority=0)
+    sub.cancel()
+    assert allowed(KEYDOWN, KEYUP) == [True, True]
+    se.dispatch_many(())
+    assert allowed(KEYDOWN, KEYUP) == [True, False]
+    sub2.cancel()
+    se.dispatch_many(())
+    assert allowed(KEYDOWN, KEYUP) == [False, False]
+
+
+def test_wait_in_a_loop(se):
+    from pygame.event import Event
+    import asyncpygame as ap
+
+    async def async_fn():
+        while True:
+            await se.wait(USEREVENT, priority=0)
+
+    se.enable_sdl_filtering()
+    task = ap.start(async_fn())
+    for __ in range(3):
+        se.dispatch(Event(USEREVENT))
+        assert allowed(USEREVENT) == [True]
+    task.cancel()
+    se.dispatch_many(())
+    assert allowed(USEREVENT) == [False]
+
+
+def test_disable(se):
+    se.enable_sdl_filtering()
+    sub = se.subscribe((KEYDOWN, ), print, priority=0)
+    se.disable_sdl_filtering()
+    assert allowed(KEYDOWN, MOUSEMOTION) == [True, True]
+    sub.topics = (KEYUP, )
+    sub.cancel()
+    se.dispatch_many(())
+    assert allowed(KEYDOWN, KEYUP, MOUSEMOTION) == [True, True, True]
+
+
+def test_scene_switcher(se):
+    from pygame.event import Event
+    import asyncpygame as ap
+    from asyncpygame.scene_switcher import SceneSwitcher
+
+    async def scene_a(*, switcher, sdlevent, **kwargs):
+        await sdlevent.wait(KEYDOWN, priority=0)
+        switcher.switch_to(scene_b)
+        await ap.sleep_forever()
+
+    async def scene_b(*, sdlevent, **kwargs):
+        await sdlevent.wait(MOUSEMOTION, priority=0)
+
+    se.enable_sdl_filtering()
+    task = ap.start(SceneSwitcher().run(scene_a, priority=0, sdlevent=se))
+    assert allowed(KEYDOWN, MOUSEMOTION) == [True, False]
+    se.dispatch(Event(KEYDOWN))
+    se.dispatch_many(())
+    assert allowed(KEYDOWN, MOUSEMOTION) == [False, True]
+    task.cancel()
+    se.dispatch_many(())
+    assert allowed(KEYDOWN, MOUSEMOTION) == [False, False]
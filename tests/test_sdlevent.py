@@ -1,5 +1,6 @@
 import pytest
 from pygame.event import Event as E
+from pygame.constants import MOUSEBUTTONDOWN, FINGERDOWN, FINGERUP, FINGERMOTION
 
 
 @pytest.fixture()
@@ -182,3 +183,620 @@ def test_wait_freq_mixed_with_another_type_of_awaitable(se):
     assert not task.finished
     se.dispatch(E(1))
     assert task.finished
+
+
+def test_change_topics(se):
+    received = []
+    sub = se.subscribe((1, ), received.append, priority=0)
+    se.dispatch(E(1))
+    se.dispatch(E(2))
+    assert len(received) == 1
+    sub.topics = (2, )
+    se.dispatch(E(1))
+    assert len(received) == 1
+    se.dispatch(E(2))
+    assert len(received) == 2
+    sub.topics = (1, 2, )
+    se.dispatch(E(1))
+    se.dispatch(E(2))
+    assert len(received) == 4
+
+
+def test_consume_does_not_affect_other_types(se):
+    received = []
+    se.subscribe((1, 2), received.append, priority=0)
+    se.subscribe((2, ), lambda e: True, priority=1)
+    se.dispatch(E(1))
+    assert len(received) == 1
+    se.dispatch(E(2))
+    assert len(received) == 1
+
+
+def test_dispatch_many(se):
+    value_list = []
+    se.subscribe((1, ), lambda e: value_list.append(e.value), priority=0)
+    se.subscribe((2, ), lambda e: value_list.append(e.value * 2), priority=0)
+    se.subscribe((2, ), lambda e: e.value == 'C', priority=1)
+    se.dispatch_many([E(1, value='A'), E(2, value='B'), E(2, value='C'), E(1, value='D'), ])
+    assert value_list == ['A', 'BB', 'D', ]
+
+
+def test_dispatch_many_and_wait_in_a_loop(se):
+    from asyncgui import start
+
+    async def async_fn():
+        while True:
+            e = await se.wait(1, priority=0)
+            value_list.append(e.value)
+
+    value_list = []
+    task = start(async_fn())
+    se.dispatch_many([E(1, value='A'), E(2, value='B'), E(1, value='C'), ])
+    assert value_list == ['A', 'C', ]
+    task.cancel()
+
+
+def test_subscribe_with_attr(se):
+    received = []
+    sub = se.subscribe((1, 2), received.append, priority=0, attr=('value', 'A'))
+    se.dispatch(E(1, value='B'))
+    se.dispatch(E(1))
+    assert received == []
+    se.dispatch(E(1, value='A'))
+    se.dispatch(E(2, value='A'))
+    assert len(received) == 2
+    sub.cancel()
+    se.dispatch(E(1, value='A'))
+    assert len(received) == 2
+
+
+def test_wait_with_attrs(se):
+    from asyncgui import start
+
+    task = start(se.wait(1, 2, attrs={'value': 'A', 'value2': 'B'}, priority=0))
+    se.dispatch(E(1, value='A'))
+    se.dispatch(E(1, value='B', value2='B'))
+    se.dispatch(E(0, value='A', value2='B'))
+    assert not task.finished
+    se.dispatch(E(2, value='A', value2='B'))
+    assert task.result.type == 2
+
+
+@pytest.mark.parametrize('method', ['wait', 'wait_freq', 'stream'])
+def test_misspelled_keyword(se, method):
+    with pytest.raises(TypeError):
+        getattr(se, method)(1, priority=0, vlaue='A')
+
+
+def test_unhashable_attribute_value(se):
+    from asyncgui import start
+
+    task = start(se.wait(1, attrs={'value': 'A'}, priority=0))
+    se.dispatch(E(1, value=[1, 2]))
+    assert not task.finished
+    se.dispatch(E(1, value='A'))
+    assert task.finished
+
+
+def test_unhashable_attribute_value_with_a_cancelled_subscriber(se):
+    received = []
+    se.subscribe((1, ), received.append, priority=0, attr=('code', 0))
+    sub = se.subscribe((1, ), received.append, priority=1)
+    se.dispatch(E(1, code=1))
+    sub.cancel()
+    se.dispatch(E(1, code=[1]))
+    se.dispatch(E(1, code=0))
+    assert len(received) == 2
+
+
+def test_wait_with_attrs_and_filter(se):
+    from asyncgui import start
+
+    task = start(se.wait(1, attrs={'value': 'A'}, filter=lambda e: e.value2 == 'B', priority=0))
+    se.dispatch(E(1, value='A', value2='A'))
+    assert not task.finished
+    se.dispatch(E(1, value='A', value2='B'))
+    assert task.finished
+
+
+def test_indexed_and_non_indexed_subscribers_are_called_in_the_order_of_priorities(se):
+    value_list = []
+    se.subscribe((1, ), lambda e: value_list.append('A'), priority=0)
+    se.subscribe((1, ), lambda e: value_list.append('B'), priority=1, attr=('value', 0))
+    se.subscribe((1, ), lambda e: value_list.append('C'), priority=2)
+    se.subscribe((1, ), lambda e: value_list.append('D'), priority=3, attr=('value', 1))
+    se.dispatch(E(1, value=0))
+    assert value_list == ['C', 'B', 'A', ]
+    value_list.clear()
+    se.dispatch(E(1, value=1))
+    assert value_list == ['D', 'C', 'A', ]
+
+
+@pytest.mark.parametrize('indexed_first', [True, False])
+def test_subscribers_with_the_same_priority_are_called_in_the_order_of_subscription(se, indexed_first):
+    value_list = []
+    for indexed in (indexed_first, not indexed_first):
+        name = 'indexed' if indexed else 'plain'
+        se.subscribe((1, ), lambda e, name=name: value_list.append(name), priority=0,
+                     attr=('value', 0) if indexed else None)
+    se.dispatch(E(1, value=0))
+    assert value_list == (['indexed', 'plain', ] if indexed_first else ['plain', 'indexed', ])
+    value_list.clear()
+    se.subscribe((1, ), lambda e: value_list.append('first'), priority=1)
+    se.subscribe((1, ), lambda e: value_list.append('second'), priority=1, attr=('value', 0))
+    se.dispatch(E(1, value=0))
+    assert value_list[:2] == ['first', 'second', ]
+
+
+def test_change_priority(se):
+    value_list = []
+    sub_a = se.subscribe((1, 2), lambda e: value_list.append('A'), priority=0)
+    se.subscribe((1, ), lambda e: value_list.append('B'), priority=1)
+    se.dispatch(E(1))
+    assert value_list == ['B', 'A', ]
+    value_list.clear()
+    sub_a.priority = 2
+    assert sub_a.priority == 2
+    se.subscribe((1, ), lambda e: value_list.append('C'), priority=3)
+    se.dispatch(E(1))
+    assert value_list == ['C', 'A', 'B', ]
+
+
+def test_change_priority_of_indexed_subscriber(se):
+    value_list = []
+    se.subscribe((1, ), lambda e: value_list.append('A'), priority=1, attr=('value', 0))
+    sub_b = se.subscribe((1, ), lambda e: value_list.append('B'), priority=0, attr=('value', 0))
+    se.dispatch(E(1, value=0))
+    assert value_list == ['A', 'B', ]
+    value_list.clear()
+    sub_b.priority = 2
+    se.dispatch(E(1, value=0))
+    assert value_list == ['B', 'A', ]
+
+
+def test_assigning_the_same_priority_does_nothing(se):
+    received = []
+    sub = se.subscribe((1, ), received.append, priority=0, attr=('value', 0))
+    se.dispatch(E(1, value=0))
+    sub.priority = 0
+    assert not se._unsorted_keys
+
+
+@pytest.mark.parametrize('value, n_received', [(0, 0), (1, 1), ])
+def test_indexed_subscriber_consumes(se, value, n_received):
+    received = []
+    se.subscribe((1, ), received.append, priority=0)
+    se.subscribe((1, ), lambda e: True, priority=1, attr=('value', 0))
+    se.dispatch(E(1, value=value))
+    assert len(received) == n_received
+
+
+def test_wait_freq_with_attrs(se):
+    from asyncgui import start
+
+    async def async_fn():
+        async with se.wait_freq(1, attrs={'value': 'A'}, priority=0) as event:
+            return await event()
+
+    task = start(async_fn())
+    se.dispatch(E(1, value='B'))
+    assert not task.finished
+    se.dispatch(E(1, value='A'))
+    assert task.result.value == 'A'
+
+
+@pytest.mark.parametrize('pos, n_received', [((0, 0), 0), ((10, 10), 1), ((29, 29), 1), ((30, 30), 0), ((300, 20), 0)])
+def test_subscribe_with_rect(se, pos, n_received):
+    from pygame import Rect
+    received = []
+    se.subscribe((1, ), received.append, priority=0, region=Rect(10, 10, 20, 20))
+    se.dispatch(E(1, pos=pos))
+    assert len(received) == n_received
+
+
+def test_subscribe_with_a_large_rect(se):
+    from pygame import Rect
+    received = []
+    se.subscribe((1, ), received.append, priority=0, region=Rect(-100, -100, 1000, 1000))
+    for pos in ((-100, -100), (0, 0), (500, 200), (899, 899), ):
+        se.dispatch(E(1, pos=pos))
+    assert len(received) == 4
+    se.dispatch(E(1, pos=(900, 0)))
+    se.dispatch(E(1))
+    assert len(received) == 4
+
+
+def test_move_the_rect_after_subscribing(se):
+    from pygame import Rect
+    received = []
+    rect = Rect(0, 0, 10, 10)
+    sub = se.subscribe((1, ), received.append, priority=0, region=rect)
+    rect.move_ip(300, 300)
+    se.dispatch(E(1, pos=(305, 305)))
+    assert len(received) == 0
+    se.dispatch(E(1, pos=(5, 5)))
+    assert len(received) == 1
+    sub.region = rect
+    se.dispatch(E(1, pos=(5, 5)))
+    assert len(received) == 1
+    se.dispatch(E(1, pos=(305, 305)))
+    assert len(received) == 2
+    sub.region = rect.move(-300, -300)
+    se.dispatch(E(1, pos=(305, 305)))
+    assert len(received) == 2
+    se.dispatch(E(1, pos=(5, 5)))
+    assert len(received) == 3
+    sub.cancel()
+    se.dispatch(E(1, pos=(5, 5)))
+    assert len(received) == 3
+
+
+def test_region_returns_a_copy(se):
+    from pygame import Rect
+    sub = se.subscribe((1, ), print, priority=0, region=Rect(0, 0, 10, 10))
+    sub.region.move_ip(300, 300)
+    assert sub.region == Rect(0, 0, 10, 10)
+
+
+def test_replace_a_rect_region_with_a_function(se):
+    from pygame import Rect
+    sub = se.subscribe((1, ), print, priority=0, region=Rect(0, 0, 10, 10))
+    with pytest.raises(ValueError):
+        sub.region = Rect(0, 0, 10, 10).collidepoint
+
+
+@pytest.fixture()
+def display(monkeypatch):
+    import pygame
+    monkeypatch.setenv('SDL_VIDEODRIVER', 'dummy')
+    pygame.display.init()
+    try:
+        yield pygame.display.set_mode((400, 200))
+    finally:
+        pygame.display.quit()
+
+
+@pytest.mark.parametrize('rect', [(100, 50, 100, 50), (100, 50, 9000, 9000)])
+def test_subscribe_to_finger_events_with_region(se, display, rect):
+    from pygame import Rect
+    received = []
+    se.subscribe((MOUSEBUTTONDOWN, FINGERDOWN, FINGERUP, ), received.append, priority=0, region=Rect(rect))
+    se.dispatch(E(FINGERDOWN, x=0.2, y=0.2))
+    se.dispatch(E(FINGERMOTION, x=0.3, y=0.3))
+    se.dispatch(E(FINGERUP, x=0.1, y=0.9))
+    assert received == []
+    se.dispatch(E(FINGERDOWN, x=0.3, y=0.3))
+    se.dispatch(E(MOUSEBUTTONDOWN, pos=(120, 60)))
+    se.dispatch(E(FINGERUP, x=0.49, y=0.49))
+    assert [e.type for e in received] == [FINGERDOWN, MOUSEBUTTONDOWN, FINGERUP]
+
+
+def test_change_the_topics_of_a_subscriber_with_region_to_finger_events(se, display):
+    from pygame import Rect
+    received = []
+    sub = se.subscribe((MOUSEBUTTONDOWN, ), received.append, priority=0, region=Rect(0, 0, 100, 100))
+    sub.topics = (FINGERMOTION, )
+    se.dispatch(E(FINGERMOTION, x=0.1, y=0.1))
+    se.dispatch(E(FINGERMOTION, x=0.5, y=0.1))
+    assert len(received) == 1
+
+
+def test_finger_events_without_display_surface_dont_reach_subscribers_with_region(se):
+    from pygame import Rect
+    received = []
+    se.subscribe((FINGERDOWN, ), received.append, priority=0, region=Rect(0, 0, 100, 100))
+    se.dispatch(E(FINGERDOWN, x=0.1, y=0.1))
+    assert received == []
+
+
+def test_grow_the_rect_too_large_to_be_indexed(se):
+    from pygame import Rect
+    received = []
+    sub = se.subscribe((1, ), received.append, priority=0, region=Rect(0, 0, 10, 10))
+    sub.region = Rect(0, 0, 5000, 5000)
+    se.dispatch(E(1, pos=(5, 5)))
+    se.dispatch(E(1, pos=(4000, 4000)))
+    assert len(received) == 2
+    sub.region = Rect(4000, 4000, 10, 10)
+    se.dispatch(E(1, pos=(5, 5)))
+    se.dispatch(E(1, pos=(4005, 4005)))
+    assert len(received) == 3
+
+
+def test_stream_follows_its_region(se):
+    from asyncgui import start
+    from pygame import Rect
+
+    async def async_fn():
+        async with stream:
+            async for e in stream:
+                received.append(e.pos)
+
+    received = []
+    rect = Rect(0, 0, 10, 10)
+    stream = se.stream(1, priority=0, region=rect)
+    start(async_fn())
+    rect.move_ip(300, 300)
+    stream.subscriber.region = rect
+    se.dispatch(E(1, pos=(5, 5)))
+    se.dispatch(E(1, pos=(305, 305)))
+    assert received == [(305, 305)]
+
+
+def test_subscribe_with_a_function_as_a_region(se):
+    received = []
+    se.subscribe((1, ), received.append, priority=0, region=lambda pos: pos[0] > 10)
+    se.dispatch(E(1, pos=(0, 0)))
+    assert len(received) == 0
+    se.dispatch(E(1, pos=(11, 0)))
+    assert len(received) == 1
+
+
+def test_subscribe_with_both_attr_and_region(se):
+    from pygame import Rect
+    with pytest.raises(ValueError):
+        se.subscribe((1, ), print, priority=0, attr=('value', 0), region=Rect(0, 0, 10, 10))
+
+
+def test_overlapping_regions(se):
+    from pygame import Rect
+    value_list = []
+    se.subscribe((1, ), lambda e: value_list.append('A'), priority=0)
+    se.subscribe((1, ), lambda e: value_list.append('B'), priority=1, region=Rect(0, 0, 100, 100))
+    se.subscribe((1, ), lambda e: value_list.append('C') or True, priority=2, region=Rect(50, 50, 100, 100))
+    se.dispatch(E(1, pos=(10, 10)))
+    assert value_list == ['B', 'A', ]
+    value_list.clear()
+    se.dispatch(E(1, pos=(60, 60)))
+    assert value_list == ['C', ]
+
+
+def test_wait_with_region(se):
+    from asyncgui import start
+    from pygame import Rect
+
+    task = start(se.wait(1, 2, region=Rect(0, 0, 10, 10), attrs={'value': 'A'}, priority=0))
+    se.dispatch(E(1, pos=(20, 0), value='A'))
+    se.dispatch(E(1, pos=(0, 0), value='B'))
+    assert not task.finished
+    se.dispatch(E(2, pos=(0, 0), value='A'))
+    assert task.result.type == 2
+
+
+def test_stream(se):
+    from asyncgui import start
+
+    async def async_fn():
+        async with se.stream(1, 2, priority=0, attrs={'value': 'A'}) as stream:
+            async for e in stream:
+                received.append(e.type)
+
+    received = []
+    task = start(async_fn())
+    se.dispatch(E(0, value='A'))
+    se.dispatch(E(1, value='B'))
+    se.dispatch(E(1, value='A'))
+    se.dispatch(E(2, value='A'))
+    assert received == [1, 2, ]
+    task.cancel()
+    se.dispatch(E(1, value='A'))
+    assert received == [1, 2, ]
+    assert (1, 'value', 'A') not in se._subs
+
+
+def test_stream_with_until(se):
+    from asyncgui import start
+
+    async def async_fn():
+        async with se.stream(1, priority=0, until=se.wait(2, priority=0)) as stream:
+            async for e in stream:
+                received.append(e.type)
+        return 'done'
+
+    received = []
+    task = start(async_fn())
+    se.dispatch(E(1))
+    se.dispatch(E(1))
+    assert received == [1, 1, ]
+    se.dispatch(E(2))
+    assert task.result == 'done'
+    se.dispatch(E(1))
+    se.dispatch(E(2))
+    assert received == [1, 1, ]
+    assert not se._subs[1]
+    assert not se._subs[2]
+
+
+def test_stream_with_until_that_has_already_completed(se):
+    from asyncgui import start, StatefulEvent
+
+    async def async_fn():
+        async with se.stream(1, priority=0, until=ae.wait()) as stream:
+            async for e in stream:
+                pass
+        return 'done'
+
+    ae = StatefulEvent()
+    ae.fire()
+    task = start(async_fn())
+    assert task.result == 'done'
+
+
+def test_break_out_of_stream(se):
+    from asyncgui import start, sleep_forever
+
+    async def async_fn():
+        async with se.stream(1, priority=0, until=se.wait(2, priority=0)) as stream:
+            async for e in stream:
+                break
+        await sleep_forever()
+
+    task = start(async_fn())
+    se.dispatch(E(1))
+    se.dispatch(E(1))
+    se.dispatch(E(2))
+    assert not se._subs[1]
+    assert not se._subs[2]
+    task.cancel()
+
+
+def test_close_a_stream_without_async_with(se):
+    from asyncgui import start, sleep_forever
+
+    async def async_fn():
+        async for e in stream:
+            received.append(e.type)
+            break
+        await stream.aclose()
+        await sleep_forever()
+
+    received = []
+    stream = se.stream(1, priority=0)
+    task = start(async_fn())
+    se.dispatch(E(1))
+    se.dispatch(E(1))
+    assert received == [1, ]
+    assert not se._subs[1]
+    task.cancel()
+
+
+def test_iterate_over_a_stream_with_until_without_async_with(se):
+    from asyncgui import start, StatefulEvent
+
+    async def async_fn():
+        async for e in se.stream(1, priority=0, until=ae.wait()):
+            pass
+
+    ae = StatefulEvent()
+    ae.fire()
+    with pytest.raises(RuntimeError):
+        start(async_fn())
+
+
+def test_exception_in_until_propagates_to_the_consumer(se):
+    from asyncgui import start, TaskState
+
+    async def fail():
+        await se.wait(2, priority=0)
+        raise ZeroDivisionError
+
+    async def async_fn():
+        async with se.stream(1, priority=0, until=fail()) as stream:
+            async for e in stream:
+                pass
+
+    task = start(async_fn())
+    with pytest.raises(ExceptionGroup) as excinfo:
+        se.dispatch(E(2))
+    assert excinfo.group_contains(ZeroDivisionError)
+    assert task.state is TaskState.CANCELLED
+
+
+def test_iterating_over_a_stream_allocates_nothing_per_event(se):
+    from asyncgui import start
+
+    async def async_fn():
+        async with se.stream(1, priority=0) as stream:
+            async for e in stream:
+                awaitables.add(id(stream.__anext__()))
+
+    awaitables = set()
+    task = start(async_fn())
+    for __ in range(3):
+        se.dispatch(E(1))
+    assert len(awaitables) == 1
+    task.cancel()
+
+
+def test_stream_mixed_with_another_type_of_awaitable(se):
+    from asyncgui import start, Event
+
+    async def async_fn():
+        async with se.stream(1, priority=0) as stream:
+            async for e in stream:
+                received.append(e.value)
+                await ae.wait()
+
+    received = []
+    ae = Event()
+    task = start(async_fn())
+    se.dispatch(E(1, value='A'))
+    se.dispatch(E(1, value='B'))
+    ae.fire()
+    se.dispatch(E(1, value='C'))
+    assert received == ['A', 'C', ]
+    task.cancel()
+
+
+def test_cancelled_subscribers_of_a_type_that_never_occurs_get_pruned(se):
+    from asyncpygame._sdlevent import _MIN_PRUNE_THRESHOLD
+    received = []
+    se.subscribe((2, ), received.append, priority=0)
+    for __ in range(_MIN_PRUNE_THRESHOLD * 3):
+        se.subscribe((2, ), received.append, priority=0).cancel()
+        se.dispatch(E(1))
+    assert len(se._subs_to_be_added[2]) <= _MIN_PRUNE_THRESHOLD + 1
+    se.dispatch(E(2))
+    assert len(received) == 1
+
+
+def test_buckets_of_cancelled_indexed_subscribers_get_removed(se):
+    from asyncgui import start
+    from pygame import Rect
+
+    tasks = [start(se.wait(1, attrs={'value': i}, priority=0)) for i in range(100)]
+    for i in range(100):
+        se.dispatch(E(1, value=i))
+    assert all(task.finished for task in tasks)
+    se.subscribe((1, ), tasks.append, priority=0, attr=('value', 'A')).cancel()  # cancelled before its first event
+    se.subscribe((1, ), tasks.append, priority=0, region=Rect(0, 0, 300, 300)).cancel()
+    se.dispatch_many(())
+    assert not se._subs
+    assert not se._subs_to_be_added
+
+
+def test_buckets_are_not_copied_on_every_event(se):
+    received = []
+    se.subscribe((1, ), received.append, priority=0)
+    se.subscribe((1, ), received.append, priority=0, attr=('value', 0))
+    se.dispatch(E(1, value=0))
+    buckets = (se._subs[1], se._subs[(1, 'value', 0)], )
+    se.dispatch(E(1, value=0))
+    assert all(a is b for a, b in zip((se._subs[1], se._subs[(1, 'value', 0)], ), buckets))
+    assert len(received) == 4
+
+
+def test_cancelled_subscribers_get_removed_on_the_slow_path(se):
+    from asyncgui import start
+
+    se.subscribe((1, ), lambda e: None, priority=0, attr=('value', 0))
+    for __ in range(10):
+        task = start(se.wait(1, priority=0))
+        se.dispatch(E(1, value=1))
+        assert task.finished
+    assert len(se._subs[1]) == 1
+    se.dispatch(E(1, value=1))
+    se.dispatch_many(())
+    assert not se._subs.get(1)
+
+
+def test_type_goes_back_to_the_fast_path(se):
+    received = []
+    se.subscribe((1, ), received.append, priority=0)
+    sub = se.subscribe((1, 2), received.append, priority=0, attr=('value', 0))
+    sub.topics = (1, 2, 3, )
+    se.dispatch(E(1, value=0))
+    assert set(se._indexed_attrs) == {1, 2, 3, }
+    sub.cancel()
+    assert not se._indexed_attrs
+    se.dispatch(E(1, value=0))
+    assert len(received) == 3
+    assert not any(isinstance(key, tuple) for key in se._subs)
+
+
+def test_change_the_topics_of_a_cancelled_subscriber(se):
+    sub = se.subscribe((1, ), print, priority=0, attr=('code', 0))
+    sub.cancel()
+    sub.topics = (1, 2, )
+    assert not se._n_indexed
+    assert not se._indexed_attrs
@@ -0,0 +1,106 @@
+import pytest
+import sys
+import time
+
+pytestmark = pytest.mark.skipif(sys.platform == 'win32', reason="POSIX only")
+
+UPPER = (sys.executable, '-c', 'import sys; sys.stdout.buffer.write(sys.stdin.buffer.read().upper())')
+
+
+@pytest.fixture()
+def net():
+    from asyncpygame import Net
+    net = Net()
+    yield net
+    net.close()
+
+
+def poll_until_done(net, *tasks, timeout=10.0):
+    import asyncpygame as ap
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        if all(t.state is not ap.TaskState.STARTED for t in tasks):
+            return
+        net.poll()
+        time.sleep(0.001)
+    raise AssertionError("Tasks did not complete.")
+
+
+def test_run_concurrently(net):
+    import asyncpygame as ap
+    from asyncpygame.subprocess import run
+
+    # larger than the pipe buffer, so that feeding and reading must be interleaved
+    inputs = [bytes([c]) * 300_000 for c in b'abc']
+    tasks = [ap.start(run(net, UPPER, input=data)) for data in inputs]
+    poll_until_done(net, *tasks)
+    for task, data in zip(tasks, inputs):
+        assert task.result.returncode == 0
+        assert task.result.stdout == data.upper()
+        assert task.result.stderr is None
+
+
+def test_check(net):
+    import subprocess
+    import asyncpygame as ap
+    from asyncpygame.subprocess import run, PIPE
+
+    async def async_fn():
+        await run(net, (sys.executable, '-c', 'import sys; sys.stderr.write("oops"); sys.exit(3)'),
+                  stderr=PIPE, check=True)
+
+    task = ap.start(async_fn())
+    with pytest.raises(subprocess.CalledProcessError) as excinfo:
+        poll_until_done(net, task)
+    assert excinfo.value.returncode == 3
+    assert excinfo.value.stderr == b'oops'
+
+
+def test_streaming(net):
+    import asyncpygame as ap
+    from asyncpygame.subprocess import Process, PIPE
+
+    echo_lines = (sys.executable, '-u', '-c', 'import sys\nfor line in sys.stdin: print(line.upper(), end="")')
+
+    async def async_fn():
+        with Process(net, echo_lines, stdin=PIPE, stdout=PIPE) as p:
+            received = []
+            for line in (b'one\n', b'two\n'):
+                await p.stdin.write(line)
+                received.append(await p.stdout.read(100))
+            p.stdin.close()
+            assert await p.stdout.read() == b''
+            assert await p.wait() == 0
+            return received
+
+    task = ap.start(async_fn())
+    poll_until_done(net, task)
+    assert task.result == [b'ONE\n', b'TWO\n']
+
+
+def test_cancel(net):
+    import asyncpygame as ap
+    from asyncpygame.subprocess import Process
+
+    async def async_fn():
+        with Process(net, (sys.executable, '-c', 'import time; time.sleep(100)')) as p:
+            processes.append(p)
+            await p.wait()
+
+    processes = []
+    task = ap.start(async_fn())
+    net.poll()
+    task.cancel()
+    assert task.cancelled
+    assert processes[0].returncode is not None
+
+
+def test_wait_without_pidfd(net, monkeypatch):
+    import asyncpygame as ap
+    import asyncpygame.subprocess as apg_subprocess
+
+    monkeypatch.setattr(apg_subprocess, '_open_pidfd', lambda pid: None)
+    task = ap.start(apg_subprocess.run(net, (sys.executable, '-c', 'import sys; sys.exit(5)'), stdout=None))
+    poll_until_done(net, task)
+    assert task.result.returncode == 5
+    assert task.result.stdout is None
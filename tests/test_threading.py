@@ -0,0 +1,128 @@
+import pytest
+from threading import Thread
+from pygame.event import Event
+from pygame.constants import USEREVENT
+
+
+@pytest.fixture()
+def se():
+    from asyncpygame._sdlevent import SDLEvent
+    return SDLEvent()
+
+
+def test_post_threadsafe(se):
+    received = []
+    se.subscribe((USEREVENT, ), received.append, priority=0)
+    t = Thread(target=lambda: se.post_threadsafe(Event(USEREVENT, value='A')))
+    t.start()
+    t.join()
+    assert received == []
+    se.dispatch_many([Event(USEREVENT, value='B')])
+    assert [e.value for e in received] == ['A', 'B', ]
+    se.dispatch_many(())
+    assert len(received) == 2
+
+
+@pytest.mark.parametrize('set_before_awaiting', [True, False])
+def test_future_result(se, set_before_awaiting):
+    import asyncpygame as ap
+
+    future = ap.ThreadSafeFuture(se)
+    if set_before_awaiting:
+        future.set_result('A')
+        se.dispatch_many(())
+    task = ap.start(future)
+    if not set_before_awaiting:
+        future.set_result('A')
+        assert not task.finished
+        se.dispatch_many(())
+    assert task.result == 'A'
+    assert future.done
+    assert ap.start(future).result == 'A'
+
+
+def test_future_exception(se):
+    import asyncpygame as ap
+
+    future = ap.ThreadSafeFuture(se)
+    task = ap.start(future)
+    future.set_exception(ZeroDivisionError())
+    with pytest.raises(ZeroDivisionError):
+        se.dispatch_many(())
+    assert task.cancelled
+
+
+def test_cancel_future(se):
+    import asyncpygame as ap
+
+    future = ap.ThreadSafeFuture(se)
+    task = ap.start(future)
+    future.cancel()
+    future.set_result('A')
+    se.dispatch_many(())
+    assert not future.done
+    assert not task.finished
+    task.cancel()
+
+
+def test_futures_do_not_remain_in_sdlevent(se):
+    import asyncpygame as ap
+
+    futures = [ap.ThreadSafeFuture(se) for __ in range(100)]
+    for future in futures[:50]:
+        future.set_result(object())
+    for future in futures[50:]:
+        future.cancel()
+    se.dispatch_many(())
+    se.dispatch_many(())
+    assert all(future.done for future in futures[:50])
+    assert not se._subs
+    assert not se._subs_to_be_added
+
+
+def test_run_in_thread(monkeypatch):
+    import asyncpygame as ap
+    monkeypatch.setenv('SDL_VIDEODRIVER', 'dummy')
+
+    async def main(*, sdlevent, clock, **kwargs):
+        return await ap.run_in_thread(sdlevent, lambda: 'A')
+
+    task = ap.run_headless(main, dt=0, max_frames=100_000)
+    assert task.result == 'A'
+
+
+def test_run_in_executor(se):
+    import asyncpygame as ap
+    from threading import Event as ThreadingEvent
+
+    started = ThreadingEvent()
+    resume = ThreadingEvent()
+
+    def blocking_func(value):
+        started.set()
+        resume.wait()
+        return value
+
+    with ap.WorkerPool(se, max_workers=1) as pool:
+        task1 = ap.start(ap.run_in_executor(blocking_func, 'A', pool=pool))
+        task2 = ap.start(ap.run_in_executor(blocking_func, 'B', pool=pool))
+        started.wait()
+        assert (pool.n_pending, pool.queue_depth, pool.utilization) == (2, 1, 1.0)
+        task2.cancel()
+        assert (pool.n_pending, pool.queue_depth, pool.utilization) == (1, 0, 1.0)
+        resume.set()
+        while not task1.finished:
+            se.dispatch_many(())
+        assert task1.result == 'A'
+        assert (pool.n_pending, pool.n_completed, pool.utilization) == (0, 1, 0.)
+
+
+def test_run_in_executor_raises(se):
+    import asyncpygame as ap
+
+    with ap.WorkerPool(se, max_workers=1) as pool:
+        task = ap.start(ap.run_in_executor(int, 'A', pool=pool))
+        with pytest.raises(ValueError):
+            while task.state is ap.TaskState.STARTED:
+                se.dispatch_many(())
+        assert task.cancelled